@@ -0,0 +1,61 @@
+# benchmark matching messages against screen layout categories
+# compares a linear scan over every category matcher of the compiled screen plan with the
+# literal prefix index of the plan; both perform the same work for every category that matches
+
+from timeit import timeit
+from mpcurses.screen import compile_screen_layout
+from mpcurses.screen import get_category_matchers
+
+CATEGORIES = 48
+MESSAGES = 10000
+
+def get_screen_layout():
+    screen_layout = {}
+    for index in range(CATEGORIES):
+        screen_layout[f'category{index}'] = {
+            'position': (index, 0),
+            'table': True,
+            'regex': fr'^step{index} of task is "(?P<value>.*)"$'
+        }
+    screen_layout['message'] = {
+        'position': (CATEGORIES, 0),
+        'regex': r'^ERROR: (?P<value>.*)$'
+    }
+    return screen_layout
+
+def get_messages():
+    messages = []
+    for index in range(MESSAGES):
+        if index % 2:
+            messages.append(f'step{index % CATEGORIES} of task is "{index}"')
+        else:
+            messages.append(f'processing item {index}')
+    return messages
+
+def match(matchers, message):
+    values = []
+    for category_plan in matchers:
+        match = category_plan.regex.match(message)
+        if match:
+            values.append((category_plan.category, match.group('value')))
+    return values
+
+def linear_scan(messages, plan):
+    for message in messages:
+        match(plan.matchers, message)
+
+def dispatch(messages, plan):
+    for message in messages:
+        match(get_category_matchers(plan, message), message)
+
+def main():
+    plan = compile_screen_layout(get_screen_layout())
+    messages = get_messages()
+    linear = timeit(lambda: linear_scan(messages, plan), number=5)
+    dispatched = timeit(lambda: dispatch(messages, plan), number=5)
+    print(f'{CATEGORIES} categories {MESSAGES} messages')
+    print(f'linear scan: {linear:.3f}s')
+    print(f'dispatch:    {dispatched:.3f}s ({linear / dispatched:.1f}x)')
+
+if __name__ == '__main__':
+    main()
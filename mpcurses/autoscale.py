@@ -0,0 +1,117 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = 2
+MAX_LOAD = 1
+MAX_PRESSURE = 40
+TOLERANCE = .05
+PRESSURE_RESOURCES = ('cpu', 'io')
+
+
+def get_load():
+    """ return one minute load average per cpu or None if not available
+    """
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+    except (AttributeError, OSError):
+        return None
+
+
+def get_pressure(path='/proc/pressure'):
+    """ return highest ten second average percentage of time some tasks stalled on cpu or io or None if not available
+    """
+    pressure = None
+    for resource in PRESSURE_RESOURCES:
+        try:
+            with open(os.path.join(path, resource)) as pressure_file:
+                for line in pressure_file:
+                    if line.startswith('some '):
+                        fields = dict(field.split('=') for field in line.split()[1:])
+                        pressure = max(pressure or 0, float(fields['avg10']))
+
+        except (OSError, KeyError, ValueError):
+            continue
+    return pressure
+
+
+class Autoscaler():
+    """ hill-climbing controller for the number of processes to run concurrently
+
+        every update steps the target in the current direction while throughput holds and reverses direction
+        when throughput drops; the target is stepped down while the host is overloaded
+    """
+    def __init__(self, minimum=1, maximum=None, step=1, max_load=MAX_LOAD, max_pressure=MAX_PRESSURE, tolerance=TOLERANCE):
+        """ Autoscaler constructor
+        """
+        self.minimum = minimum
+        self.maximum = maximum if maximum else 2 * (os.cpu_count() or 1)
+        if self.minimum < 1 or self.maximum < self.minimum:
+            raise ValueError('autoscale min must be at least 1 and not greater than max')
+        self.step = step
+        self.max_load = max_load
+        self.max_pressure = max_pressure
+        self.tolerance = tolerance
+        self.target = self.minimum
+        self.direction = 1
+        self.throughput = None
+        self.completed = None
+        self.sampled_at = None
+
+    def clamp(self, target):
+        """ return target within minimum and maximum
+        """
+        return min(max(target, self.minimum), self.maximum)
+
+    def start(self, target):
+        """ set initial target and return it
+        """
+        self.target = self.clamp(target)
+        return self.target
+
+    def is_overloaded(self, load, pressure):
+        """ return True if load or pressure exceed their maximum
+        """
+        if self.max_load and load is not None and load > self.max_load:
+            return True
+        if self.max_pressure and pressure is not None and pressure > self.max_pressure:
+            return True
+        return False
+
+    def update(self, completed, now, load=None, pressure=None):
+        """ return target updated from number of completed items at now and host load and pressure
+        """
+        if self.sampled_at is None or now <= self.sampled_at:
+            self.completed = completed
+            self.sampled_at = now
+            return self.target
+        throughput = (completed - self.completed) / (now - self.sampled_at)
+        if self.is_overloaded(load, pressure):
+            self.direction = -1
+        elif self.throughput is not None and throughput < self.throughput * (1 - self.tolerance):
+            # the last step made things worse - climb in the other direction
+            self.direction = -self.direction
+        target = self.clamp(self.target + self.direction * self.step)
+        logger.debug(f'autoscale throughput:{throughput:.2f} load:{load} pressure:{pressure} target:{self.target}->{target}')
+        self.throughput = throughput
+        self.completed = completed
+        self.sampled_at = now
+        self.target = target
+        return target
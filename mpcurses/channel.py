@@ -0,0 +1,82 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from threading import Lock
+from multiprocessing import Pipe
+
+logger = logging.getLogger(__name__)
+
+
+class Channel():
+    """ sending end of a pipe dedicated to one process that is passed to the function as its message queue and
+        its result queue
+
+        a process that is terminated while it writes to a queue shared with other processes can leave a partial
+        message in the queue or never release the lock guarding it so the other processes block when they write
+        to it, a process sends on its own pipe instead so terminating it can only truncate its own messages
+    """
+    def __init__(self, connection):
+        """ Channel constructor
+        """
+        self.connection = connection
+        self.lock = Lock()
+
+    def __getstate__(self):
+        """ return state to pickle - the lock is created again when the channel is unpickled
+        """
+        return {'connection': self.connection}
+
+    def __setstate__(self, state):
+        """ restore pickled state
+        """
+        self.connection = state['connection']
+        self.lock = Lock()
+
+    def put(self, item):
+        """ send item - messages are sent as str and results as dict
+        """
+        with self.lock:
+            self.connection.send(item)
+
+    def close(self):
+        """ close sending end of the pipe
+        """
+        self.connection.close()
+
+
+def open_channel():
+    """ return receiving connection and sending channel of a new pipe
+
+        the channel is to be closed once the process it was passed to is started so the receiving end reaches
+        the end of the pipe when the process exits or is terminated
+    """
+    receiver, sender = Pipe(duplex=False)
+    return receiver, Channel(sender)
+
+
+def receive(receiver, limit):
+    """ return tuple of list of at most limit items received on receiver without waiting and True if the
+        sending end was closed
+
+        a message that was truncated because the process was terminated while sending it is discarded
+    """
+    items = []
+    try:
+        while len(items) < limit and receiver.poll():
+            items.append(receiver.recv())
+    except (EOFError, OSError):
+        return items, True
+    return items, False
@@ -0,0 +1,101 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import heapq
+import logging
+
+logger = logging.getLogger(__name__)
+
+# weight of the latest duration in the smoothed duration recorded for an item
+ALPHA = .5
+
+
+def load_history(path):
+    """ return dict of item key to duration in seconds read from history file at path
+    """
+    try:
+        with open(path) as history_file:
+            history = json.load(history_file)
+
+    except FileNotFoundError:
+        return {}
+
+    except (OSError, ValueError) as exception:
+        logger.warning(f'unable to read history file {path}: {exception}')
+        return {}
+
+    if not isinstance(history, dict):
+        logger.warning(f'ignoring history file {path} since it does not contain a dict')
+        return {}
+    return history
+
+
+def save_history(path, history):
+    """ write history to history file at path replacing the file atomically
+    """
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'w') as history_file:
+        json.dump(history, history_file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def get_item_key(item_key, data):
+    """ return history key of item data
+
+        item_key is either the name of a process data key or a callable returning the key of an item; if not set
+        the key is the process data itself
+    """
+    if callable(item_key):
+        return str(item_key(data))
+    if item_key:
+        return str(data[item_key])
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+def update_history(history, key, duration, alpha=ALPHA):
+    """ record duration for key in history smoothed with the duration recorded by earlier runs
+    """
+    previous = history.get(key)
+    history[key] = duration if previous is None else alpha * duration + (1 - alpha) * previous
+
+
+def order_by_cost(items, costs):
+    """ return items sorted longest first by their cost
+
+        items is a list of (offset, data) tuples and costs a dict of offset to cost; items without a cost are
+        given the mean cost and items with equal cost keep their order
+    """
+    if not costs:
+        return list(items)
+    default = sum(costs.values()) / len(costs)
+    return sorted(items, key=lambda item: costs.get(item[0], default), reverse=True)
+
+
+def project_finish(running, queued, processes):
+    """ return number of seconds until all items are projected to finish
+
+        running is a list of the remaining seconds of the items that are running and queued a list of the costs
+        of the queued items in the order they will be started; every queued item is started on the process
+        that becomes available first
+    """
+    available = list(running) + [0] * (processes - len(running))
+    if not available:
+        return 0
+    heapq.heapify(available)
+    for cost in queued:
+        heapq.heappush(available, heapq.heappop(available) + cost)
+    return max(available)
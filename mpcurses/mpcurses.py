@@ -13,28 +13,88 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import re
+import heapq
+import itertools
 import logging
+from threading import Thread
+from multiprocessing import Process
+from multiprocessing.connection import wait
+from collections import deque
+from collections.abc import Iterator
+from inspect import isgeneratorfunction
 from datetime import datetime
+from datetime import timedelta
+from time import monotonic
 from curses import wrapper
-from multiprocessing import Queue
-from multiprocessing import Process
+from queue import Queue
 from queue import Empty
 
 from .screen import initialize_screen
 from .screen import initialize_screen_offsets
+from .screen import extend_screen_offsets
 from .screen import finalize_screen
 from .screen import update_screen
 from .screen import echo_to_screen
+from .screen import follow_viewport
+from .screen import scroll_screen
 from .screen import refresh_screen
+from .screen import flush_screen
 from .screen import update_screen_status
-from .screen import blink
+from .screen import uses_curses
+from .screen import release_slot
+from .screen import MAX_FPS
+from .renderer import FrameBuffer
+from .renderer import CursesRenderer
+from .renderer import NullRenderer
+from .renderer import AnsiRenderer
+from .renderer import RenderThread
+from .pool import Worker
+from .pool import use_keyword_arguments
+from .pool import get_chunksize
+from .pool import get_arguments
+from .channel import open_channel
+from .channel import receive
+from .autoscale import Autoscaler
+from .autoscale import INTERVAL as AUTOSCALE_INTERVAL
+from .autoscale import get_load
+from .autoscale import get_pressure
+from .history import load_history
+from .history import save_history
+from .history import get_item_key
+from .history import update_history
+from .history import order_by_cost
+from .history import project_finish
+from .speculate import INTERVAL as SPECULATE_INTERVAL
+from .speculate import PERCENTILE
+from .speculate import FACTOR
+from .speculate import MIN_COMPLETED
+from .speculate import get_straggler_threshold
+from .retry import INTERVAL as RETRY_INTERVAL
+from .retry import ATTEMPTS
+from .retry import BACKOFF
+from .retry import MULTIPLIER
+from .retry import MAX_BACKOFF
+from .retry import JITTER
+from .retry import Retryable
+from .retry import get_backoff
 
 from mpmq import MPmq
 from mpmq.mpmq import NoActiveProcesses
+from mpmq.handler import QueueHandlerDecorator
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 1000
+BATCH_TIME = .03
+WAIT_TIMEOUT = .1
+BLINK_INTERVAL = .9
+STREAM_END = None
+PROJECTION_INTERVAL = 1
+TIMEOUT_INTERVAL = .5
+RENDERERS = ('curses', 'null', 'ansi')
+
 
 class MPcurses(MPmq):
     """ a subclass of MPmq providing multi-processing (MP) capabilities for a curses screen
@@ -49,6 +109,16 @@ class MPcurses(MPmq):
         screen_layout = kwargs.pop('screen_layout', None)
         init_messages = kwargs.pop('init_messages', None)
         get_process_data = kwargs.pop('get_process_data', None)
+        renderer = kwargs.pop('renderer', 'curses')
+        pool = kwargs.pop('pool', False)
+        chunksize = kwargs.pop('chunksize', None)
+        autoscale = kwargs.pop('autoscale', None)
+        history = kwargs.pop('history', None)
+        item_key = kwargs.pop('item_key', None)
+        speculate = kwargs.pop('speculate', None)
+        item_timeout = kwargs.pop('item_timeout', None)
+        run_timeout = kwargs.pop('run_timeout', None)
+        retry = kwargs.pop('retry', None)
 
         super(MPcurses, self).__init__(*args, **kwargs)
 
@@ -61,7 +131,47 @@ class MPcurses(MPmq):
         if get_process_data and not screen_layout:
             raise ValueError('get_process_data can only be set if screen_layout value is provided')
 
+        if not isinstance(renderer, FrameBuffer) and renderer not in RENDERERS:
+            raise ValueError(f"renderer value must be one of {', '.join(RENDERERS)} or a renderer instance")
+
+        if chunksize is not None and not pool:
+            raise ValueError('chunksize can only be set if pool value is True')
+
+        if chunksize is not None and chunksize != 'auto' and not (isinstance(chunksize, int) and chunksize > 0):
+            raise ValueError("chunksize value must be a positive integer or 'auto'")
+
+        if autoscale and not isinstance(autoscale, (bool, dict)):
+            raise ValueError('autoscale value must be True or a dict')
+
+        if item_key and not history:
+            raise ValueError('item_key can only be set if history value is provided')
+
+        if speculate and not isinstance(speculate, (bool, dict)):
+            raise ValueError('speculate value must be True or a dict')
+
+        if item_timeout is not None and not (isinstance(item_timeout, (int, float)) and item_timeout > 0):
+            raise ValueError('item_timeout value must be a positive number')
+
+        if run_timeout is not None and not (isinstance(run_timeout, (int, float)) and run_timeout > 0):
+            raise ValueError('run_timeout value must be a positive number')
+
+        if retry and not isinstance(retry, (bool, dict)):
+            raise ValueError('retry value must be True or a dict')
+
         self.screen_layout = screen_layout
+        # the null renderer runs the screen layout pipeline in memory without a terminal, the final state of the
+        # screen is read with screen.get_lines() when execute returns; pass a NullRenderer(height, width) instead
+        # of 'null' to size the screen
+        # the ansi renderer writes to the terminal with escape sequences instead of curses
+        self.renderer = renderer
+
+        # execute items on processes_to_start long-lived workers instead of starting a process per item
+        self.pool = pool
+        self.workers = []
+        # number of items submitted to a worker per round-trip or 'auto' to size chunks from the queued items
+        self.chunksize = chunksize
+        # workers that were signaled to exit when the autoscaler lowered processes_to_start
+        self.retired_workers = []
 
         self.get_process_data = get_process_data
         if self.get_process_data:
@@ -69,6 +179,11 @@ class MPcurses(MPmq):
             # respect processes_to_start if initially passed in
             self.processes_to_start = processes_to_start if processes_to_start else None
 
+        # items of process data returned by get_process_data as an iterator are received from a thread
+        # and started while get_process_data is still producing them
+        self.streaming = False
+        self.process_data_queue = None
+
         self.init_messages = [] if init_messages is None else init_messages
         start_time = datetime.now().strftime('%m/%d/%Y %H:%M:%S')
         self.init_messages.append(f'mpcurses: Started:{start_time}')
@@ -79,29 +194,707 @@ class MPcurses(MPmq):
         if self.screen_layout:
             self.blink_screen = self.screen_layout.get('_screen', {}).get('blink', True)
 
-        self.blink_process = None
-
-        self.blink_queue = None
+        # periodic ui work such as blinking is driven by timers checked in the event loop
+        self.timers = []
         if self.blink_screen:
-            self.blink_queue = Queue()
+            self.blink_state = itertools.cycle(['blink-on', 'blink-off'])
+            self.add_timer(BLINK_INTERVAL, self.toggle_blink)
+
+        # processes_to_start is the live target of an autoscaler that is updated every interval seconds
+        self.autoscaler = None
+        if autoscale:
+            config = autoscale if isinstance(autoscale, dict) else {}
+            self.autoscaler = Autoscaler(
+                minimum=config.get('min', 1),
+                maximum=config.get('max'),
+                step=config.get('step', 1),
+                max_load=config.get('max_load', 1),
+                max_pressure=config.get('max_pressure', 40))
+            self.add_timer(config.get('interval', AUTOSCALE_INTERVAL), self.autoscale)
+
+        # durations of items keyed by item_key are recorded to the history file and used by later runs to start
+        # the longest items first and to project when the run will finish
+        self.history_path = history
+        self.history = load_history(history) if history else None
+        self.item_key = item_key
+        self.costs = {}
+        self.failed = set()
+        self.projected_finish = None
+        if self.history is not None and self.screen_layout:
+            self.add_timer(PROJECTION_INTERVAL, self.update_projection)
+
+        # durations of the items that completed without error
+        self.durations = []
+
+        # once all items are started the items running far longer than the completed items are started again
+        # in idle slots and the attempt that completes first wins - a speculative attempt runs on a dedicated
+        # process that sends its messages on its own channel so its control messages can be told apart
+        self.speculation = None
+        self.attempts = {}
+        self.speculated = set()
+        if speculate:
+            config = speculate if isinstance(speculate, dict) else {}
+            self.speculation = {
+                'percentile': config.get('percentile', PERCENTILE),
+                'factor': config.get('factor', FACTOR),
+                'min_completed': config.get('min_completed', MIN_COMPLETED)
+            }
+            self.add_timer(config.get('interval', SPECULATE_INTERVAL), self.speculate)
+
+        # items running longer than item_timeout seconds and all items once the run ran longer than run_timeout
+        # seconds are terminated and recorded as timed out so a hung item does not hold a slot forever
+        self.item_timeout = item_timeout
+        self.run_timeout = run_timeout
+        self.started_at = None
+        self.expired = False
+        self.timed_out = {}
+        if self.item_timeout or self.run_timeout:
+            self.add_timer(TIMEOUT_INTERVAL, self.enforce_timeouts)
+
+        # processes and workers that can be terminated send their messages and results on their own channel
+        # instead of the shared message and result queues, a process terminated while it writes to a shared
+        # queue could corrupt it or leave its lock held and block every other process writing to it
+        self.isolate = bool(self.speculation or self.item_timeout or self.run_timeout)
+        # receiving end of the channel of every running process or worker keyed by its process
+        self.channels = {}
+        # (process, message) received on the channels and not yet processed
+        self.inbox = deque()
+        # results received on the channels keyed by offset
+        self.results = {}
+
+        # items that raise one of the retry exceptions are queued again after an exponential backoff until they
+        # were attempted attempts times - the function sends the RETRY control message before the ERROR control
+        # message if the exception it raised can be retried
+        self.retry = None
+        self.retryable = set()
+        self.retried = {}
+        self.retries = []
+        if retry:
+            config = retry if isinstance(retry, dict) else {}
+            exceptions = config.get('exceptions', Exception)
+            self.retry = {
+                'attempts': config.get('attempts', ATTEMPTS),
+                'backoff': config.get('backoff', BACKOFF),
+                'multiplier': config.get('multiplier', MULTIPLIER),
+                'max_backoff': config.get('max_backoff', MAX_BACKOFF),
+                'jitter': config.get('jitter', JITTER),
+                'exceptions': exceptions if isinstance(exceptions, tuple) else (exceptions,)
+            }
+            if self.retry['attempts'] < 1:
+                raise ValueError('retry attempts must be at least 1')
+            self.function = QueueHandlerDecorator(Retryable(self._function, self.retry['exceptions']))
+            self.add_timer(RETRY_INTERVAL, self.queue_retries)
+
+        # writes are applied to the screen as messages arrive but rendered at most max_fps times per second
+        self.render_interval = 0
+        if self.screen_layout:
+            max_fps = self.screen_layout.get('_screen', {}).get('max_fps', MAX_FPS)
+            if max_fps:
+                self.render_interval = 1 / max_fps
+        self.rendered_at = None
+        self.render_pending = False
+
+        # paint the screen from a dedicated thread so terminal output does not slow down draining the message queue
+        self.render_thread = None
+
+        # maximum number of messages drained from the message queue and processed as a block per loop iteration
+        # and maximum number of seconds spent draining the message queue per loop iteration - 0 disables the limit
+        self.batch_size = BATCH_SIZE
+        self.batch_time = BATCH_TIME
+        if self.screen_layout:
+            self.batch_size = self.screen_layout.get('_screen', {}).get('batch_size', BATCH_SIZE)
+            self.batch_time = self.screen_layout.get('_screen', {}).get('batch_time', BATCH_TIME)
+
+    def add_timer(self, interval, callback):
+        """ add timer that calls callback every interval seconds once timers are started
+        """
+        self.timers.append({'interval': interval, 'callback': callback, 'due_at': None})
 
-    def start_blink_process(self):
-        """ start blink process
+    def start_timers(self):
+        """ schedule all timers relative to now
         """
-        if not self.blink_screen:
+        now = monotonic()
+        for timer in self.timers:
+            timer['due_at'] = now + timer['interval']
+
+    def run_timers(self):
+        """ call callback of all timers that are due and reschedule them
+        """
+        if not self.timers:
             return
-        self.blink_process = Process(
-            target=blink,
-            args=(self.blink_queue,))
-        self.blink_process.start()
-        logger.info(f'started background process for blink with process id {self.blink_process.pid}')
+        now = monotonic()
+        for timer in self.timers:
+            if timer['due_at'] is not None and now >= timer['due_at']:
+                timer['due_at'] = now + timer['interval']
+                timer['callback']()
+
+    def get_timer_timeout(self):
+        """ return number of seconds until the next timer is due or None if no timer is scheduled
+        """
+        due_at = [timer['due_at'] for timer in self.timers if timer['due_at'] is not None]
+        if not due_at:
+            return None
+        return max(min(due_at) - monotonic(), 0)
+
+    def toggle_blink(self):
+        """ toggle blink state of screen status
+        """
+        update_screen_status(self.screen, next(self.blink_state), self.screen_layout['_screen'])
+        self.render_pending = True
+
+    def autoscale(self):
+        """ update processes_to_start from the autoscaler then start or retire processes to reach it
+        """
+        target = self.autoscaler.update(self.completed_processes, monotonic(), load=get_load(), pressure=get_pressure())
+        if target == self.processes_to_start:
+            return
+        logger.info(f'autoscaling processes to start from {self.processes_to_start} to {target}')
+        self.processes_to_start = target
+        self.start_queued_processes()
+        self.retire_workers()
+        self.on_state_change()
+
+    def retire_workers(self):
+        """ retire idle workers while there are more workers than processes_to_start
+        """
+        for worker in [worker for worker in self.workers if not worker.offsets]:
+            if len(self.workers) <= self.processes_to_start:
+                break
+            logger.debug(f'retiring worker with id:{worker.process.pid}')
+            worker.retire()
+            self.workers.remove(worker)
+            # retired workers are stopped with the other workers once their results are drained
+            self.retired_workers.append(worker)
+
+    def get_costs(self, start=0):
+        """ return dict of offset to duration recorded in history for process data from offset start
+        """
+        costs = {}
+        for offset in range(start, len(self.process_data)):
+            key = get_item_key(self.item_key, self.process_data[offset])
+            if key in self.history:
+                costs[offset] = self.history[key]
+        return costs
+
+    def populate_process_queue(self):
+        """ populate process queue from process data ordered longest first if history is enabled
+            override parent class method
+        """
+        if self.history is None:
+            super(MPcurses, self).populate_process_queue()
+            return
+        self.costs = self.get_costs()
+        logger.debug(f'populating the process queue longest first using the history of {len(self.costs)} items')
+        for item in order_by_cost(enumerate(self.process_data), self.costs):
+            self.process_queue.put(item)
+
+    def record_duration(self, offset):
+        """ record duration of item at offset and add it to the history if history is enabled unless the item failed
+        """
+        if offset in self.failed:
+            return
+        meta = self.processes[offset]
+        duration = (meta['stop_time'] - meta['start_time']).total_seconds()
+        self.durations.append(duration)
+        if self.history is not None:
+            update_history(self.history, get_item_key(self.item_key, self.process_data[offset]), duration)
+
+    def write_history(self):
+        """ write history to history file if history is enabled
+        """
+        if self.history is None:
+            return
+        try:
+            save_history(self.history_path, self.history)
+            logger.debug(f'saved history of {len(self.history)} items to {self.history_path}')
+
+        except OSError as exception:
+            logger.warning(f'unable to save history file {self.history_path}: {exception}')
+
+    def get_cost(self, offset):
+        """ return projected duration of item at offset or None if it can not be projected yet
 
-    def stop_blink_process(self):
-        """ stop blink process
+            items without history are projected to take the mean duration of the items with history or of the
+            items completed so far
         """
-        if self.blink_screen and self.blink_process:
-            self.blink_process.terminate()
-            logger.debug('terminated blink process')
+        if offset in self.costs:
+            return self.costs[offset]
+        if self.costs:
+            return sum(self.costs.values()) / len(self.costs)
+        if self.durations:
+            return sum(self.durations) / len(self.durations)
+        return None
+
+    def update_projection(self):
+        """ update projected finish time from the projected durations of the running and queued items
+
+            a worker executes the rest of the chunk submitted to it after its running item so the process of a
+            running item is busy until the rest of its chunk is executed as well
+        """
+        now = datetime.now()
+        chunks = {}
+        if self.pool:
+            for offset, meta in self.processes.items():
+                if not meta['stop_time']:
+                    chunks.setdefault(meta['worker'], []).append(offset)
+        running = []
+        for offset, start_time in self.get_running_items():
+            offsets = chunks[self.processes[offset]['worker']] if self.pool else [offset]
+            costs = [self.get_cost(item) for item in offsets]
+            if None in costs:
+                return
+            running.append(max(costs[0] - (now - start_time).total_seconds(), 0) + sum(costs[1:]))
+        queued = [self.get_cost(offset) for offset, _ in list(self.process_queue.queue)]
+        if None in queued:
+            return
+        seconds = project_finish(running, queued, self.processes_to_start)
+        projected_finish = (now + timedelta(seconds=seconds)).strftime('%H:%M:%S')
+        if projected_finish != self.projected_finish:
+            self.projected_finish = projected_finish
+            self.on_state_change()
+
+    def update_row(self, offset, message):
+        """ update screen row of item at offset with message
+
+            message is processed exactly like a message logged by the item so it is only shown if a table field
+            of the screen layout has a regex that matches it, the messages sent are:
+                mpcurses: started speculative attempt
+                mpcurses: speculative attempt completed first
+                mpcurses: attempt <attempt> of <attempts> in <delay>s
+                ERROR: <exception> - when the item timed out
+            a table field with regex r'^(?P<value>(mpcurses|ERROR): .*)$' shows them as the status of the item
+        """
+        if not self.screen:
+            return
+        update_screen(f'#{offset}-{message}', self.screen, self.screen_layout)
+        self.render_pending = True
+
+    def get_running_items(self):
+        """ return list of (offset, start time) of the items being executed
+
+            a worker executes the items submitted to it one after the other so only the first of its items that
+            did not complete is running and it started when the worker completed the item before it
+        """
+        items = []
+        workers = []
+        for offset, meta in self.processes.items():
+            if meta['stop_time']:
+                continue
+            start_time = meta['start_time']
+            if self.pool:
+                worker = meta['worker']
+                if worker in workers:
+                    continue
+                workers.append(worker)
+                if worker.completed_at and worker.completed_at > start_time:
+                    start_time = worker.completed_at
+            items.append((offset, start_time))
+        return items
+
+    def speculate(self):
+        """ receive messages from speculative attempts then start speculative attempts of the stragglers in idle slots
+        """
+        self.receive_attempt_messages()
+        if self.streaming or not self.process_queue.empty():
+            return
+        threshold = get_straggler_threshold(self.durations, **self.speculation)
+        if threshold is None:
+            return
+        now = datetime.now()
+        for offset, start_time in self.get_running_items():
+            if self.active_processes + len(self.attempts) >= self.processes_to_start:
+                break
+            if offset in self.speculated:
+                continue
+            if self.pool and self.processes[offset]['worker'].offsets != {offset}:
+                # the worker of the item is terminated if the attempt wins so it must not have other items
+                continue
+            elapsed = (now - start_time).total_seconds()
+            if elapsed > threshold:
+                self.start_attempt(offset, elapsed)
+
+    def start_attempt(self, offset, elapsed):
+        """ start speculative attempt of item at offset on a dedicated process with its own channel
+        """
+        process, receiver = self.start_channel_process(offset, self.process_data[offset])
+        logger.info(f'started speculative attempt of item at offset:{offset} running for {elapsed:.1f}s with id:{process.pid}')
+        self.attempts[offset] = {
+            'process': process,
+            'receiver': receiver,
+            'error': False
+        }
+        self.speculated.add(offset)
+        self.update_row(offset, 'mpcurses: started speculative attempt')
+
+    def receive_attempt_messages(self):
+        """ update screen with messages from speculative attempts and complete the attempts that sent DONE
+        """
+        for offset, attempt in list(self.attempts.items()):
+            items, closed = receive(attempt['receiver'], self.batch_size or BATCH_SIZE)
+            for item in items:
+                if isinstance(item, dict):
+                    self.record_result(item)
+                    continue
+                message = self.parse_message(item)
+                if message['control'] == 'ERROR':
+                    attempt['error'] = True
+                elif message['control'] == 'DONE':
+                    self.complete_attempt(offset)
+                    break
+                elif message['control']:
+                    continue
+                elif self.screen:
+                    update_screen(message['message'], self.screen, self.screen_layout)
+                    self.render_pending = True
+            if closed and offset in self.attempts:
+                # the attempt exited without sending DONE
+                attempt['error'] = True
+                self.complete_attempt(offset)
+
+    def complete_attempt(self, offset):
+        """ complete speculative attempt of item at offset
+
+            a failed attempt is discarded and the item keeps running otherwise the attempt completed first so the
+            process or worker executing the item is terminated and the item is completed
+        """
+        attempt = self.attempts.pop(offset)
+        attempt['process'].join(self.timeout)
+        attempt['receiver'].close()
+        if attempt['error']:
+            logger.info(f'speculative attempt of item at offset:{offset} failed - waiting for the item to complete')
+            return
+        logger.info(f'speculative attempt of item at offset:{offset} completed first')
+        meta = self.processes[offset]
+        if self.pool:
+            self.terminate_worker(meta['worker'])
+        else:
+            meta['process'].terminate()
+            self.close_channel(meta['process'])
+        self.update_row(offset, 'mpcurses: speculative attempt completed first')
+        self.process_control_message(offset, 'DONE')
+
+    def stop_attempt(self, offset):
+        """ terminate speculative attempt of item at offset
+        """
+        attempt = self.attempts.pop(offset)
+        logger.info(f'terminating speculative attempt of item at offset:{offset} with id:{attempt["process"].pid}')
+        attempt['process'].terminate()
+        attempt['process'].join(self.timeout)
+        attempt['receiver'].close()
+
+    def stop_attempts(self):
+        """ terminate all speculative attempts
+        """
+        for offset in list(self.attempts):
+            self.stop_attempt(offset)
+
+    def enforce_timeouts(self):
+        """ time out the items that ran longer than item_timeout and all items once the run ran longer than run_timeout
+        """
+        now = datetime.now()
+        if self.run_timeout and self.started_at and (now - self.started_at).total_seconds() > self.run_timeout:
+            self.time_out_run(TimeoutError(f'run timed out after {self.run_timeout} seconds'))
+            return
+        if not self.item_timeout:
+            return
+        for offset, start_time in self.get_running_items():
+            if (now - start_time).total_seconds() > self.item_timeout:
+                self.time_out_item(offset, TimeoutError(f'timed out after {self.item_timeout} seconds'))
+
+    def time_out_run(self, exception):
+        """ time out all items - the queued items are not started and the running items are terminated
+        """
+        logger.info(f'{exception} - timing out all items')
+        self.expired = True
+        # items streamed after the run timed out are not started
+        self.streaming = False
+        while not self.process_queue.empty():
+            offset, _ = self.process_queue.get()
+            self.record_timeout(offset, exception)
+        while self.retries:
+            _, offset = heapq.heappop(self.retries)
+            self.record_timeout(offset, exception)
+        for offset, _ in self.get_running_items():
+            self.time_out_item(offset, exception)
+
+    def time_out_item(self, offset, exception):
+        """ terminate process executing item at offset then record the item as timed out and complete it
+
+            in pool mode the worker executing the item is terminated so the other items submitted to it are
+            queued again unless the run timed out
+        """
+        logger.info(f'item at offset:{offset} {exception} - terminating it')
+        meta = self.processes[offset]
+        if self.pool:
+            worker = meta['worker']
+            self.terminate_worker(worker)
+            for pending in sorted(worker.offsets - {offset}):
+                del self.processes[pending]
+                worker.offsets.discard(pending)
+                self.active_processes -= 1
+                if self.expired:
+                    self.record_timeout(pending, exception)
+                else:
+                    self.process_queue.put((pending, self.process_data[pending]))
+        else:
+            meta['process'].terminate()
+            self.close_channel(meta['process'])
+        self.update_row(offset, f'ERROR: {exception}')
+        if not self.expired and self.can_retry(offset) and isinstance(exception, self.retry['exceptions']):
+            self.retryable.add(offset)
+        else:
+            self.record_timeout(offset, exception)
+            self.failed.add(offset)
+            if self.screen and '_slots' in self.screen_layout['_screen']:
+                release_slot(self.screen_layout, offset, error=True)
+        self.process_control_message(offset, 'DONE')
+        self.start_queued_processes()
+
+    def can_retry(self, offset):
+        """ return True if retry is enabled and item at offset was attempted fewer than attempts times
+        """
+        return bool(self.retry) and self.retried.get(offset, 0) + 1 < self.retry['attempts']
+
+    def retry_item(self, offset):
+        """ end the failed attempt of item at offset and queue the item again once its backoff expired
+        """
+        self.retryable.discard(offset)
+        if offset in self.attempts:
+            self.stop_attempt(offset)
+        # the item gets new process meta-data when it is started again
+        meta = self.processes.pop(offset)
+        if self.pool:
+            worker = meta['worker']
+            worker.offsets.discard(offset)
+            worker.completed_at = datetime.now()
+        else:
+            meta['process'].join(self.timeout)
+        self.active_processes -= 1
+        retries = self.retried[offset] = self.retried.get(offset, 0) + 1
+        delay = get_backoff(
+            retries,
+            backoff=self.retry['backoff'],
+            multiplier=self.retry['multiplier'],
+            max_backoff=self.retry['max_backoff'],
+            jitter=self.retry['jitter'])
+        logger.info(f'retrying item at offset:{offset} in {delay:.1f}s')
+        heapq.heappush(self.retries, (monotonic() + delay, offset))
+        self.update_row(offset, f"mpcurses: attempt {retries + 1} of {self.retry['attempts']} in {delay:.1f}s")
+        if self.pool:
+            self.retire_workers()
+        self.start_queued_processes()
+        self.on_state_change()
+
+    def queue_retries(self):
+        """ queue the items whose backoff expired and start them
+        """
+        now = monotonic()
+        if not self.retries or self.retries[0][0] > now:
+            return
+        while self.retries and self.retries[0][0] <= now:
+            _, offset = heapq.heappop(self.retries)
+            self.process_queue.put((offset, self.process_data[offset]))
+        self.start_queued_processes()
+        self.on_state_change()
+
+    def record_timeout(self, offset, exception):
+        """ record item at offset as timed out in its process data and its result
+        """
+        self.process_data[offset]['result'] = exception
+        self.timed_out[offset] = exception
+
+    def start_processes(self):
+        """ start processes or start workers and submit a chunk of items to each worker if pool is enabled
+            override parent class method
+        """
+        self.started_at = datetime.now()
+        if self.autoscaler:
+            self.processes_to_start = self.autoscaler.start(self.processes_to_start)
+        if not self.pool:
+            super(MPcurses, self).start_processes()
+            return
+        self.populate_process_queue()
+        self.start_queued_processes()
+        logger.info(f'started {len(self.workers)} workers')
+
+    def start_queued_processes(self):
+        """ start processes for items in the process queue until processes_to_start processes are running
+            or submit them to idle workers starting workers until processes_to_start workers are running
+            if pool is enabled
+        """
+        while not self.process_queue.empty():
+            if not self.pool:
+                if self.active_processes >= self.processes_to_start:
+                    break
+            elif all(worker.offsets for worker in self.workers):
+                if len(self.workers) >= self.processes_to_start:
+                    break
+                self.start_worker()
+            self.start_next_process()
+
+    def start_worker(self):
+        """ start worker and add it to the workers
+        """
+        if not self.isolate:
+            worker = Worker(self.function, self.message_queue, self.result_queue, self.shared_data, use_keyword_arguments(self._function))
+            worker.start()
+            self.workers.append(worker)
+            return
+        receiver, channel = open_channel()
+        worker = Worker(self.function, channel, channel, self.shared_data, use_keyword_arguments(self._function))
+        worker.start()
+        channel.close()
+        self.channels[worker.process] = receiver
+        self.workers.append(worker)
+
+    def start_channel_process(self, offset, process_data):
+        """ return tuple of process started to execute item at offset and the receiving end of its channel
+        """
+        receiver, channel = open_channel()
+        args, kwargs = get_arguments(
+            offset, process_data, channel, channel, self.shared_data, use_keyword_arguments(self._function))
+        process = Process(target=self.function, args=args, kwargs=kwargs)
+        process.start()
+        # the process has its own copy of the sending end
+        channel.close()
+        return process, receiver
+
+    def close_channel(self, process):
+        """ close channel of process and discard the messages it sent that were not processed
+        """
+        receiver = self.channels.pop(process, None)
+        if receiver:
+            receiver.close()
+        self.inbox = deque(item for item in self.inbox if item[0] is not process)
+
+    def start_next_process(self):
+        """ start next process in the process queue or submit the next chunk of items in the process queue
+            to an idle worker if pool is enabled
+            override parent class method
+        """
+        if not self.pool:
+            if self.active_processes >= self.processes_to_start:
+                logger.debug('processes to start are running')
+                return
+            if not self.isolate:
+                super(MPcurses, self).start_next_process()
+                return
+            offset, process_data = self.process_queue.get()
+            process, receiver = self.start_channel_process(offset, process_data)
+            logger.info(f'started background process at offset:{offset} with id:{process.pid} name:{process.name}')
+            self.channels[process] = receiver
+            self.processes[offset] = {
+                'process': process,
+                'start_time': datetime.now(),
+                'stop_time': None,
+                'duration': None
+            }
+            self.active_processes += 1
+            self.on_start_process()
+            return
+        if sum(1 for worker in self.workers if worker.offsets) >= self.processes_to_start:
+            logger.debug('processes to start are running')
+            return
+        worker = next((worker for worker in self.workers if not worker.offsets), None)
+        if not worker:
+            logger.debug('there are no idle workers')
+            return
+        chunksize = get_chunksize(self.chunksize, self.process_queue.qsize(), len(self.workers))
+        chunk = []
+        while len(chunk) < chunksize and not self.process_queue.empty():
+            chunk.append(self.process_queue.get())
+        worker.submit(chunk)
+        logger.info(f'submitted {len(chunk)} items to worker with id:{worker.process.pid}')
+        start_time = datetime.now()
+        for offset, _ in chunk:
+            self.processes[offset] = {
+                'process': worker.process,
+                'worker': worker,
+                'start_time': start_time,
+                'stop_time': None,
+                'duration': None
+            }
+        self.active_processes += len(chunk)
+        self.on_start_process()
+
+    def complete_process(self, offset):
+        """ complete the process at offset or release its worker if pool is enabled
+            override parent class method
+        """
+        if not self.pool:
+            super(MPcurses, self).complete_process(offset)
+            self.record_duration(offset)
+            return
+        meta = self.processes[offset]
+        logger.info(f'item at offset:{offset} has completed')
+        worker = meta['worker']
+        worker.offsets.discard(offset)
+        if worker.completed_at and worker.completed_at > meta['start_time']:
+            # an item of a chunk starts when the worker completes the item before it
+            meta['start_time'] = worker.completed_at
+        meta['stop_time'] = worker.completed_at = datetime.now()
+        meta['duration'] = self.get_duration(meta['start_time'], meta['stop_time'])
+        self.record_duration(offset)
+        self.active_processes -= 1
+        self.completed_processes += 1
+        self.retire_workers()
+        self.on_complete_process()
+
+    def get_results(self):
+        """ return results of function execution from all processes ordered by offset then stop workers
+            override parent class method
+        """
+        # results arrive in completion order which differs from offset order when items are chunked
+        if self.isolate:
+            # a process sends its result before its DONE control message so only the results of workers
+            # that are still running can be left on the channels
+            logger.debug('getting results from all processes using their channels')
+            self.receive_channel_messages(0)
+        else:
+            logger.debug('getting results from all processes using the result queue')
+            while True:
+                try:
+                    self.record_result(self.result_queue.get(True, self.timeout))
+                except Empty:
+                    logger.debug('the result queue is now empty')
+                    break
+        self.result_queue.close()
+        results = dict(self.results)
+        # items that timed out were terminated before they sent a result
+        results.update(self.timed_out)
+        # workers are stopped after their results are drained from the result queue since a process
+        # does not exit until all the data it put on a queue has been written to the underlying pipe
+        self.stop_workers()
+        for process in list(self.channels):
+            self.close_channel(process)
+        return [results[offset] for offset in sorted(results)]
+
+    def record_result(self, result_data):
+        """ record result of item sent as dict of offset and result
+        """
+        offset = result_data['offset']
+        result = result_data['result']
+        logger.debug(f'adding result of process at offset:{offset} to results')
+        # the result of an item that succeeded is kept over the exceptions of its failed attempts
+        if not isinstance(result, Exception) or isinstance(self.results.get(offset, result), Exception):
+            self.results[offset] = result
+
+    def terminate_worker(self, worker):
+        """ terminate worker and remove it from the workers
+        """
+        worker.process.terminate()
+        self.close_channel(worker.process)
+        worker.stop(self.timeout)
+        if worker in self.workers:
+            self.workers.remove(worker)
+
+    def stop_workers(self):
+        """ stop all workers
+        """
+        for worker in self.workers + self.retired_workers:
+            worker.stop(self.timeout)
+        self.workers = []
+        self.retired_workers = []
 
     def on_start_process(self):
         """ override base class method - call on_state_change
@@ -123,8 +916,60 @@ class MPcurses(MPmq):
             'process-update',
             self.screen_layout['_screen'],
             running=self.active_processes,
-            queued=self.process_queue.qsize(),
-            completed=self.completed_processes)
+            queued=self.process_queue.qsize() + len(self.retries),
+            completed=self.completed_processes,
+            target=self.processes_to_start if self.autoscaler else None,
+            finish=self.projected_finish)
+        self.render_pending = True
+
+    def process_control_message(self, offset, control):
+        """ release slot of item at offset then process control message
+            override parent class method
+        """
+        meta = self.processes.get(offset)
+        if meta and meta['stop_time']:
+            # the losing attempt of a speculatively executed item may complete before it is terminated
+            logger.debug(f'ignoring {control} control message of item at offset:{offset} that already completed')
+            return
+        if control == 'RETRY':
+            self.retryable.add(offset)
+            return
+        if offset in self.retryable and self.can_retry(offset):
+            # the failed attempt ends with the DONE control message that follows the ERROR control message
+            if control == 'DONE':
+                self.retry_item(offset)
+            return
+        self.retryable.discard(offset)
+        if control == 'DONE' and offset in self.attempts:
+            # the item completed before its speculative attempt
+            self.stop_attempt(offset)
+        if self.screen and '_slots' in self.screen_layout['_screen']:
+            release_slot(self.screen_layout, offset, error=control == 'ERROR')
+        if control == 'ERROR':
+            self.failed.add(offset)
+        if control == 'ERROR' and self.streaming:
+            # items streamed after an error are not started just like the items purged from the process queue
+            logger.info('error detected - no more streamed items will be started')
+            self.streaming = False
+        if control == 'ERROR' and self.retries:
+            # items waiting to be retried are not started again just like the items purged from the process queue
+            logger.info('error detected - no more items will be retried')
+            self.retries = []
+        try:
+            super(MPcurses, self).process_control_message(offset, control)
+
+        except NoActiveProcesses:
+            if self.streaming:
+                logger.debug('waiting for get_process_data to stream more items')
+                return
+            if self.retries:
+                logger.debug('waiting for items to be retried')
+                return
+            raise
+
+        if self.streaming:
+            # workers are started as streamed items arrive so there may be fewer than processes_to_start
+            self.start_queued_processes()
 
     def execute_get_process_data(self):
         """ execute get_process_data function
@@ -134,10 +979,73 @@ class MPcurses(MPmq):
             doc = self.get_process_data.__doc__
             update_screen_status(self.screen, 'get-process-data', self.screen_layout['_screen'], data=doc)
             kwargs = self.shared_data if self.shared_data else {}
-            self.process_data, self.shared_data = self.get_process_data(**kwargs)
+            if isgeneratorfunction(self.get_process_data):
+                process_data = self.get_process_data(**kwargs)
+            else:
+                process_data, self.shared_data = self.get_process_data(**kwargs)
+            if isinstance(process_data, Iterator):
+                self.start_streaming(process_data)
+                process_data = []
+            self.process_data = process_data
             update_screen_status(self.screen, 'get-process-data', self.screen_layout['_screen'])
             if not self.processes_to_start:
-                self.processes_to_start = len(self.process_data)
+                # the number of streamed items is not known so as many processes as cpus are started
+                self.processes_to_start = (os.cpu_count() or 1) if self.streaming else len(self.process_data)
+
+    def start_streaming(self, process_data):
+        """ start thread that receives items from process data iterator
+        """
+        logger.debug('streaming process data')
+        self.streaming = True
+        self.process_data_queue = Queue()
+        Thread(target=self.stream_process_data, args=(process_data,), daemon=True).start()
+
+    def stream_process_data(self, process_data):
+        """ put every item of process data iterator on the process data queue followed by STREAM_END
+            executed in a thread - an exception raised by the iterator is put on the queue to be raised by the
+            event loop
+        """
+        try:
+            for data in process_data:
+                self.process_data_queue.put(data)
+
+        except Exception as exception:
+            self.process_data_queue.put(exception)
+
+        self.process_data_queue.put(STREAM_END)
+
+    def receive_process_data(self):
+        """ add items received from process data iterator to the process data and the process queue then start them
+        """
+        if not self.streaming:
+            return
+        start = len(self.process_data)
+        while True:
+            try:
+                data = self.process_data_queue.get(False)
+            except Empty:
+                break
+            if isinstance(data, Exception):
+                raise data
+            if data is STREAM_END:
+                logger.debug('get_process_data finished streaming')
+                self.streaming = False
+                break
+            self.process_data.append(data)
+        offsets = len(self.process_data)
+        if offsets > start:
+            extend_screen_offsets(self.screen, self.screen_layout, start, offsets)
+            slots = self.screen_layout['_screen'].get('_slots')
+            for offset in range(start, offsets):
+                if slots is None:
+                    echo_to_screen(self.screen, self.process_data[offset], self.screen_layout, offset=offset)
+                self.process_queue.put((offset, self.process_data[offset]))
+            if self.history is not None:
+                self.costs.update(self.get_costs(start=start))
+            self.start_queued_processes()
+            self.on_state_change()
+        if not self.streaming and self.process_queue.empty() and not self.active_processes and not self.retries:
+            raise NoActiveProcesses()
 
     def setup_screen(self):
         """ setup screen
@@ -147,7 +1055,8 @@ class MPcurses(MPmq):
         self.execute_get_process_data()
 
         # initialize screen with offsets
-        initialize_screen_offsets(self.screen, self.screen_layout, len(self.process_data), self.processes_to_start)
+        initialize_screen_offsets(
+            self.screen, self.screen_layout, len(self.process_data), self.processes_to_start, streaming=self.streaming)
 
         # update screen with all initialization messages if they were provided
         logger.debug('updating screen with init messages')
@@ -158,12 +1067,17 @@ class MPcurses(MPmq):
         logger.debug('echoing shared data to screen')
         echo_to_screen(self.screen, self.shared_data, self.screen_layout)
 
-        # echo all process data to screen
-        logger.debug('echoing process data to screen')
-        for offset, data in enumerate(self.process_data):
-            echo_to_screen(self.screen, data, self.screen_layout, offset=offset)
+        slots = self.screen_layout['_screen'].get('_slots')
+        if slots is not None:
+            # process data is echoed to the slot of an item when the slot is assigned
+            slots['process_data'] = self.process_data
+        else:
+            # echo all process data to screen
+            logger.debug('echoing process data to screen')
+            for offset, data in enumerate(self.process_data):
+                echo_to_screen(self.screen, data, self.screen_layout, offset=offset)
 
-        self.start_blink_process()
+        self.start_timers()
 
     def teardown_screen(self):
         """ tear down screen
@@ -174,62 +1088,185 @@ class MPcurses(MPmq):
 
         finalize_screen(self.screen, self.screen_layout)
 
-        self.stop_blink_process()
-
-    def get_blink_message(self):
-        """ return message from blink queue
+    @staticmethod
+    def parse_message(message):
+        """ return dict consisting of offset, control and message for message
         """
-        try:
-            return self.blink_queue.get(False)
-
-        except Empty:
-            return None
-
-    def get_message(self):
-        """ return message from top of message queue
-            override parent class method
-        """
-        if self.blink_screen:
-            # if blink is enabled then process blink message first
-            blink_message = self.get_blink_message()
-            if blink_message:
-                update_screen_status(self.screen, blink_message, self.screen_layout['_screen'])
-
         offset = None
         control = None
-        message = self.message_queue.get(False)
-        match = re.match(r'^#(?P<offset>\d+)-(?P<control>DONE|ERROR)$', message)
-        if match:
-            offset = int(match.group('offset'))
-            control = match.group('control')
+        # only run the control regex on messages that can be control messages
+        if message.endswith(('-DONE', '-ERROR', '-RETRY')):
+            match = re.match(r'^#(?P<offset>\d+)-(?P<control>DONE|ERROR|RETRY)$', message)
+            if match:
+                offset = int(match.group('offset'))
+                control = match.group('control')
         return {
             'offset': offset,
             'control': control,
             'message': message}
 
+    def get_message(self):
+        """ return message from top of message queue
+            override parent class method
+        """
+        # run timers that are due first
+        self.run_timers()
+        if not self.isolate:
+            return self.parse_message(self.message_queue.get(False))
+        if not self.inbox:
+            self.receive_channel_messages(0)
+        if not self.inbox:
+            raise Empty
+        return self.inbox.popleft()[1]
+
+    def get_messages(self):
+        """ return list of messages drained from message queue
+
+            blocks until the first message arrives or until the wait timeout expires, then drains up to
+            batch_size messages or as many as are available within batch_time seconds
+            raises queue.Empty if no message arrived before the wait timeout expired
+        """
+        self.run_timers()
+        timeout = self.get_wait_timeout()
+        if self.isolate:
+            if not self.inbox:
+                self.receive_channel_messages(timeout)
+            if not self.inbox:
+                raise Empty
+            count = min(len(self.inbox), self.batch_size or BATCH_SIZE)
+            return [self.inbox.popleft()[1] for _ in range(count)]
+        if timeout:
+            message = self.message_queue.get(True, timeout)
+        else:
+            message = self.message_queue.get(False)
+        messages = [self.parse_message(message)]
+        started_at = monotonic()
+        while len(messages) < self.batch_size:
+            if self.batch_time and monotonic() - started_at >= self.batch_time:
+                break
+            try:
+                messages.append(self.parse_message(self.message_queue.get(False)))
+            except Empty:
+                break
+        return messages
+
+    def receive_channel_messages(self, timeout):
+        """ receive messages and results sent on the channels waiting at most timeout seconds for the first
+
+            messages are added to the inbox and results are recorded, the channel of a process that exited
+            is closed once everything it sent was received
+        """
+        ready = wait(list(self.channels.values()), timeout)
+        for process, receiver in list(self.channels.items()):
+            if receiver not in ready:
+                continue
+            items, closed = receive(receiver, self.batch_size or BATCH_SIZE)
+            for item in items:
+                if isinstance(item, dict):
+                    self.record_result(item)
+                else:
+                    self.inbox.append((process, self.parse_message(item)))
+            if closed:
+                # the messages the process sent before it exited are still processed
+                del self.channels[process]
+                receiver.close()
+
+    def get_wait_timeout(self):
+        """ return number of seconds to wait for the next message
+
+            waits until the next frame is due if there are updates waiting to be rendered otherwise waits
+            at most WAIT_TIMEOUT seconds, in both cases no longer than until the next timer is due
+        """
+        timeout = WAIT_TIMEOUT
+        if self.render_pending and self.rendered_at is not None:
+            remaining = self.rendered_at + self.render_interval - monotonic()
+            timeout = min(max(remaining, 0), WAIT_TIMEOUT)
+        timer_timeout = self.get_timer_timeout()
+        if timer_timeout is not None:
+            timeout = min(timeout, timer_timeout)
+        return timeout
+
+    def render_screen(self, force=False):
+        """ render screen if there are pending updates and a frame is due or if forced
+        """
+        now = monotonic()
+        if force or (self.render_pending and (self.rendered_at is None or now - self.rendered_at >= self.render_interval)):
+            self.follow_running_rows()
+            flush_screen(self.screen, self.screen_layout)
+            if not self.render_thread:
+                # the render thread paints the screen when it is running
+                refresh_screen(self.screen)
+            self.rendered_at = now
+            self.render_pending = False
+        if not self.render_pending and scroll_screen(self.screen, self.screen_layout):
+            # keys are only read once the frame is on screen since reading a key refreshes a window that changed
+            self.render_pending = True
+
+    def follow_running_rows(self):
+        """ scroll the viewport of a virtual table to the rows of the running items
+        """
+        viewport = self.screen_layout['_screen'].get('_viewport')
+        if viewport and viewport['follow']:
+            follow_viewport(self.screen, self.screen_layout, [offset for offset, _ in self.get_running_items()])
+
+    def start_render_thread(self):
+        """ start render thread if enabled
+        """
+        if not self.screen_layout.get('_screen', {}).get('render_thread'):
+            return
+        if not uses_curses(self.screen):
+            logger.debug('render thread is only supported with the curses renderer')
+            return
+        self.render_thread = RenderThread(self.screen, self.render_interval or 1 / MAX_FPS)
+        self.render_thread.start()
+
+    def stop_render_thread(self):
+        """ stop render thread if running
+        """
+        if self.render_thread:
+            self.render_thread.stop()
+            self.render_thread = None
+
     def run_screen(self, screen):
         """ run with screen
         """
         # set screen attribute so instance methods have access to screen
+        screen_config = self.screen_layout.get('_screen', {})
+        if not isinstance(screen, FrameBuffer) and (screen_config.get('shadow') or screen_config.get('render_thread')):
+            # only cells that changed are written to the curses window
+            screen = CursesRenderer(screen)
         self.screen = screen
         self.setup_screen()
-        self.start_processes()
+        if self.screen_layout['_screen'].get('_viewport'):
+            # the viewport is scrolled with keys read without waiting while the run is in progress
+            self.screen.nodelay(True)
+        self.start_render_thread()
+        try:
+            self.start_processes()
 
-        while True:
-            try:
-                message = self.get_message()
-                if message['control']:
-                    self.process_control_message(message['offset'], message['control'])
-                else:
-                    update_screen(message['message'], self.screen, self.screen_layout)
+            while True:
+                try:
+                    self.receive_process_data()
+                    for message in self.get_messages():
+                        if message['control']:
+                            self.process_control_message(message['offset'], message['control'])
+                        else:
+                            update_screen(message['message'], self.screen, self.screen_layout)
+                    self.render_pending = True
+                    self.render_screen()
 
-            except NoActiveProcesses:
-                logger.info('there are no more active processses - quitting')
-                break
+                except NoActiveProcesses:
+                    logger.info('there are no more active processses - quitting')
+                    break
 
-            except Empty:
-                # queue.Empty exception is raised when nothing is in the multiprocessing message queue
-                refresh_screen(self.screen)
+                except Empty:
+                    # queue.Empty exception is raised when no message arrived within the wait timeout
+                    self.render_screen()
+
+            self.render_screen(force=True)
+
+        finally:
+            self.stop_render_thread()
 
         self.teardown_screen()
 
@@ -237,7 +1274,28 @@ class MPcurses(MPmq):
         """ execute run
             override parent class method
         """
-        if self.screen_layout:
-            wrapper(self.run_screen)
-        else:
-            self.run()
+        try:
+            if self.screen_layout:
+                renderer = self.renderer
+                if renderer == 'null':
+                    renderer = NullRenderer()
+                elif renderer == 'ansi':
+                    renderer = AnsiRenderer()
+                if renderer == 'curses':
+                    wrapper(self.run_screen)
+                elif hasattr(type(renderer), '__enter__'):
+                    # renderers writing to a terminal are started and stopped around the run
+                    with renderer as screen:
+                        self.run_screen(screen)
+                else:
+                    self.run_screen(renderer)
+            else:
+                self.start_timers()
+                self.run()
+
+        except BaseException:
+            self.stop_attempts()
+            self.stop_workers()
+            raise
+
+        self.write_history()
@@ -0,0 +1,131 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import logging
+from inspect import signature
+from multiprocessing import Pipe
+from multiprocessing import Process
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 3
+CHUNKS_PER_WORKER = 4
+
+
+def use_keyword_arguments(function):
+    """ return True if process data and shared data are to be passed to function as keyword arguments
+
+        this is the case if all function parameters have defaults or are variable keywords
+    """
+    function_signature = signature(function)
+    return all(
+        (parameter.default != parameter.empty) or (parameter.kind == parameter.VAR_KEYWORD)
+        for parameter in function_signature.parameters.values())
+
+
+def get_chunksize(chunksize, queued, workers):
+    """ return number of items to submit to a worker in one round-trip
+
+        if chunksize is 'auto' the chunk is a fraction of the items still queued so chunks are large while
+        the queue is long and shrink towards a single item at the end to keep the workers evenly loaded
+    """
+    if chunksize == 'auto':
+        return max(math.ceil(queued / (max(workers, 1) * CHUNKS_PER_WORKER)), 1)
+    return chunksize or 1
+
+
+def get_arguments(offset, process_data, message_queue, result_queue, shared_data, use_kwargs):
+    """ return args and kwargs to execute function decorated with the mpmq queue handler for item at offset
+    """
+    kwargs = {
+        'message_queue': message_queue,
+        'offset': offset,
+        'result_queue': result_queue
+    }
+    args = ()
+    if use_kwargs:
+        kwargs.update(**process_data)
+        kwargs.update(**shared_data)
+    else:
+        args = (process_data, shared_data)
+    return args, kwargs
+
+
+def work(function, connection, message_queue, result_queue, shared_data, use_kwargs):
+    """ execute function for every item of every chunk received on connection until None is received
+
+        function is decorated with the mpmq queue handler so every item sends its messages, result and
+        control messages with its own offset exactly as if it was executed by a dedicated process
+    """
+    while True:
+        try:
+            chunk = connection.recv()
+        except EOFError:
+            break
+        if chunk is None:
+            break
+        for offset, process_data in chunk:
+            args, kwargs = get_arguments(offset, process_data, message_queue, result_queue, shared_data, use_kwargs)
+            function(*args, **kwargs)
+
+
+class Worker():
+    """ long-lived background process that executes function for chunks of items submitted to it
+    """
+    def __init__(self, function, message_queue, result_queue, shared_data, use_kwargs):
+        """ Worker constructor
+        """
+        receiver, self.connection = Pipe(duplex=False)
+        self.process = Process(
+            target=work,
+            args=(function, receiver, message_queue, result_queue, shared_data, use_kwargs))
+        self.receiver = receiver
+        # offsets of the submitted items that have not completed - the worker is idle if empty
+        self.offsets = set()
+        # time the worker completed its last item
+        self.completed_at = None
+
+    def start(self):
+        """ start worker process
+        """
+        self.process.start()
+        # the receiving end of the pipe is only used by the worker process
+        self.receiver.close()
+        logger.info(f'started worker process with id:{self.process.pid} name:{self.process.name}')
+
+    def submit(self, chunk):
+        """ send chunk of (offset, process_data) items to worker
+        """
+        self.connection.send(chunk)
+        self.offsets.update(offset for offset, _ in chunk)
+
+    def retire(self):
+        """ signal worker to exit once it is idle without waiting for it to exit
+        """
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def stop(self, timeout=TIMEOUT):
+        """ signal worker to exit and terminate it if it does not exit within timeout
+        """
+        self.retire()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            logger.info(f'terminating worker process with id:{self.process.pid} name:{self.process.name}')
+            self.process.terminate()
+        self.connection.close()
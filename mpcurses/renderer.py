@@ -0,0 +1,519 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import curses
+import select
+import logging
+from collections import deque
+from threading import Event
+from threading import RLock
+from threading import Thread
+
+logger = logging.getLogger(__name__)
+
+# color pairs that do not use the pair number as the foreground color on the default background
+COLOR_PAIRS = {
+    232: (16, 226),  # black/yellow
+    233: (15, 136),  # white/brown
+    234: (16, 51),   # black/cyan
+    235: (15, 19),   # white/blue
+    236: (15, 240),  # white/grey
+    237: (15, 160),  # white/red
+    238: (16, 15),   # black/white
+    239: (15, 23),   # white/green
+    231: (11, 238),  # yellow/grey
+}
+
+
+def get_sgr(pair):
+    """ return SGR sequence setting the colors of color pair
+    """
+    if not pair:
+        return '\x1b[0m'
+    foreground, background = COLOR_PAIRS.get(pair, (pair, -1))
+    if background >= 0:
+        return f'\x1b[0;38;5;{foreground};48;5;{background}m'
+    return f'\x1b[0;38;5;{foreground}m'
+
+
+def get_frame(changes, get_sgr):
+    """ return escape sequences and text writing list of (y, x, text, attr) changes to a terminal
+
+        uses the minimal cursor moves and only changes colors when the attribute of a run differs from the
+        previous run; get_sgr returns the SGR sequence of an attribute
+    """
+    parts = []
+    cursor = None
+    current_attr = None
+    for y_pos, x_pos, text, attr in changes:
+        if cursor and cursor[0] == y_pos and cursor[1] < x_pos:
+            # moving forward on the same row is shorter than an absolute move
+            parts.append(f'\x1b[{x_pos - cursor[1]}C')
+        elif cursor != (y_pos, x_pos):
+            parts.append(f'\x1b[{y_pos + 1};{x_pos + 1}H')
+        if attr != current_attr:
+            parts.append(get_sgr(attr))
+            current_attr = attr
+        parts.append(text)
+        # runs never extend past the end of the row
+        cursor = (y_pos, x_pos + len(text))
+    return ''.join(parts)
+
+
+def write(fd, text):
+    """ write text to file descriptor
+
+        os.write releases the GIL while it waits on the terminal so other threads keep running
+    """
+    data = text.encode()
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
+class FrameBuffer():
+    """ in-memory model of the screen holding the character and attribute of every cell
+
+        exposes the subset of the curses window api used by the screen module; writes only update
+        the model and record which rows changed so a renderer can paint the differences
+    """
+    uses_curses = False
+
+    def __init__(self, height, width):
+        """ FrameBuffer constructor
+        """
+        self.height = height
+        self.width = width
+        self.chars = [[' '] * width for _ in range(height)]
+        self.attrs = [[0] * width for _ in range(height)]
+        self.dirty = set()
+        self.y_pos = 0
+        self.x_pos = 0
+
+    def getmaxyx(self):
+        """ return tuple of height and width
+        """
+        return self.height, self.width
+
+    def color_pair(self, color):
+        """ return attribute for color pair - the model stores the color pair number
+        """
+        return color
+
+    def set_cell(self, y_pos, x_pos, char, attr):
+        """ set character and attribute of cell and mark its row dirty if the cell changed
+        """
+        if self.chars[y_pos][x_pos] != char or self.attrs[y_pos][x_pos] != attr:
+            self.chars[y_pos][x_pos] = char
+            self.attrs[y_pos][x_pos] = attr
+            self.dirty.add(y_pos)
+
+    def addstr(self, y_pos, x_pos, text, attr=0):
+        """ write text at position wrapping at the right edge like curses
+            raises curses.error if the position is outside the screen or text runs past the last cell
+        """
+        if not (0 <= y_pos < self.height and 0 <= x_pos < self.width):
+            raise curses.error(f'addstr position ({y_pos}, {x_pos}) is outside the screen')
+        for char in text:
+            if y_pos >= self.height:
+                raise curses.error('addstr text runs past the end of the screen')
+            if char == '\n':
+                self.move(y_pos, x_pos)
+                self.clrtoeol()
+                y_pos += 1
+                x_pos = 0
+                continue
+            self.set_cell(y_pos, x_pos, char, attr)
+            x_pos += 1
+            if x_pos >= self.width:
+                y_pos += 1
+                x_pos = 0
+        self.y_pos = min(y_pos, self.height - 1)
+        self.x_pos = x_pos
+
+    def move(self, y_pos, x_pos):
+        """ move cursor to position
+        """
+        if not (0 <= y_pos < self.height and 0 <= x_pos < self.width):
+            raise curses.error(f'move position ({y_pos}, {x_pos}) is outside the screen')
+        self.y_pos = y_pos
+        self.x_pos = x_pos
+
+    def clrtoeol(self):
+        """ clear cells from cursor to end of line
+        """
+        for x_pos in range(self.x_pos, self.width):
+            self.set_cell(self.y_pos, x_pos, ' ', 0)
+
+    def get_text(self, y_pos):
+        """ return text of row
+        """
+        return ''.join(self.chars[y_pos])
+
+    def get_changes(self, front_chars, front_attrs):
+        """ return list of (y, x, text, attr) runs of cells in dirty rows that differ from the front buffer
+            and update the front buffer to match
+        """
+        changes = []
+        for y_pos in sorted(self.dirty):
+            chars = self.chars[y_pos]
+            attrs = self.attrs[y_pos]
+            front_row_chars = front_chars[y_pos]
+            front_row_attrs = front_attrs[y_pos]
+            x_pos = 0
+            while x_pos < self.width:
+                if chars[x_pos] == front_row_chars[x_pos] and attrs[x_pos] == front_row_attrs[x_pos]:
+                    x_pos += 1
+                    continue
+                # extend run over contiguous changed cells sharing the same attribute
+                start = x_pos
+                attr = attrs[x_pos]
+                while x_pos < self.width and attrs[x_pos] == attr and (
+                        chars[x_pos] != front_row_chars[x_pos] or attrs[x_pos] != front_row_attrs[x_pos]):
+                    x_pos += 1
+                changes.append((y_pos, start, ''.join(chars[start:x_pos]), attr))
+                front_row_chars[start:x_pos] = chars[start:x_pos]
+                front_row_attrs[start:x_pos] = attrs[start:x_pos]
+        self.dirty.clear()
+        return changes
+
+
+class CursesRenderer(FrameBuffer):
+    """ shadow frame buffer sitting in front of a curses window
+
+        writes update the shadow buffer and only cells whose character or attribute changed since the
+        last flush are written to the window when it is refreshed; when deferred refreshes are no-ops
+        and painting the window is left to a RenderThread
+    """
+    uses_curses = True
+
+    def __init__(self, window):
+        """ CursesRenderer constructor
+        """
+        height, width = window.getmaxyx()
+        super(CursesRenderer, self).__init__(height, width)
+        self.window = window
+        # front buffer holds what was last written to the window - the window starts out cleared
+        self.front_chars = [[' '] * width for _ in range(height)]
+        self.front_attrs = [[0] * width for _ in range(height)]
+        # guards the back buffer when it is written and painted from different threads
+        self.lock = RLock()
+        self.deferred = False
+        # keys read by the render thread while it owns the window
+        self.keys = deque()
+        self.no_delay = False
+
+    def __getattr__(self, name):
+        """ delegate curses window api not modeled by the frame buffer to the window
+        """
+        if name == 'window':
+            raise AttributeError(name)
+        return getattr(self.window, name)
+
+    def color_pair(self, color):
+        """ return curses attribute for color pair
+        """
+        return curses.color_pair(color)
+
+    def addstr(self, y_pos, x_pos, text, attr=0):
+        """ write text at position in the shadow buffer
+        """
+        with self.lock:
+            super(CursesRenderer, self).addstr(y_pos, x_pos, text, attr)
+
+    def clrtoeol(self):
+        """ clear cells from cursor to end of line in the shadow buffer
+        """
+        with self.lock:
+            super(CursesRenderer, self).clrtoeol()
+
+    def flush(self):
+        """ write cells that changed since the last flush to the window and return list of the changes
+        """
+        # only collecting the changes holds the lock - writing them to the terminal does not block writers
+        with self.lock:
+            changes = self.get_changes(self.front_chars, self.front_attrs)
+        for y_pos, x_pos, text, attr in changes:
+            try:
+                self.window.addstr(y_pos, x_pos, text, attr)
+
+            except curses.error:
+                # writing the bottom right cell moves the cursor off the window and raises an error
+                # even though the text was written
+                pass
+        return changes
+
+    def noutrefresh(self):
+        """ flush changes and stage window for the next doupdate
+        """
+        if self.deferred:
+            return
+        self.flush()
+        self.window.noutrefresh()
+
+    def refresh(self):
+        """ flush changes and refresh window
+        """
+        if self.deferred:
+            return
+        self.flush()
+        self.window.refresh()
+
+    def nodelay(self, flag):
+        """ set whether getch waits for a key
+        """
+        self.no_delay = flag
+        self.window.nodelay(flag)
+
+    def getch(self):
+        """ flush changes and return character read from window
+
+            when deferred the render thread reads the keys so the window is not touched from this thread
+        """
+        if self.deferred:
+            return self.keys.popleft() if self.keys else -1
+        self.flush()
+        return self.window.getch()
+
+
+class NullRenderer(FrameBuffer):
+    """ headless renderer keeping the screen in memory without a terminal
+
+        runs the full screen layout pipeline without curses so layout driven jobs can run where there is no
+        tty and the final state of every cell can be inspected when the run completes; the screen is HEIGHT
+        rows by WIDTH columns unless sized when constructed:
+
+            mp = MPcurses(..., renderer=NullRenderer(height=60, width=120))
+            mp.execute()
+            lines = mp.screen.get_lines()
+    """
+    HEIGHT = 200
+    WIDTH = 300
+
+    def __init__(self, height=HEIGHT, width=WIDTH):
+        """ NullRenderer constructor
+        """
+        super(NullRenderer, self).__init__(height, width)
+        self.no_delay = False
+
+    def noutrefresh(self):
+        """ nothing to stage
+        """
+        self.dirty.clear()
+
+    def refresh(self):
+        """ nothing to paint
+        """
+        self.dirty.clear()
+
+    def nodelay(self, flag):
+        """ set whether getch waits for a key
+        """
+        self.no_delay = flag
+
+    def getch(self):
+        """ return q since there is no keyboard to wait on or -1 if getch does not wait
+        """
+        return -1 if self.no_delay else ord('q')
+
+    def get_lines(self):
+        """ return list of text of all rows with trailing spaces removed
+        """
+        return [self.get_text(y_pos).rstrip() for y_pos in range(self.height)]
+
+
+class AnsiRenderer(FrameBuffer):
+    """ renderer writing the screen to a terminal with ANSI escape sequences instead of curses
+
+        keeps its own screen model and on refresh writes only the cells that changed since the last frame,
+        using the minimal cursor moves and SGR sequences, with a single write to the terminal per frame
+    """
+    def __init__(self, fd=None, height=None, width=None):
+        """ AnsiRenderer constructor
+        """
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        if height is None or width is None:
+            width, height = os.get_terminal_size(self.fd)
+        super(AnsiRenderer, self).__init__(height, width)
+        # front buffer holds what was last written to the terminal - the terminal is cleared when started
+        self.front_chars = [[' '] * width for _ in range(height)]
+        self.front_attrs = [[0] * width for _ in range(height)]
+        self.sgr = {}
+        self.input_fd = None
+        self.input_attributes = None
+        self.no_delay = False
+
+    def __enter__(self):
+        """ start renderer
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """ stop renderer
+        """
+        self.stop()
+
+    def start(self):
+        """ switch to the alternate screen, clear it, hide the cursor and read keys without echo
+        """
+        if sys.stdin.isatty():
+            # termios is only available on posix
+            import termios
+            import tty
+            self.input_fd = sys.stdin.fileno()
+            self.input_attributes = termios.tcgetattr(self.input_fd)
+            tty.setcbreak(self.input_fd)
+        self.write('\x1b[?1049h\x1b[0m\x1b[2J\x1b[?25l')
+
+    def stop(self):
+        """ restore the cursor, the main screen and the terminal mode
+        """
+        self.write('\x1b[0m\x1b[?25h\x1b[?1049l')
+        if self.input_attributes:
+            import termios
+            termios.tcsetattr(self.input_fd, termios.TCSADRAIN, self.input_attributes)
+            self.input_attributes = None
+
+    def write(self, text):
+        """ write text to terminal
+        """
+        write(self.fd, text)
+
+    def get_sgr(self, attr):
+        """ return SGR sequence setting the colors of color pair attr
+        """
+        sgr = self.sgr.get(attr)
+        if sgr is None:
+            sgr = self.sgr[attr] = get_sgr(attr)
+        return sgr
+
+    def get_frame(self):
+        """ return escape sequences and text updating the terminal with cells that changed since the last frame
+        """
+        return get_frame(self.get_changes(self.front_chars, self.front_attrs), self.get_sgr)
+
+    def noutrefresh(self):
+        """ nothing to stage - the screen model holds all writes until the next refresh
+        """
+
+    def refresh(self):
+        """ write cells that changed since the last frame to the terminal in a single write
+        """
+        frame = self.get_frame()
+        if frame:
+            self.write(frame)
+
+    def nodelay(self, flag):
+        """ set whether getch waits for a key
+        """
+        self.no_delay = flag
+
+    def getch(self):
+        """ refresh and return character read from the terminal or -1 if getch does not wait and no key is pressed
+        """
+        self.refresh()
+        if self.input_fd is None:
+            # there is no keyboard to wait on
+            return -1 if self.no_delay else ord('q')
+        if self.no_delay and not select.select([self.input_fd], [], [], 0)[0]:
+            return -1
+        data = os.read(self.input_fd, 1)
+        return data[0] if data else ord('q')
+
+
+class RenderThread(Thread):
+    """ thread painting the shadow frame buffer of a CursesRenderer to the terminal at a fixed cadence
+
+        the thread that writes to the renderer never touches the terminal while the render thread runs,
+        so a slow terminal does not slow down the writer; frames are written with ANSI escape sequences
+        straight to the terminal instead of with curses.doupdate which holds the GIL while it waits on the
+        terminal and would stall the writer as well
+    """
+    def __init__(self, renderer, interval, fd=None):
+        """ RenderThread constructor
+        """
+        super(RenderThread, self).__init__(name='render', daemon=True)
+        self.renderer = renderer
+        self.interval = interval
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        self.sgr = {}
+        self.stopped = Event()
+
+    def run(self):
+        """ paint the renderer every interval seconds until stopped
+        """
+        while not self.stopped.wait(self.interval):
+            self.paint()
+            if self.renderer.no_delay:
+                self.read_keys()
+
+    def get_sgr(self, attr):
+        """ return SGR sequence setting the colors of the color pair of curses attribute attr
+        """
+        sgr = self.sgr.get(attr)
+        if sgr is None:
+            sgr = self.sgr[attr] = get_sgr((attr & curses.A_COLOR) >> 8)
+        return sgr
+
+    def paint(self):
+        """ write changed cells to the window and write them to the terminal
+        """
+        # the window is kept up to date so curses can repaint the screen once the thread stops
+        frame = get_frame(self.renderer.flush(), self.get_sgr)
+        if frame:
+            # curses assumes the terminal is left with the default colors
+            write(self.fd, frame + '\x1b[0m')
+
+    def read_keys(self):
+        """ queue keys pressed since the last frame for the writer thread
+        """
+        window = self.renderer.window
+        # reading a key refreshes a window that changed - the frame is already on the terminal so the window is
+        # marked unchanged and with leaveok set reading does not move the cursor either
+        window.untouchwin()
+        while True:
+            char = window.getch()
+            if char == -1:
+                return
+            self.renderer.keys.append(char)
+
+    def start(self):
+        """ defer renderer refreshes to this thread and start it
+        """
+        self.renderer.window.leaveok(True)
+        self.renderer.deferred = True
+        super(RenderThread, self).start()
+        logger.debug('started render thread')
+
+    def stop(self):
+        """ stop thread, paint the final frame and hand refreshes back to the renderer
+        """
+        self.stopped.set()
+        if self.is_alive():
+            self.join()
+        self.renderer.deferred = False
+        self.renderer.keys.clear()
+        self.renderer.window.leaveok(False)
+        # curses does not know what the thread wrote to the terminal - clear and repaint the whole window
+        # so the terminal and curses agree on the screen and the cursor position again
+        self.renderer.flush()
+        self.renderer.window.touchwin()
+        self.renderer.window.clearok(True)
+        self.renderer.window.noutrefresh()
+        curses.doupdate()
+        logger.debug('stopped render thread')
@@ -0,0 +1,60 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = .1
+ATTEMPTS = 3
+BACKOFF = 1
+MULTIPLIER = 2
+MAX_BACKOFF = 60
+JITTER = .5
+# control message sent by an item before the ERROR control message if the exception it raised can be retried
+RETRY = 'RETRY'
+
+
+def get_backoff(retry, backoff=BACKOFF, multiplier=MULTIPLIER, max_backoff=MAX_BACKOFF, jitter=JITTER):
+    """ return number of seconds to wait before retry number retry of an item
+
+        the delay grows exponentially with every retry up to max_backoff and is spread by up to jitter times
+        itself so items that failed together are not retried together
+    """
+    delay = min(backoff * multiplier ** (retry - 1), max_backoff)
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+class Retryable():
+    """ function wrapper that sends the RETRY control message before raising an exception that can be retried
+    """
+    def __init__(self, function, exceptions):
+        """ Retryable constructor
+        """
+        self.function = function
+        self.exceptions = exceptions
+        # the mpmq queue handler logs the name of the function it decorates
+        self.__name__ = function.__name__
+
+    def __call__(self, *args, **kwargs):
+        """ execute function
+        """
+        try:
+            return self.function(*args, **kwargs)
+
+        except self.exceptions:
+            logger.debug(RETRY)
+            raise
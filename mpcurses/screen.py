@@ -16,16 +16,51 @@
 import re
 import sys
 import curses
+import heapq
 import itertools
-from time import sleep
+from collections import deque
+from collections import namedtuple
+from types import MappingProxyType
 import logging
 
+from .renderer import FrameBuffer
+from .renderer import COLOR_PAIRS
+
 
 logger = logging.getLogger(__name__)
 
 
 VALUE_LENGTH = 103
 
+MAX_FPS = 30
+
+STREAMING_ZFILL = 5
+
+CategoryPlan = namedtuple('CategoryPlan', [
+    'category', 'regex', 'has_groups', 'has_value_group', 'length', 'zfill', 'right_justify',
+    'replace_text', 'list', 'keep_count', 'table', 'clear', 'color', 'effects', 'effects_use_matched_value',
+    'position', 'positions'])
+
+ScreenPlan = namedtuple('ScreenPlan', ['categories', 'matchers', 'tokens', 'buckets', 'fallback'])
+
+REGEX_SPECIAL_CHARACTERS = '.^$*+?{}[]|()'
+REGEX_OPTIONAL_QUANTIFIERS = '?*{'
+
+
+def get_color_pair(screen, color):
+    """ return attribute for color pair
+        renderers keeping their own screen model provide their own color pair attributes
+    """
+    if isinstance(screen, FrameBuffer):
+        return screen.color_pair(color)
+    return curses.color_pair(color)
+
+
+def uses_curses(screen):
+    """ return True if screen is drawn by curses
+    """
+    return getattr(screen, 'uses_curses', True)
+
 
 def initialize_colors():
     """ initialize colors
@@ -34,18 +69,11 @@ def initialize_colors():
     curses.use_default_colors()
     for index in range(0, curses.COLORS):
         curses.init_pair(index, index, -1)
-    curses.init_pair(232, 16, 226)  # black/yellow
-    curses.init_pair(233, 15, 136)  # white/brown
-    curses.init_pair(234, 16, 51)   # black/cyan
-    curses.init_pair(235, 15, 19)   # white/blue
-    curses.init_pair(236, 15, 240)  # white/grey
-    curses.init_pair(237, 15, 160)  # white/red
-    curses.init_pair(238, 16, 15)   # black/white
-    curses.init_pair(239, 15, 23)   # white/green
-    curses.init_pair(231, 11, 238)  # yellow/grey
-
-
-def initialize_counter(offsets, screen_layout):
+    for index, (foreground, background) in COLOR_PAIRS.items():
+        curses.init_pair(index, foreground, background)
+
+
+def initialize_counter(offsets, screen_layout, start=0):
     """ initialize _counter_ category
 
         '_counter_': {
@@ -59,33 +87,36 @@ def initialize_counter(offsets, screen_layout):
             }
         }
     """
-    for offset in range(0, offsets):
+    for offset in range(start, offsets):
         screen_layout['_counter_'][offset] = {}
         screen_layout['_counter_'][offset]['_count'] = 0
         if 'modulus' in screen_layout['_counter_']:
             screen_layout['_counter_'][offset]['_modulus_count'] = 0
 
 
-def initialize_text(offsets, category, screen_layout, screen):
+def initialize_text(offsets, category, screen_layout, screen, start=0):
     """ initialize screen for categories containing text
     """
     category_data = screen_layout[category]
     if category_data.get('table'):
-        for offset in range(0, offsets):
-            screen.addstr(
+        for offset in range(start, offsets):
+            write_value(
+                screen,
+                screen_layout,
+                category,
                 get_category_y_pos(category, offset, screen_layout),
                 get_category_x_pos(category, offset, screen_layout),
                 category_data['text'],
-                curses.color_pair(category_data['text_color']))
+                category_data['text_color'])
     else:
         screen.addstr(
             category_data['position'][0],
             category_data['position'][1],
             category_data['text'],
-            curses.color_pair(category_data['text_color']))
+            get_color_pair(screen, category_data['text_color']))
 
 
-def initialize_keep_count(category, offsets, screen_layout):
+def initialize_keep_count(category, offsets, screen_layout, start=0):
     """ initialize category keep_count
 
         per process:
@@ -103,15 +134,18 @@ def initialize_keep_count(category, offsets, screen_layout):
             }
     """
     if screen_layout[category].get('table'):
-        for offset in range(0, offsets):
+        for offset in range(start, offsets):
             screen_layout[category][offset] = {}
             screen_layout[category][offset]['_count'] = 0
     else:
         screen_layout[category]['_count'] = 0
 
 
-def update_screen_status(screen, state, config, running=None, queued=None, completed=None, data=None):
+def update_screen_status(screen, state, config, running=None, queued=None, completed=None, data=None, target=None, finish=None):
     """ update screen status
+
+        if target is set the number of running processes is shown with the number of processes to run and
+        if finish is set the number of completed processes is shown with the projected finish time
     """
     height, width = screen.getmaxyx()
 
@@ -119,23 +153,23 @@ def update_screen_status(screen, state, config, running=None, queued=None, compl
 
     if state == 'initialize':
         text = config['title']
-        screen.addstr(0, 0, ' ' * (width - 1), curses.color_pair(color))
-        screen.addstr(0, width - len(text) - 1, text, curses.color_pair(color))
+        screen.addstr(0, 0, ' ' * (width - 1), get_color_pair(screen, color))
+        screen.addstr(0, width - len(text) - 1, text, get_color_pair(screen, color))
     elif state == 'finalize':
         text = '[Press q to exit]'
-        screen.addstr(0, 1, text, curses.color_pair(color))
+        screen.addstr(0, 1, text, get_color_pair(screen, color))
     elif state == 'blink-on':
         text = 'RUNNING'
-        screen.addstr(0, 1, text, curses.color_pair(color))
+        screen.addstr(0, 1, text, get_color_pair(screen, color))
     elif state == 'blink-off':
         text = 'RUNNING'
-        screen.addstr(0, 1, ' ' * len(text), curses.color_pair(color))
+        screen.addstr(0, 1, ' ' * len(text), get_color_pair(screen, color))
     elif state == 'get-process-data':
         if data:
             text = f'{data.splitlines()[0].strip().capitalize()}... this may take awhile'
             y_pos = int((height // 2) - 2)
             x_pos = int((width // 2) - (len(text) // 2) - len(text) % 2)
-            screen.addstr(y_pos, x_pos, text, curses.color_pair(color))
+            screen.addstr(y_pos, x_pos, text, get_color_pair(screen, color))
         else:
             y_pos = int((height // 2) - 2)
             x_pos = 0
@@ -152,13 +186,21 @@ def update_screen_status(screen, state, config, running=None, queued=None, compl
                 completed = 0
             zfill = config['zfill']
             rtext = f'  Running: {str(running).zfill(zfill)}'
-            screen.addstr(height - 4, 1, rtext, curses.color_pair(color))
+            if target is not None:
+                rtext = f'{rtext} of {str(target).zfill(zfill)}'
+            screen.addstr(height - 4, 1, rtext, get_color_pair(screen, color))
             qtext = f'   Queued: {str(queued).zfill(zfill)}'
-            screen.addstr(height - 3, 1, qtext, curses.color_pair(color))
+            screen.addstr(height - 3, 1, qtext, get_color_pair(screen, color))
             ctext = f'Completed: {str(completed).zfill(zfill)}'
-            screen.addstr(height - 2, 1, ctext, curses.color_pair(color))
+            if finish:
+                ctext = f'{ctext}   Finish: {finish}'
+            screen.addstr(height - 2, 1, ctext, get_color_pair(screen, color))
 
-    screen.refresh()
+    if state in ('process-update', 'blink-on', 'blink-off'):
+        # states updated while running are staged and rendered with the next frame
+        screen.noutrefresh()
+    else:
+        screen.refresh()
 
 
 def initialize_screen(screen, screen_layout):
@@ -169,18 +211,29 @@ def initialize_screen(screen, screen_layout):
     set_screen_defaults(screen_layout)
     validate_screen_size(screen, screen_layout)
 
-    initialize_colors()
-    curses.curs_set(0)
+    if uses_curses(screen):
+        initialize_colors()
+        curses.curs_set(0)
     update_screen_status(screen, 'initialize', screen_layout['_screen'])
 
 
-def initialize_screen_offsets(screen, screen_layout, offsets, processes_to_start):
+def initialize_screen_offsets(screen, screen_layout, offsets, processes_to_start, streaming=False):
     """ initialize screen offsets
+
+        if streaming is set the number of offsets is not known yet and offsets are added with extend_screen_offsets
     """
     logger.debug('initializing screen offsets')
 
+    if streaming:
+        screen_layout['_screen'].setdefault('zfill', STREAMING_ZFILL)
+        screen_layout['_screen'].setdefault('show_process_status', True)
     set_screen_defaults_processes(offsets, processes_to_start, screen_layout)
-    validate_screen_layout_processes(offsets, screen_layout)
+    if screen_layout['_screen'].get('slots'):
+        # table rows are slots reassigned to the items that are running
+        offsets = processes_to_start if streaming else min(offsets, processes_to_start)
+    if not streaming:
+        validate_screen_layout_processes(offsets, screen_layout)
+    initialize_viewport(screen, screen_layout, offsets)
 
     for category, data in screen_layout.items():
         if category == '_counter_':
@@ -190,61 +243,643 @@ def initialize_screen_offsets(screen, screen_layout, offsets, processes_to_start
         if data.get('list') and not data.get('keep_count'):
             # list requires keep_count to be set
             data['keep_count'] = True
+        if data.get('list'):
+            initialize_list(screen, category, screen_layout)
         if data.get('keep_count'):
             initialize_keep_count(category, offsets, screen_layout)
 
+    screen_layout['_screen']['_plan'] = compile_screen_layout(screen_layout, offsets=offsets)
+
+    if screen_layout['_screen'].get('coalesce'):
+        screen_layout['_screen']['_pending'] = {}
+
+    if '_counter_' in screen_layout and not screen_layout['_counter_'].get('width'):
+        # counters are drawn from their counts once per frame
+        screen_layout['_screen']['_bars'] = {'dirty': set(), 'drawn': {}, 'colors': {}}
+
+    if screen_layout['_screen'].get('slots'):
+        initialize_slots(screen, screen_layout, offsets)
+
     update_screen_status(screen, 'process-update', screen_layout['_screen'])
 
 
+def extend_screen_offsets(screen, screen_layout, start, offsets):
+    """ initialize screen for offsets start up to offsets added after screen offsets were initialized
+    """
+    if screen_layout['_screen'].get('slots'):
+        # the offsets of a slots table are its slots which do not change
+        return
+    logger.debug(f'extending screen offsets to {offsets}')
+    table = screen_layout.get('table')
+    if table and not table.get('virtual') and table.get('orientation', 'wrap_around') == 'wrap_around':
+        entries = table.get('rows', 0) * table.get('cols', 0)
+        if offsets > entries:
+            raise Exception(f'table definition of {entries} entries not sufficient for {offsets} processes')
+    viewport = screen_layout['_screen'].get('_viewport')
+    if viewport:
+        viewport['bottom'] += offsets - start
+    for category, data in screen_layout.items():
+        if category == '_counter_':
+            initialize_counter(offsets, screen_layout, start=start)
+        if not data.get('table'):
+            continue
+        if data.get('text'):
+            initialize_text(offsets, category, screen_layout, screen, start=start)
+        if data.get('keep_count'):
+            initialize_keep_count(category, offsets, screen_layout, start=start)
+
+
+def initialize_list(screen, category, screen_layout):
+    """ initialize list category ring buffer and spill file
+
+        a list shows its newest capacity entries and scrolls them in place once full; capacity defaults to the
+        rows between the list position and the bottom of the screen or the process status if it is shown; if
+        spill is set every entry is appended to the spill file
+    """
+    data = screen_layout[category]
+    if 'capacity' not in data:
+        height, _ = screen.getmaxyx()
+        bottom = height - 5 if screen_layout['_screen'].get('show_process_status') else height - 1
+        data['capacity'] = max(bottom - data['position'][0], 1)
+    data['_entries'] = deque(maxlen=data['capacity'])
+    # entries drawn on every row of the list
+    data['_drawn'] = []
+    # lists are drawn from their entries once per frame
+    screen_layout['_screen'].setdefault('_lists', set())
+    if data.get('spill'):
+        data['_spill'] = open(data['spill'], 'a')
+
+
+def write_list(screen_layout, category, value, color):
+    """ add value as the newest entry of list category and mark the list to be drawn with the next frame
+
+        once the list is full the oldest entry is dropped
+    """
+    data = screen_layout[category]
+    data['_entries'].append((value, color))
+    if '_spill' in data:
+        data['_spill'].write(f'{value}\n')
+    screen_layout['_screen']['_lists'].add(category)
+
+
+def draw_lists(screen, screen_layout):
+    """ draw lists whose entries changed since the last frame
+
+        only rows whose entry changed are written; once a list is full its entries move one row up for every
+        entry added so the oldest entry scrolls off, each entry is padded to the length of the entry it
+        replaces on its row
+    """
+    lists = screen_layout.get('_screen', {}).get('_lists')
+    if not lists:
+        return
+    for category in lists:
+        data = screen_layout[category]
+        y_pos = data['position'][0]
+        x_pos = get_category_x_pos(category, 0, screen_layout)
+        drawn = data['_drawn']
+        for index, entry in enumerate(data['_entries']):
+            if index == len(drawn):
+                drawn.append(entry)
+                write_screen(screen, screen_layout, category, y_pos + index + 1, x_pos, entry[0], entry[1], clear=data.get('clear', False))
+            elif entry != drawn[index]:
+                value = entry[0].ljust(len(drawn[index][0]))
+                drawn[index] = entry
+                write_screen(screen, screen_layout, category, y_pos + index + 1, x_pos, value, entry[1])
+    lists.clear()
+
+
+def close_lists(screen_layout):
+    """ close spill files of list categories
+    """
+    for data in screen_layout.values():
+        spill = data.get('_spill')
+        if spill:
+            spill.close()
+            del data['_spill']
+
+
+def initialize_slots(screen, screen_layout, slots):
+    """ initialize table slots
+
+        keeps the offset assigned to every slot, the free slots, the cells of every slot that are cleared when
+        the slot is reassigned, the last value of every category written to every slot and the history that
+        summarises the completed items
+    """
+    logger.debug(f'initializing {slots} table slots')
+    categories = [category for category, data in screen_layout.items() if data.get('table') and 'position' in data]
+    cells = get_slot_cells(screen, screen_layout, categories, slots)
+    screen_layout['_screen']['_slots'] = {
+        'offsets': {},
+        'free': list(range(slots)),
+        'cells': cells,
+        'values': [{} for _ in range(slots)],
+        'failed': set(),
+        'process_data': None,
+        'history': {
+            'completed': 0,
+            'errors': 0,
+            'counts': {category: 0 for category in categories if screen_layout[category].get('keep_count')},
+            'recent': deque(maxlen=slots)
+        }
+    }
+
+
+def get_slot_cells(screen, screen_layout, categories, slots):
+    """ return list of (y pos, x pos, width) cells of every slot
+
+        a cell spans from the position of a table category to the next table position on the same row or to
+        the end of the row
+    """
+    _, width = screen.getmaxyx()
+    positions = {}
+    for slot in range(slots):
+        for category in categories:
+            positions[(get_category_y_pos(category, slot, screen_layout), get_category_x_pos(category, slot, screen_layout))] = slot
+        if '_counter_' in screen_layout:
+            position = screen_layout['_counter_']['position']
+            positions[(position[0] + slot, position[1])] = slot
+    cells = [[] for _ in range(slots)]
+    ordered = sorted(positions)
+    for index, (y_pos, x_pos) in enumerate(ordered):
+        end = width - 1
+        if index + 1 < len(ordered) and ordered[index + 1][0] == y_pos:
+            end = ordered[index + 1][1]
+        cells[positions[(y_pos, x_pos)]].append((y_pos, x_pos, end - x_pos))
+    return cells
+
+
+def get_slot(screen, screen_layout, offset):
+    """ return slot assigned to offset assigning the lowest free slot if offset does not have one
+    """
+    slots = screen_layout['_screen']['_slots']
+    slot = slots['offsets'].get(offset)
+    if slot is None:
+        slot = assign_slot(screen, screen_layout, offset)
+    return slot
+
+
+def assign_slot(screen, screen_layout, offset):
+    """ assign lowest free slot to offset, reset the slot and echo the process data of offset to it
+    """
+    slots = screen_layout['_screen']['_slots']
+    if not slots['free']:
+        # more items are running than there are slots - reclaim the slot assigned the longest time ago
+        release_slot(screen_layout, next(iter(slots['offsets'])))
+    slot = heapq.heappop(slots['free'])
+    slots['offsets'][offset] = slot
+    reset_slot(screen, screen_layout, slot)
+    process_data = slots['process_data']
+    if process_data and offset < len(process_data):
+        echo_to_screen(screen, process_data[offset], screen_layout, offset=offset)
+    return slot
+
+
+def reset_slot(screen, screen_layout, slot):
+    """ reset counts of slot and clear its cells
+    """
+    slots = screen_layout['_screen']['_slots']
+    slots['values'][slot] = {}
+    for category in slots['history']['counts']:
+        screen_layout[category][slot]['_count'] = 0
+    if '_counter_' in screen_layout:
+        screen_layout['_counter_'][slot]['_count'] = 0
+        if 'modulus' in screen_layout['_counter_']:
+            screen_layout['_counter_'][slot]['_modulus_count'] = 0
+        bars = screen_layout['_screen'].get('_bars')
+        if bars:
+            bars['dirty'].discard(slot)
+            bars['drawn'].pop(slot, None)
+            bars['colors'].pop(slot, None)
+    for y_pos, x_pos, width in slots['cells'][slot]:
+        write_screen(screen, screen_layout, '_slot_', y_pos, x_pos, ' ' * width, 0)
+    for category, data in screen_layout.items():
+        if data.get('table') and data.get('text'):
+            write_screen(
+                screen,
+                screen_layout,
+                category,
+                get_category_y_pos(category, slot, screen_layout),
+                get_category_x_pos(category, slot, screen_layout),
+                data['text'],
+                data['text_color'])
+
+
+def release_slot(screen_layout, offset, error=False):
+    """ release slot assigned to offset and summarise the item into the history
+
+        the released slot keeps showing the item until the slot is assigned to another item
+    """
+    slots = screen_layout['_screen']['_slots']
+    if error:
+        slots['failed'].add(offset)
+        return
+    slot = slots['offsets'].pop(offset, None)
+    if slot is None:
+        return
+    history = slots['history']
+    history['completed'] += 1
+    if offset in slots['failed']:
+        slots['failed'].discard(offset)
+        history['errors'] += 1
+    for category in history['counts']:
+        history['counts'][category] += screen_layout[category][slot]['_count']
+    history['recent'].append((offset, slots['values'][slot]))
+    heapq.heappush(slots['free'], slot)
+
+
+def initialize_viewport(screen, screen_layout, offsets):
+    """ initialize scrollable viewport for virtual table
+
+        the rows of a virtual table are kept in memory and only the rows that fit in the viewport are written
+        to the screen; the viewport holds as many rows as fit above the process status unless table rows is set
+    """
+    table = screen_layout.get('table')
+    if not table or not table.get('virtual'):
+        return
+    logger.debug('initializing viewport')
+    categories = [category for category, data in screen_layout.items() if data.get('table') or category == '_counter_']
+    positions = [screen_layout[category]['position'] for category in categories]
+    top = min(y_pos for y_pos, _ in positions)
+    height, _ = screen.getmaxyx()
+    bottom = height - 4 if screen_layout['_screen'].get('show_process_status') else height - 1
+    rows = max(bottom - top, 1)
+    if table.get('rows'):
+        rows = min(table['rows'], rows)
+    screen_layout['_screen']['_viewport'] = {
+        'categories': frozenset(categories),
+        'top': top,
+        'left': min(x_pos for _, x_pos in positions),
+        'rows': rows,
+        'bottom': max(y_pos for y_pos, _ in positions) + offsets - 1,
+        'scroll': 0,
+        # keep the rows of the running items in view until the viewport is scrolled with a key
+        'follow': table.get('follow', True),
+        'store': {}
+    }
+
+
+def get_viewport(screen_layout, category):
+    """ return viewport if category is a virtual table category otherwise None
+    """
+    viewport = screen_layout.get('_screen', {}).get('_viewport')
+    if viewport and category in viewport['categories']:
+        return viewport
+    return None
+
+
+def get_row_segments(row, x_pos, value, attr):
+    """ return list of non-overlapping (x pos, value, attr) segments of row after writing value at x pos
+
+        segments are ordered by x pos and adjacent segments sharing an attribute are merged
+    """
+    end = x_pos + len(value)
+    segments = []
+    for start, text, text_attr in row:
+        stop = start + len(text)
+        if stop <= x_pos or start >= end:
+            segments.append((start, text, text_attr))
+            continue
+        # keep the parts of the segment the value does not overwrite
+        if start < x_pos:
+            segments.append((start, text[:x_pos - start], text_attr))
+        if stop > end:
+            segments.append((end, text[end - start:], text_attr))
+    segments.append((x_pos, value, attr))
+    segments.sort(key=lambda segment: segment[0])
+    merged = [segments[0]]
+    for start, text, text_attr in segments[1:]:
+        previous_start, previous_text, previous_attr = merged[-1]
+        if previous_attr == text_attr and previous_start + len(previous_text) == start:
+            merged[-1] = (previous_start, previous_text + text, text_attr)
+        else:
+            merged.append((start, text, text_attr))
+    return merged
+
+
+def write_viewport(screen, viewport, y_pos, x_pos, value, attr):
+    """ write value to virtual table row and to the screen if the row is visible
+
+        rows keep their cells as segments so they can be repainted on scroll
+    """
+    store = viewport['store']
+    store[y_pos] = get_row_segments(store.get(y_pos, ()), x_pos, value, attr)
+    screen_y_pos = y_pos - viewport['scroll']
+    if viewport['top'] <= screen_y_pos < viewport['top'] + viewport['rows']:
+        screen.addstr(screen_y_pos, x_pos, value, attr)
+
+
+def clear_viewport(screen, viewport, y_pos, x_pos):
+    """ clear virtual table row from x pos to end of line and clear the screen if the row is visible
+    """
+    row = viewport['store'].get(y_pos)
+    if row:
+        viewport['store'][y_pos] = [
+            (start, text[:x_pos - start], attr) for start, text, attr in row if start < x_pos]
+    screen_y_pos = y_pos - viewport['scroll']
+    if viewport['top'] <= screen_y_pos < viewport['top'] + viewport['rows']:
+        screen.move(screen_y_pos, x_pos)
+        screen.clrtoeol()
+
+
+def scroll_viewport(screen, viewport, scroll):
+    """ scroll viewport so it starts at virtual table row scroll and repaint the visible rows
+    """
+    max_scroll = max(viewport['bottom'] - viewport['top'] - viewport['rows'] + 1, 0)
+    scroll = min(max(scroll, 0), max_scroll)
+    if scroll == viewport['scroll']:
+        return
+    viewport['scroll'] = scroll
+    for y_pos in range(viewport['top'], viewport['top'] + viewport['rows']):
+        screen.move(y_pos, viewport['left'])
+        screen.clrtoeol()
+        for x_pos, value, attr in viewport['store'].get(y_pos + scroll, ()):
+            screen.addstr(y_pos, x_pos, value, attr)
+
+
+def follow_viewport(screen, screen_layout, offsets):
+    """ scroll viewport to the rows of the running offsets if follow is enabled
+
+        the viewport only scrolls when a running row is out of view and then starts at the first running row
+        so as many running rows as fit are visible
+    """
+    viewport = screen_layout.get('_screen', {}).get('_viewport')
+    if not viewport or not viewport['follow'] or not offsets:
+        return
+    first = min(offsets)
+    last = max(offsets)
+    if viewport['scroll'] <= first and last < viewport['scroll'] + viewport['rows']:
+        return
+    scroll_viewport(screen, viewport, first)
+
+
+def scroll_screen(screen, screen_layout):
+    """ scroll viewport with the keys pressed since the last call and return True if it scrolled
+
+        expects the screen to be in nodelay mode so it does not wait for a key; scrolling with a key stops the
+        viewport from following the running rows
+    """
+    viewport = screen_layout.get('_screen', {}).get('_viewport')
+    if not viewport:
+        return False
+    scrolled = False
+    while True:
+        char = screen.getch()
+        if char == -1:
+            return scrolled
+        delta = get_scroll_delta(char, viewport['rows'])
+        if delta:
+            viewport['follow'] = False
+            scroll_viewport(screen, viewport, viewport['scroll'] + delta)
+            scrolled = True
+
+
+def get_scroll_delta(char, rows):
+    """ return number of rows to scroll viewport for key
+    """
+    if char in (curses.KEY_DOWN, ord('j')):
+        return 1
+    if char in (curses.KEY_UP, ord('k')):
+        return -1
+    if char in (curses.KEY_NPAGE, ord(' ')):
+        return rows
+    if char in (curses.KEY_PPAGE, ord('b')):
+        return -rows
+    return 0
+
+
+def get_category_positions(category, data, offsets, screen_layout):
+    """ return tuple of position and positions for category
+
+        table categories get a (y, x) position for every offset, list categories get the position of their
+        first entry and other categories get their fixed position; the counter category is not precomputed
+        since its position moves as the counter wraps
+    """
+    if category == '_counter_' or 'position' not in data:
+        return None, ()
+    if data.get('table'):
+        positions = tuple(
+            (get_category_y_pos(category, offset, screen_layout), get_category_x_pos(category, offset, screen_layout))
+            for offset in range(offsets))
+        return None, positions
+    return (data['position'][0], get_category_x_pos(category, 0, screen_layout)), ()
+
+
+def compile_category(category, data, offsets=0, screen_layout=None):
+    """ return category plan with pre-compiled patterns, resolved defaults and precomputed positions for category data
+    """
+    position, positions = get_category_positions(category, data, offsets, screen_layout or {category: data})
+    regex = re.compile(data['regex']) if data.get('regex') else None
+    effects = tuple(
+        (re.compile(effect['regex']), effect.get('color', data.get('color', 0))) for effect in data.get('effects', []))
+    return CategoryPlan(
+        category=category,
+        regex=regex,
+        has_groups=bool(regex and regex.groups),
+        has_value_group=bool(regex and 'value' in regex.groupindex),
+        length=data.get('length', VALUE_LENGTH),
+        zfill=data.get('zfill', 3),
+        right_justify=bool(data.get('right_justify')),
+        replace_text=data.get('replace_text'),
+        list=bool(data.get('list')),
+        keep_count=bool(data.get('keep_count')),
+        table=bool(data.get('table')),
+        clear=bool(data.get('clear')),
+        color=data.get('color', 0),
+        effects=effects,
+        effects_use_matched_value=bool(data.get('effects_use_matched_value', False)),
+        position=position,
+        positions=positions)
+
+
+def has_top_level_alternation(pattern):
+    """ return True if pattern contains an alternation that is not nested within a group or character class
+    """
+    depth = 0
+    index = 0
+    in_class = False
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\':
+            index += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        index += 1
+    return False
+
+
+def get_literal_prefix(pattern):
+    """ return literal prefix every match of pattern must start with or an empty string if there is none
+    """
+    if has_top_level_alternation(pattern):
+        return ''
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+    elif pattern.startswith('\\A'):
+        pattern = pattern[2:]
+    prefix = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        size = 1
+        if char == '\\':
+            if index + 1 >= len(pattern) or pattern[index + 1].isalnum():
+                # escape sequences such as \d or \s denote character classes not literals
+                break
+            char = pattern[index + 1]
+            size = 2
+        elif char in REGEX_SPECIAL_CHARACTERS:
+            break
+        quantifier = pattern[index + size:index + size + 1]
+        if quantifier and quantifier in REGEX_OPTIONAL_QUANTIFIERS:
+            # the literal is optional
+            break
+        prefix.append(char)
+        if quantifier == '+':
+            break
+        index += size
+    return ''.join(prefix)
+
+
+def get_prefix_index(matchers):
+    """ return tuple of tokens, buckets and fallback used to route messages to the categories that can match them
+
+        tokens map the first space delimited token of a message to the matchers whose literal prefix contains
+        that complete token, buckets map the first character of a message to the matchers whose literal prefix
+        starts with it and fallback holds the matchers without a literal prefix; every entry is merged with
+        the entries a message routed to it can also match so that lookup is a single dictionary access,
+        layout order is preserved
+    """
+    prefixes = [get_literal_prefix(category_plan.regex.pattern) for category_plan in matchers]
+    fallback = tuple(category_plan for category_plan, prefix in zip(matchers, prefixes) if not prefix)
+    buckets = {}
+    for char in {prefix[0] for prefix in prefixes if prefix}:
+        buckets[char] = tuple(
+            category_plan for category_plan, prefix in zip(matchers, prefixes)
+            if not prefix or (prefix[0] == char and ' ' not in prefix))
+    tokens = {}
+    for token in {prefix.partition(' ')[0] for prefix in prefixes if ' ' in prefix}:
+        tokens[token] = tuple(
+            category_plan for category_plan, prefix in zip(matchers, prefixes)
+            if not prefix
+            or (prefix[0] == token[:1] and ' ' not in prefix)
+            or (' ' in prefix and prefix.partition(' ')[0] == token))
+    return tokens, buckets, fallback
+
+
+def get_category_matchers(plan, message):
+    """ return matchers from screen plan that can possibly match message in layout order
+    """
+    matchers = plan.tokens.get(message.partition(' ')[0])
+    if matchers is None:
+        matchers = plan.buckets.get(message[:1], plan.fallback)
+    return matchers
+
+
+def compile_screen_layout(screen_layout, offsets=0):
+    """ return immutable screen plan compiled from screen layout
+
+        the plan holds a category plan for every category, the ordered tuple of categories
+        that define a regex and the literal prefix index used to route a message to the categories that can match it;
+        compiling once avoids per message dictionary and regex cache lookups; positions of table categories
+        are precomputed for the given number of offsets
+    """
+    logger.debug('compiling screen layout')
+    categories = {}
+    for category, data in screen_layout.items():
+        if category == '_screen' or not isinstance(data, dict):
+            continue
+        categories[category] = compile_category(category, data, offsets=offsets, screen_layout=screen_layout)
+    matchers = tuple(category_plan for category_plan in categories.values() if category_plan.regex)
+    tokens, buckets, fallback = get_prefix_index(matchers)
+    return ScreenPlan(
+        categories=MappingProxyType(categories),
+        matchers=matchers,
+        tokens=MappingProxyType(tokens),
+        buckets=MappingProxyType(buckets),
+        fallback=fallback)
+
+
+def get_screen_plan(screen_layout):
+    """ return screen plan compiled for screen layout
+
+        the plan is compiled by initialize_screen_offsets; if screen offsets were not initialized yet the
+        layout is compiled once and cached so callers do not recompile it for every message
+    """
+    screen_config = screen_layout.setdefault('_screen', {})
+    plan = screen_config.get('_plan')
+    if plan is None:
+        plan = compile_screen_layout(screen_layout)
+        screen_config['_plan'] = plan
+    return plan
+
+
 def finalize_screen(screen, screen_layout):
     """ finalize screen
     """
     logger.debug('finalizing screen')
 
+    flush_screen(screen, screen_layout)
+    close_lists(screen_layout)
     update_screen_status(screen, 'finalize', screen_layout['_screen'])
+    viewport = screen_layout['_screen'].get('_viewport')
+    if viewport:
+        # keys are read without waiting while the run is in progress
+        screen.nodelay(False)
     while True:
         char = screen.getch()
         if char == ord('q'):
-            curses.curs_set(2)
+            if uses_curses(screen):
+                curses.curs_set(2)
             return
+        if viewport:
+            scroll_viewport(screen, viewport, viewport['scroll'] + get_scroll_delta(char, viewport['rows']))
 
 
 def get_category_values(message, offset, screen_layout):
     """ return list of tuples consisting of categories and their values from screen layout that match message
     """
     category_values = []
-    for category, data in screen_layout.items():
-        regex = data.get('regex')
-        if regex:
-            match = re.match(regex, message)
-            if match:
-                value = None
-                if match.groups():
-                    # named subgroup called value takes precedence
-                    if 'value' in match.groupdict() and match.group('value'):
-                        value = match.group('value')
-                    else:
-                        for group in match.groups():
-                            # value is the first parenthesized subgroup that is not null
-                            if group is not None:
-                                value = group
-                                break
-                    length = len(value)
-                    max_length = data.get('length', VALUE_LENGTH)
-                    if length > max_length:
-                        value = f'{value[0:max_length - 3]}...'
-                    if data.get('right_justify'):
-                        spaces = ' ' * (max_length - length)
-                        value = f'{spaces}{value}'
-
-                original_value = value
-                if screen_layout[category].get('keep_count'):
-                    value = get_category_count(category, offset, screen_layout)
-                if screen_layout[category].get('replace_text'):
-                    value = screen_layout[category]['replace_text']
-                if screen_layout[category].get('list'):
-                    value = original_value
-                category_values.append((category, value))
+    for category_plan in get_category_matchers(get_screen_plan(screen_layout), message):
+        match = category_plan.regex.match(message)
+        if match:
+            category = category_plan.category
+            value = None
+            if category_plan.has_groups:
+                # named subgroup called value takes precedence
+                if category_plan.has_value_group and match.group('value'):
+                    value = match.group('value')
+                else:
+                    for group in match.groups():
+                        # value is the first parenthesized subgroup that is not null
+                        if group is not None:
+                            value = group
+                            break
+                length = len(value)
+                max_length = category_plan.length
+                if length > max_length:
+                    value = f'{value[0:max_length - 3]}...'
+                if category_plan.right_justify:
+                    spaces = ' ' * (max_length - length)
+                    value = f'{spaces}{value}'
+
+            original_value = value
+            if category_plan.keep_count:
+                value = get_category_count(category, offset, screen_layout, category_plan=category_plan)
+            if category_plan.replace_text:
+                value = category_plan.replace_text
+            if category_plan.list:
+                value = original_value
+            category_values.append((category, value))
     return category_values
 
 
@@ -283,6 +918,10 @@ def process_clear(category, y_pos, x_pos, screen_layout, screen):
                 value = ' ' * padding
                 screen.addstr(y_pos, x_pos, value)
                 return
+        viewport = get_viewport(screen_layout, category)
+        if viewport:
+            clear_viewport(screen, viewport, y_pos, x_pos)
+            return
         screen.move(y_pos, x_pos)
         screen.clrtoeol()
 
@@ -293,7 +932,10 @@ def process_counter(offset, category, value, screen_layout, screen):
     if '_counter_' not in screen_layout:
         return
 
-    if category in screen_layout['_counter_']['categories']:
+    bars = screen_layout.get('_screen', {}).get('_bars')
+    if bars is not None and category in screen_layout['_counter_']['categories']:
+        count_counter(offset, category, screen_layout, bars)
+    elif category in screen_layout['_counter_']['categories']:
         position = screen_layout['_counter_']['position']
         x_pos = position[1] + screen_layout['_counter_'][offset]['_count']
         y_pos = position[0] + offset
@@ -307,7 +949,7 @@ def process_counter(offset, category, value, screen_layout, screen):
                 color = screen_layout['_counter_']['color']
                 screen_layout['_counter_'][offset]['_modulus_count'] += 1
                 x_pos = x_pos + 1 if 'regex' in screen_layout['_counter_'] else x_pos
-                screen.addstr(y_pos, x_pos, counter_value, curses.color_pair(color))
+                write_screen(screen, screen_layout, '_counter_', y_pos, x_pos, counter_value, color)
         else:
             # increments the counter
             if screen_layout['_counter_'].get('width'):
@@ -317,7 +959,7 @@ def process_counter(offset, category, value, screen_layout, screen):
                 if count % width == 0:
                     screen_layout['_counter_']['position'] = (position[0] + 1, position[1])
                     screen_layout['_counter_'][offset]['_count'] = 0
-            screen.addstr(y_pos, x_pos, counter_value, curses.color_pair(color))
+            write_screen(screen, screen_layout, '_counter_', y_pos, x_pos, counter_value, color)
     elif category == '_counter_':
         # regex infers progress bar
         # this sets up the progress bar boundary
@@ -326,31 +968,78 @@ def process_counter(offset, category, value, screen_layout, screen):
         span = int(value) / screen_layout['_counter_']['modulus']
         span_text = ' ' * int(span)
         progress_value = f'[{span_text}]'
-        screen.addstr(position[0] + offset, position[1], progress_value, curses.color_pair(color))
+        write_screen(screen, screen_layout, '_counter_', position[0] + offset, position[1], progress_value, color)
+
+
+def count_counter(offset, category, screen_layout, bars):
+    """ update counter counts of offset and mark it to be drawn with the next frame
+    """
+    counter = screen_layout['_counter_']
+    counts = counter[offset]
+    counts['_count'] += 1
+    if 'modulus' in counter:
+        if counts['_count'] % counter['modulus'] == 0:
+            # the progress bar grows by one character
+            counts['_modulus_count'] += 1
+            bars['dirty'].add(offset)
+    else:
+        # every count is a character in the color of the category that was counted
+        bars['colors'].setdefault(offset, []).append(screen_layout[category]['color'])
+        bars['dirty'].add(offset)
 
 
-def get_category_color(category, message, screen_layout):
+def draw_counters(screen, screen_layout):
+    """ draw counters whose rendered width changed since the last frame
+
+        only the characters added since the counter was last drawn are written
+    """
+    bars = screen_layout.get('_screen', {}).get('_bars')
+    if not bars or not bars['dirty']:
+        return
+    counter = screen_layout['_counter_']
+    y_pos, x_pos = counter['position']
+    counter_text = counter['counter_text']
+    for offset in bars['dirty']:
+        if 'modulus' in counter:
+            drawn = bars['drawn'].get(offset, 0)
+            width = counter[offset]['_modulus_count']
+            if width > drawn:
+                start = x_pos + drawn + (1 if 'regex' in counter else 0)
+                write_screen(
+                    screen, screen_layout, '_counter_', y_pos + offset, start, counter_text * (width - drawn), counter['color'])
+                bars['drawn'][offset] = width
+        else:
+            colors = bars['colors'].pop(offset, [])
+            start = x_pos + counter[offset]['_count'] - len(colors)
+            for color, group in itertools.groupby(colors):
+                length = len(list(group))
+                write_screen(screen, screen_layout, '_counter_', y_pos + offset, start, counter_text * length, color)
+                start += length
+    bars['dirty'].clear()
+
+
+def get_category_color(category, message, screen_layout, category_plan=None):
     """ return color for category in screen layout
     """
-    color = screen_layout[category].get('color', 0)
-    for effect in screen_layout[category].get('effects', []):
-        match = re.match(effect['regex'], message)
-        if match:
-            color = effect['color']
-            break
-    return color
+    if category_plan is None:
+        category_plan = get_screen_plan(screen_layout).categories[category]
+    for regex, color in category_plan.effects:
+        if regex.match(message):
+            return color
+    return category_plan.color
 
 
-def get_category_count(category, offset, screen_layout):
+def get_category_count(category, offset, screen_layout, category_plan=None):
     """ return count for category in screen layout
     """
-    zfill = screen_layout[category].get('zfill', 3)
-    if screen_layout[category].get('table'):
-        screen_layout[category][offset]['_count'] += 1
-        return str(screen_layout[category][offset]['_count']).zfill(zfill)
-
-    screen_layout[category]['_count'] += 1
-    return str(screen_layout[category]['_count']).zfill(zfill)
+    if category_plan is None:
+        category_plan = get_screen_plan(screen_layout).categories[category]
+    if category_plan.table:
+        counts = screen_layout[category][offset]
+    else:
+        counts = screen_layout[category]
+    counts['_count'] += 1
+    return str(counts['_count']).zfill(category_plan.zfill)
 
 
 def get_category_x_pos(category, offset, screen_layout):
@@ -360,7 +1049,7 @@ def get_category_x_pos(category, offset, screen_layout):
     if screen_layout[category].get('text', ''):
         x_pos = x_pos + get_position(screen_layout[category]['text']) + 1
     if screen_layout[category].get('table'):
-        if screen_layout.get('table'):
+        if screen_layout.get('table') and not screen_layout['table'].get('virtual'):
             orientation = screen_layout['table'].get('orientation', 'wrap_around')
             if orientation == 'wrap_around':
                 rows = screen_layout['table']['rows']
@@ -386,7 +1075,8 @@ def get_category_y_pos(category, offset, screen_layout):
     # list must include keep_count
     if screen_layout[category].get('table'):
         y_pos += offset
-        if screen_layout.get('table'):
+        # offsets of a virtual table are rows of the table below its position - the viewport maps them to the screen
+        if screen_layout.get('table') and not screen_layout['table'].get('virtual'):
             orientation = screen_layout['table'].get('orientation', 'wrap_around')
             if orientation == 'wrap_around':
                 rows = screen_layout['table']['rows']
@@ -401,6 +1091,88 @@ def get_category_y_pos(category, offset, screen_layout):
     return y_pos
 
 
+def write_screen(screen, screen_layout, category, y_pos, x_pos, value, color, clear=False):
+    """ write category value to screen at position
+
+        if coalescing is enabled the write is staged in the pending buffer of its row where it replaces the
+        last write staged on that row since the last frame if that write was to the same category and position;
+        only the latest value and color reach the screen when the buffer is flushed
+    """
+    pending = screen_layout.get('_screen', {}).get('_pending')
+    if pending is None:
+        if clear:
+            process_clear(category, y_pos, x_pos, screen_layout, screen)
+        write_value(screen, screen_layout, category, y_pos, x_pos, value, color)
+        return
+    # writes to a row are kept in order so a write is only merged with the previous write if nothing was
+    # written to the row in between that the merge would reorder
+    writes = pending.setdefault(y_pos, [])
+    tail = None
+    if writes and writes[-1][:3] == (category, y_pos, x_pos):
+        previous = writes.pop()
+        if not clear and value is not None and previous[3] is not None and len(value) < len(previous[3]):
+            # a shorter value only partially overwrites the previous value so the remainder stays on screen
+            # in the color it was written in
+            tail = (category, y_pos, x_pos + len(value), previous[3][len(value):], previous[4], False)
+        # the clear of the previous value happened before this write
+        clear = clear or previous[5]
+    writes.append((category, y_pos, x_pos, value, color, clear))
+    if tail:
+        writes.append(tail)
+
+
+def write_value(screen, screen_layout, category, y_pos, x_pos, value, color):
+    """ write value to screen or to the viewport if category is a virtual table category
+    """
+    viewport = get_viewport(screen_layout, category)
+    if viewport:
+        write_viewport(screen, viewport, y_pos, x_pos, value, get_color_pair(screen, color))
+    else:
+        screen.addstr(y_pos, x_pos, value, get_color_pair(screen, color))
+
+
+def write_pending(screen, screen_layout, write):
+    """ write staged category value to screen
+    """
+    category, y_pos, x_pos, value, color, clear = write
+    try:
+        if clear:
+            process_clear(category, y_pos, x_pos, screen_layout, screen)
+        write_value(screen, screen_layout, category, y_pos, x_pos, value, color)
+
+    except Exception as exception:  # curses.error as exception:
+        logger.error(f'error occurred when updating screen: {exception}')
+
+
+def flush_screen(screen, screen_layout):
+    """ draw counters and lists and write all writes staged in the pending buffer to screen
+    """
+    draw_counters(screen, screen_layout)
+    draw_lists(screen, screen_layout)
+    pending = screen_layout.get('_screen', {}).get('_pending')
+    if not pending:
+        return
+    for writes in pending.values():
+        for write in writes:
+            write_pending(screen, screen_layout, write)
+    pending.clear()
+
+
+def get_category_position(category_plan, offset, screen_layout):
+    """ return tuple of y and x pos for category plan at offset using the precomputed positions when available
+    """
+    if offset < len(category_plan.positions):
+        return category_plan.positions[offset]
+    position = category_plan.position
+    if position:
+        if category_plan.list:
+            # the list count is the cursor for the next entry of the list
+            return position[0] + screen_layout[category_plan.category]['_count'], position[1]
+        return position
+    category = category_plan.category
+    return get_category_y_pos(category, offset, screen_layout), get_category_x_pos(category, offset, screen_layout)
+
+
 def update_screen(message, screen, screen_layout):
     """ update screen with message as dictated by screen layout
 
@@ -409,20 +1181,27 @@ def update_screen(message, screen, screen_layout):
         the category
     """
     offset, sanitized_message = sanitize_message(message)
+    slots = screen_layout.get('_screen', {}).get('_slots')
+    if slots is not None and message.startswith('#'):
+        # the table row of the item is the slot assigned to it
+        offset = get_slot(screen, screen_layout, offset)
     category_values = get_category_values(sanitized_message, offset, screen_layout)
     try:
+        categories = get_screen_plan(screen_layout).categories
         for (category, value) in category_values:
-            y_pos = get_category_y_pos(category, offset, screen_layout)
-            x_pos = get_category_x_pos(category, offset, screen_layout)
-            process_clear(category, y_pos, x_pos, screen_layout, screen)
-            effects_use_matched_value = screen_layout[category].get('effects_use_matched_value', False)
-            if effects_use_matched_value:
-                color = get_category_color(category, value, screen_layout)
+            category_plan = categories[category]
+            y_pos, x_pos = get_category_position(category_plan, offset, screen_layout)
+            if category_plan.effects_use_matched_value:
+                color = get_category_color(category, value, screen_layout, category_plan=category_plan)
+            else:
+                color = get_category_color(category, sanitized_message, screen_layout, category_plan=category_plan)
+            if category_plan.list and '_entries' in screen_layout[category]:
+                write_list(screen_layout, category, value, color)
             else:
-                color = get_category_color(category, sanitized_message, screen_layout)
-            screen.addstr(y_pos, x_pos, value, curses.color_pair(color))
+                write_screen(screen, screen_layout, category, y_pos, x_pos, value, color, clear=category_plan.clear)
             process_counter(offset, category, value, screen_layout, screen)
-            screen.refresh()
+            if slots is not None and category_plan.table:
+                slots['values'][offset][category] = value
 
     except Exception as exception:  # curses.error as exception:
         logger.error(f'error occurred when updating screen: {exception}')
@@ -448,8 +1227,14 @@ def echo_to_screen(screen, data, screen_layout, offset=None):
 
 def refresh_screen(screen):
     """ refresh screen
+        stage the window contents and update the physical screen in a single write
     """
-    screen.refresh()
+    if uses_curses(screen):
+        screen.noutrefresh()
+        curses.doupdate()
+    else:
+        # renderers keeping their own screen model write the frame on refresh
+        screen.refresh()
 
 
 def get_table_position(screen_layout):
@@ -506,6 +1291,9 @@ def set_screen_defaults(screen_layout):
     if 'blink' not in screen_layout['_screen']:
         screen_layout['_screen']['blink'] = True
 
+    if 'max_fps' not in screen_layout['_screen']:
+        screen_layout['_screen']['max_fps'] = MAX_FPS
+
 
 def set_screen_defaults_processes(processes, processes_to_start, screen_layout):
     """ set screen defaults
@@ -525,7 +1313,8 @@ def validate_screen_layout_processes(processes, screen_layout):
     logger.debug('validating screen layout processes')
 
     table = screen_layout.get('table')
-    if not table:
+    if not table or table.get('virtual'):
+        # a virtual table holds any number of processes
         return
 
     orientation = table.get('orientation', 'wrap_around')
@@ -563,14 +1352,3 @@ def validate_screen_size(screen, screen_layout):
 
     if max_x_pos > screen_width:
         raise Exception('the screen is not large enough for the configured layout - make the screen wider')
-
-
-def blink(queue, terminate=False):
-    """ method to control screen blinking
-    """
-    blink_state = itertools.cycle(['blink-on', 'blink-off'])
-    while True:
-        queue.put(next(blink_state))
-        sleep(.9)
-        if terminate:
-            break
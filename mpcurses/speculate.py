@@ -0,0 +1,42 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = .5
+PERCENTILE = 95
+FACTOR = 2
+MIN_COMPLETED = 5
+
+
+def get_percentile(values, percentile):
+    """ return nearest-rank percentile of values
+    """
+    values = sorted(values)
+    rank = max(math.ceil(percentile / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def get_straggler_threshold(durations, percentile=PERCENTILE, factor=FACTOR, min_completed=MIN_COMPLETED):
+    """ return number of seconds after which a running item is a straggler or None if too few items completed
+
+        an item is a straggler once it has run factor times longer than the percentile of the completed durations
+    """
+    if len(durations) < max(min_completed, 1):
+        return None
+    return factor * get_percentile(durations, percentile)
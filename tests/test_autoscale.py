@@ -0,0 +1,114 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from mock import patch
+from mock import mock_open
+
+from mpcurses.autoscale import get_load
+from mpcurses.autoscale import get_pressure
+from mpcurses.autoscale import Autoscaler
+
+import logging
+logger = logging.getLogger(__name__)
+
+PRESSURE = 'some avg10=12.50 avg60=3.00 avg300=1.00 total=100\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n'
+
+
+class TestAutoscale(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    @patch('mpcurses.autoscale.os.cpu_count', return_value=4)
+    @patch('mpcurses.autoscale.os.getloadavg', return_value=(6.0, 1.0, 1.0))
+    def test__get_load_Should_ReturnLoadPerCpu_When_Called(self, *patches):
+        self.assertEqual(get_load(), 1.5)
+
+    @patch('mpcurses.autoscale.os.getloadavg', side_effect=OSError())
+    def test__get_load_Should_ReturnNone_When_NotAvailable(self, *patches):
+        self.assertIsNone(get_load())
+
+    @patch('builtins.open', new_callable=mock_open, read_data=PRESSURE)
+    def test__get_pressure_Should_ReturnSomeAvg10_When_Called(self, open_patch, *patches):
+        self.assertEqual(get_pressure(), 12.5)
+        open_patch.assert_any_call('/proc/pressure/cpu')
+        open_patch.assert_any_call('/proc/pressure/io')
+
+    @patch('builtins.open', side_effect=FileNotFoundError())
+    def test__get_pressure_Should_ReturnNone_When_NotAvailable(self, *patches):
+        self.assertIsNone(get_pressure())
+
+    @patch('mpcurses.autoscale.os.cpu_count', return_value=4)
+    def test__init_Should_SetDefaults_When_Called(self, *patches):
+        autoscaler = Autoscaler()
+        self.assertEqual(autoscaler.minimum, 1)
+        self.assertEqual(autoscaler.maximum, 8)
+
+    def test__init_Should_RaiseValueError_When_InvalidBounds(self, *patches):
+        with self.assertRaises(ValueError):
+            Autoscaler(minimum=0)
+        with self.assertRaises(ValueError):
+            Autoscaler(minimum=4, maximum=2)
+
+    def test__start_Should_ClampTarget_When_Called(self, *patches):
+        autoscaler = Autoscaler(minimum=2, maximum=4)
+        self.assertEqual(autoscaler.start(10), 4)
+        self.assertEqual(autoscaler.start(1), 2)
+
+    def test__update_Should_OnlySample_When_FirstUpdate(self, *patches):
+        autoscaler = Autoscaler(minimum=1, maximum=4)
+        autoscaler.start(2)
+        self.assertEqual(autoscaler.update(10, 100.0), 2)
+        self.assertEqual(autoscaler.completed, 10)
+        self.assertEqual(autoscaler.sampled_at, 100.0)
+
+    def test__update_Should_ClimbWhileThroughputHolds_When_Called(self, *patches):
+        autoscaler = Autoscaler(minimum=1, maximum=4)
+        autoscaler.start(1)
+        autoscaler.update(0, 0.0)
+        self.assertEqual(autoscaler.update(10, 1.0), 2)
+        self.assertEqual(autoscaler.update(30, 2.0), 3)
+        self.assertEqual(autoscaler.update(60, 3.0), 4)
+        self.assertEqual(autoscaler.update(90, 4.0), 4)
+
+    def test__update_Should_ReverseDirection_When_ThroughputDrops(self, *patches):
+        autoscaler = Autoscaler(minimum=1, maximum=8)
+        autoscaler.start(4)
+        autoscaler.update(0, 0.0)
+        self.assertEqual(autoscaler.update(20, 1.0), 5)
+        self.assertEqual(autoscaler.update(30, 2.0), 4)
+        self.assertEqual(autoscaler.direction, -1)
+
+    def test__update_Should_StepDown_When_Overloaded(self, *patches):
+        autoscaler = Autoscaler(minimum=1, maximum=8, max_load=1, max_pressure=40)
+        autoscaler.start(4)
+        autoscaler.update(0, 0.0)
+        self.assertEqual(autoscaler.update(20, 1.0, load=1.5), 3)
+        self.assertEqual(autoscaler.update(50, 2.0, pressure=60.0), 2)
+        self.assertEqual(autoscaler.update(80, 3.0, load=.5, pressure=10.0), 1)
+
+    def test__is_overloaded_Should_ReturnFalse_When_NoMeasurements(self, *patches):
+        autoscaler = Autoscaler(max_load=1, max_pressure=40)
+        self.assertFalse(autoscaler.is_overloaded(None, None))
+        autoscaler = Autoscaler(max_load=None, max_pressure=None)
+        self.assertFalse(autoscaler.is_overloaded(10, 100))
@@ -0,0 +1,85 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import struct
+import unittest
+from mock import Mock
+
+from mpcurses.channel import Channel
+from mpcurses.channel import open_channel
+from mpcurses.channel import receive
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestChannel(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    def test__Channel_Should_SendItem_When_Put(self, *patches):
+        connection_mock = Mock()
+        channel = Channel(connection_mock)
+        channel.put('#0-message')
+        connection_mock.send.assert_called_once_with('#0-message')
+
+    def test__Channel_Should_CreateLock_When_Unpickled(self, *patches):
+        receiver, channel = open_channel()
+        state = channel.__getstate__()
+        self.assertEqual(state, {'connection': channel.connection})
+        restored = Channel.__new__(Channel)
+        restored.__setstate__(state)
+        self.assertIs(restored.connection, channel.connection)
+        self.assertIsNot(restored.lock, channel.lock)
+        channel.close()
+        receiver.close()
+
+    def test__receive_Should_ReturnItemsInOrder_When_Sent(self, *patches):
+        receiver, channel = open_channel()
+        channel.put('#0-message')
+        channel.put({'offset': 0, 'result': 'a'})
+        channel.put('#0-DONE')
+        self.assertEqual(receive(receiver, 2), (['#0-message', {'offset': 0, 'result': 'a'}], False))
+        self.assertEqual(receive(receiver, 2), (['#0-DONE'], False))
+        self.assertEqual(receive(receiver, 2), ([], False))
+        channel.close()
+        receiver.close()
+
+    def test__receive_Should_ReturnClosed_When_SenderClosed(self, *patches):
+        receiver, channel = open_channel()
+        channel.put('#0-DONE')
+        channel.close()
+        self.assertEqual(receive(receiver, 10), (['#0-DONE'], True))
+        receiver.close()
+
+    def test__receive_Should_DiscardTruncatedMessage_When_SenderClosedWhileSending(self, *patches):
+        receiver, channel = open_channel()
+        channel.put('#0-message')
+        data = pickle.dumps('#0-truncated')
+        # header announces the full message but only part of it is written before the sender is closed
+        os.write(channel.connection.fileno(), struct.pack('!i', len(data)) + data[:3])
+        channel.close()
+        self.assertEqual(receive(receiver, 10), (['#0-message'], True))
+        receiver.close()
@@ -0,0 +1,91 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from mock import patch
+from mock import mock_open
+
+from mpcurses.history import load_history
+from mpcurses.history import save_history
+from mpcurses.history import get_item_key
+from mpcurses.history import update_history
+from mpcurses.history import order_by_cost
+from mpcurses.history import project_finish
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    @patch('builtins.open', new_callable=mock_open, read_data='{"a": 1.5}')
+    def test__load_history_Should_ReturnHistory_When_Called(self, *patches):
+        self.assertEqual(load_history('history.json'), {'a': 1.5})
+
+    @patch('builtins.open', side_effect=FileNotFoundError())
+    def test__load_history_Should_ReturnEmpty_When_FileNotFound(self, *patches):
+        self.assertEqual(load_history('history.json'), {})
+
+    @patch('builtins.open', new_callable=mock_open, read_data='{"a": ')
+    def test__load_history_Should_ReturnEmpty_When_InvalidJson(self, *patches):
+        self.assertEqual(load_history('history.json'), {})
+
+    @patch('builtins.open', new_callable=mock_open, read_data='[1, 2]')
+    def test__load_history_Should_ReturnEmpty_When_NotDict(self, *patches):
+        self.assertEqual(load_history('history.json'), {})
+
+    @patch('mpcurses.history.os.replace')
+    @patch('builtins.open', new_callable=mock_open)
+    def test__save_history_Should_ReplaceFile_When_Called(self, open_patch, replace_patch, *patches):
+        save_history('history.json', {'a': 1.5})
+        open_patch.assert_called_once_with('history.json.tmp', 'w')
+        replace_patch.assert_called_once_with('history.json.tmp', 'history.json')
+
+    def test__get_item_key_Should_ReturnExpected_When_Called(self, *patches):
+        data = {'name': 'server1', 'port': 22}
+        self.assertEqual(get_item_key('name', data), 'server1')
+        self.assertEqual(get_item_key(lambda data: f"{data['name']}:{data['port']}", data), 'server1:22')
+        self.assertEqual(get_item_key(None, data), '{"name": "server1", "port": 22}')
+
+    def test__update_history_Should_SmoothDuration_When_KeyRecorded(self, *patches):
+        history = {}
+        update_history(history, 'a', 4.0)
+        self.assertEqual(history, {'a': 4.0})
+        update_history(history, 'a', 2.0)
+        self.assertEqual(history, {'a': 3.0})
+
+    def test__order_by_cost_Should_OrderLongestFirst_When_Costs(self, *patches):
+        items = [(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd')]
+        result = order_by_cost(items, {0: 1.0, 1: 5.0, 3: 2.0})
+        self.assertEqual(result, [(1, 'b'), (2, 'c'), (3, 'd'), (0, 'a')])
+
+    def test__order_by_cost_Should_KeepOrder_When_NoCosts(self, *patches):
+        items = [(0, 'a'), (1, 'b')]
+        self.assertEqual(order_by_cost(iter(items), {}), items)
+
+    def test__project_finish_Should_ScheduleQueuedOnFirstAvailable_When_Called(self, *patches):
+        self.assertEqual(project_finish([3, 1], [2, 2, 2], 2), 5)
+        self.assertEqual(project_finish([], [4, 1, 1], 3), 4)
+        self.assertEqual(project_finish([], [], 0), 0)
@@ -18,14 +18,20 @@ from mock import patch
 from mock import call
 from mock import Mock
 from mock import MagicMock
+from mock import ANY
 
 from queue import Empty
+from queue import Queue
 
 from mpcurses.mpcurses import MPcurses
+from mpcurses.renderer import NullRenderer
+from mpcurses.renderer import AnsiRenderer
 from mpmq.mpmq import NoActiveProcesses
 from mpmq.handler import queue_handler
 
 import sys
+from datetime import datetime
+from datetime import timedelta
 import logging
 logger = logging.getLogger(__name__)
 
@@ -68,6 +74,11 @@ class TestMPcurses(unittest.TestCase):
         with self.assertRaises(Exception):
             MPcurses(function_mock, get_process_data=get_process_data_mock)
 
+    def test__init__Should_RaiseException_When_RendererNotSupported(self, *patches):
+        function_mock = Mock(__name__='_queue_handler')
+        with self.assertRaises(ValueError):
+            MPcurses(function_mock, screen_layout={}, renderer='unknown')
+
     def test__init_Should_SetDefaults_When_GetProcessData(self, *patches):
         function_mock = Mock(__name__='mockfunc')
         get_process_data_mock = Mock()
@@ -75,48 +86,52 @@ class TestMPcurses(unittest.TestCase):
         self.assertIsNone(client.process_data)
         self.assertEqual(client.get_process_data, get_process_data_mock)
 
-    @patch('mpcurses.mpcurses.blink')
-    @patch('mpcurses.mpcurses.Process')
-    def test__start_blink_process_Should_CallExpected_When_ScreenBlink(self, process_patch, blink_patch, *patches):
-        function_mock = Mock(__name__='_queue_handler')
-        process_mock = Mock()
-        process_patch.return_value = process_mock
-        screen_layout = {
-            '_screen': {
-                'blink': True
-            }
-        }
-        client = MPcurses(function=function_mock, screen_layout=screen_layout)
-        client.start_blink_process()
-        process_patch.assert_called_once_with(
-            target=blink_patch,
-            args=((client.blink_queue,)))
-        process_mock.start.assert_called_once_with()
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.0)
+    def test__start_timers_Should_ScheduleBlink_When_ScreenBlink(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': True}})
+        client.start_timers()
+        self.assertEqual(client.timers, [{'interval': 0.9, 'callback': client.toggle_blink, 'due_at': 10.9}])
 
-    @patch('mpcurses.mpcurses.Process')
-    def test__start_blink_process_Should_CallExpected_When_NoScreenBlink(self, process_patch, *patches):
-        function_mock = Mock(__name__='_queue_handler')
-        client = MPcurses(function=function_mock)
-        client.start_blink_process()
-        process_patch.assert_not_called()
+    def test__init_Should_NotAddTimers_When_NoScreenBlink(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        self.assertEqual(client.timers, [])
 
-    def test__stop_blink_process_Should_CallExpected_When_BlinkScreenBlinkProces(self, *patches):
-        process_mock = Mock()
-        function_mock = Mock(__name__='_queue_handler')
-        client = MPcurses(function=function_mock)
-        client.blink_screen = True
-        client.blink_process = process_mock
-        client.stop_blink_process()
-        process_mock.terminate.assert_called_once_with()
+    @patch('mpcurses.mpcurses.monotonic')
+    def test__run_timers_Should_CallDueTimers_When_Called(self, monotonic_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        due_mock = Mock()
+        not_due_mock = Mock()
+        not_started_mock = Mock()
+        client.timers = [
+            {'interval': 1, 'callback': due_mock, 'due_at': 9.5},
+            {'interval': 1, 'callback': not_due_mock, 'due_at': 10.5},
+            {'interval': 1, 'callback': not_started_mock, 'due_at': None}]
+        monotonic_patch.return_value = 10.0
+        client.run_timers()
+        due_mock.assert_called_once_with()
+        not_due_mock.assert_not_called()
+        not_started_mock.assert_not_called()
+        self.assertEqual(client.timers[0]['due_at'], 11.0)
 
-    def test__stop_blink_process_Should_NotCallTerminate_When_NoBlinkScreenBlinkProces(self, *patches):
-        process_mock = Mock()
-        function_mock = Mock(__name__='_queue_handler')
-        client = MPcurses(function=function_mock)
-        client.blink_screen = None
-        client.blink_process = process_mock
-        client.stop_blink_process()
-        process_mock.terminate.assert_not_called()
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.0)
+    def test__get_timer_timeout_Should_ReturnExpected_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        self.assertIsNone(client.get_timer_timeout())
+        client.timers = [{'due_at': 10.5}, {'due_at': 10.25}, {'due_at': None}]
+        self.assertEqual(client.get_timer_timeout(), 0.25)
+        client.timers = [{'due_at': 9.0}]
+        self.assertEqual(client.get_timer_timeout(), 0)
+
+    @patch('mpcurses.mpcurses.update_screen_status')
+    def test__toggle_blink_Should_AlternateBlinkState_When_Called(self, update_screen_status_patch, *patches):
+        screen_layout = {'_screen': {'blink': True}}
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout=screen_layout)
+        client.toggle_blink()
+        client.toggle_blink()
+        self.assertEqual(update_screen_status_patch.mock_calls, [
+            call(client.screen, 'blink-on', screen_layout['_screen']),
+            call(client.screen, 'blink-off', screen_layout['_screen'])])
+        self.assertTrue(client.render_pending)
 
     @patch('mpcurses.mpcurses.update_screen_status')
     def test__on_state_change_Should_CallExpected_When_Called(self, update_screen_status_patch, *patches):
@@ -177,8 +192,133 @@ class TestMPcurses(unittest.TestCase):
         self.assertTrue(call2 in update_screen_status_patch.mock_calls)
         self.assertEqual(client.processes_to_start, 1)
 
+    @patch('mpcurses.mpcurses.os.cpu_count', return_value=6)
+    @patch('mpcurses.MPcurses.start_streaming')
+    @patch('mpcurses.mpcurses.update_screen_status')
+    def test__execute_get_process_data_Should_StartStreaming_When_GeneratorFunction(self, update_screen_status_patch, start_streaming_patch, *patches):
+
+        def get_my_process_data(arg1=None):
+            """ getting data
+            """
+            yield {'data': arg1}
+
+        client = MPcurses(function=Mock(__name__='mockfunc'), get_process_data=get_my_process_data, screen_layout={'_screen': {}}, shared_data={'arg1': 'value1'})
+        start_streaming_patch.side_effect = lambda process_data: setattr(client, 'streaming', True)
+        client.execute_get_process_data()
+        process_data = start_streaming_patch.call_args[0][0]
+        self.assertEqual(list(process_data), [{'data': 'value1'}])
+        self.assertEqual(client.process_data, [])
+        self.assertEqual(client.shared_data, {'arg1': 'value1'})
+        self.assertEqual(client.processes_to_start, 6)
+
+    @patch('mpcurses.MPcurses.start_streaming')
+    @patch('mpcurses.mpcurses.update_screen_status')
+    def test__execute_get_process_data_Should_StartStreaming_When_ReturnsIterator(self, update_screen_status_patch, start_streaming_patch, *patches):
+        process_data = iter([{'data': 1}])
+        get_process_data_mock = Mock(__name__='get_my_process_data', __doc__='getting data', return_value=(process_data, {'key1': 'value1'}))
+        client = MPcurses(function=Mock(__name__='mockfunc'), get_process_data=get_process_data_mock, screen_layout={'_screen': {}}, processes_to_start=2)
+        start_streaming_patch.side_effect = lambda process_data: setattr(client, 'streaming', True)
+        client.execute_get_process_data()
+        start_streaming_patch.assert_called_once_with(process_data)
+        self.assertEqual(client.process_data, [])
+        self.assertEqual(client.shared_data, {'key1': 'value1'})
+        self.assertEqual(client.processes_to_start, 2)
+
+    def test__stream_process_data_Should_PutItemsAndStreamEnd_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), get_process_data=Mock(), screen_layout={'_screen': {}})
+        client.start_streaming(iter([{'data': 1}, {'data': 2}]))
+        self.assertTrue(client.streaming)
+        self.assertEqual([client.process_data_queue.get(timeout=1) for _ in range(3)], [{'data': 1}, {'data': 2}, None])
+
+    def test__stream_process_data_Should_PutException_When_IteratorRaises(self, *patches):
+
+        def get_my_process_data():
+            yield {'data': 1}
+            raise ValueError('failed')
+
+        client = MPcurses(function=Mock(__name__='mockfunc'), get_process_data=Mock(), screen_layout={'_screen': {}})
+        client.process_data_queue = Queue()
+        client.stream_process_data(get_my_process_data())
+        self.assertEqual(client.process_data_queue.get(False), {'data': 1})
+        self.assertIsInstance(client.process_data_queue.get(False), ValueError)
+        self.assertIsNone(client.process_data_queue.get(False))
+
+    def get_streaming_client(self, items, **kwargs):
+        client = MPcurses(function=Mock(__name__='mockfunc'), get_process_data=Mock(), screen_layout={'_screen': {}}, **kwargs)
+        client.screen = Mock()
+        client.process_data = []
+        client.processes_to_start = 2
+        client.streaming = True
+        client.process_data_queue = Queue()
+        for item in items:
+            client.process_data_queue.put(item)
+        return client
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.MPcurses.start_next_process')
+    @patch('mpcurses.mpcurses.echo_to_screen')
+    @patch('mpcurses.mpcurses.extend_screen_offsets')
+    def test__receive_process_data_Should_QueueAndStartItems_When_ItemsReceived(self, extend_screen_offsets_patch, echo_to_screen_patch, start_next_process_patch, *patches):
+        client = self.get_streaming_client([{'data': 1}, {'data': 2}, {'data': 3}])
+        client.process_data.append({'data': 0})
+        start_next_process_patch.side_effect = lambda: (client.process_queue.get(), setattr(client, 'active_processes', client.active_processes + 1))
+        client.receive_process_data()
+        self.assertEqual(client.process_data, [{'data': 0}, {'data': 1}, {'data': 2}, {'data': 3}])
+        extend_screen_offsets_patch.assert_called_once_with(client.screen, client.screen_layout, 1, 4)
+        self.assertTrue(call(client.screen, {'data': 3}, client.screen_layout, offset=3) in echo_to_screen_patch.mock_calls)
+        self.assertEqual(start_next_process_patch.call_count, 2)
+        self.assertEqual(client.process_queue.get(False), (3, {'data': 3}))
+        self.assertTrue(client.streaming)
+
+    @patch('mpcurses.mpcurses.extend_screen_offsets')
+    def test__receive_process_data_Should_RaiseNoActiveProcesses_When_StreamEndAndNothingActive(self, extend_screen_offsets_patch, *patches):
+        client = self.get_streaming_client([None])
+        with self.assertRaises(NoActiveProcesses):
+            client.receive_process_data()
+        self.assertFalse(client.streaming)
+        extend_screen_offsets_patch.assert_not_called()
+
+    def test__receive_process_data_Should_RaiseException_When_IteratorRaised(self, *patches):
+        client = self.get_streaming_client([ValueError('failed')])
+        with self.assertRaises(ValueError):
+            client.receive_process_data()
+
+    def test__receive_process_data_Should_DoNothing_When_NotStreaming(self, *patches):
+        client = self.get_streaming_client([{'data': 1}])
+        client.streaming = False
+        client.receive_process_data()
+        self.assertEqual(client.process_data, [])
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.mpcurses.MPmq.process_control_message', side_effect=NoActiveProcesses())
+    def test__process_control_message_Should_NotRaiseNoActiveProcesses_When_Streaming(self, *patches):
+        client = self.get_streaming_client([])
+        client.process_control_message(0, 'DONE')
+        client.streaming = False
+        with self.assertRaises(NoActiveProcesses):
+            client.process_control_message(0, 'DONE')
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    def test__process_control_message_Should_StopStreaming_When_Error(self, *patches):
+        client = self.get_streaming_client([])
+        client.process_control_message(0, 'ERROR')
+        self.assertFalse(client.streaming)
+
+    @patch('mpcurses.MPcurses.start_worker')
+    @patch('mpcurses.MPcurses.start_next_process')
+    def test__start_queued_processes_Should_StartWorkersUpToProcessesToStart_When_Pool(self, start_next_process_patch, start_worker_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=2, pool=True)
+        for offset in range(3):
+            client.process_queue.put((offset, {}))
+        start_worker_patch.side_effect = lambda: client.workers.append(Mock(offsets=set()))
+        start_next_process_patch.side_effect = lambda: client.workers[-1].offsets.add(client.process_queue.get()[0])
+        client.start_queued_processes()
+        self.assertEqual(start_worker_patch.call_count, 2)
+        self.assertEqual(start_next_process_patch.call_count, 2)
+        self.assertEqual(client.process_queue.qsize(), 1)
+
     @patch('mpcurses.mpcurses.initialize_screen_offsets')
-    @patch('mpcurses.MPcurses.start_blink_process')
+    @patch('mpcurses.MPcurses.start_timers')
     @patch('mpcurses.mpcurses.initialize_screen')
     @patch('mpcurses.mpcurses.echo_to_screen')
     @patch('mpcurses.mpcurses.update_screen')
@@ -201,7 +341,7 @@ class TestMPcurses(unittest.TestCase):
         self.assertTrue(echo_to_screen_call2 in echo_to_screen_patch.mock_calls)
 
     @patch('mpcurses.mpcurses.initialize_screen_offsets')
-    @patch('mpcurses.MPcurses.start_blink_process')
+    @patch('mpcurses.MPcurses.start_timers')
     @patch('mpcurses.mpcurses.initialize_screen')
     @patch('mpcurses.mpcurses.echo_to_screen')
     @patch('mpcurses.mpcurses.update_screen')
@@ -218,7 +358,40 @@ class TestMPcurses(unittest.TestCase):
         self.assertTrue(echo_to_screen_call1 in echo_to_screen_patch.mock_calls)
 
     @patch('mpcurses.mpcurses.initialize_screen_offsets')
-    @patch('mpcurses.MPcurses.stop_blink_process')
+    @patch('mpcurses.MPcurses.start_timers')
+    @patch('mpcurses.mpcurses.initialize_screen')
+    @patch('mpcurses.mpcurses.echo_to_screen')
+    @patch('mpcurses.mpcurses.update_screen')
+    def test__setup_screen_Should_NotEchoProcessData_When_Slots(self, update_screen_patch, echo_to_screen_patch, *patches):
+        screen_layout = {'_screen': {'_slots': {'process_data': None}}}
+        process_data = [{'range': '0-1'}, {'range': '2-3'}]
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=process_data, screen_layout=screen_layout)
+        client.screen = Mock()
+        client.setup_screen()
+        self.assertEqual(echo_to_screen_patch.mock_calls, [call(client.screen, {}, screen_layout)])
+        self.assertEqual(screen_layout['_screen']['_slots']['process_data'], process_data)
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    @patch('mpcurses.mpcurses.release_slot')
+    def test__process_control_message_Should_ReleaseSlot_When_Slots(self, release_slot_patch, process_control_message_patch, *patches):
+        screen_layout = {'_screen': {'_slots': {}}}
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout=screen_layout)
+        client.screen = Mock()
+        client.process_control_message(3, 'ERROR')
+        client.process_control_message(3, 'DONE')
+        self.assertEqual(release_slot_patch.mock_calls, [call(screen_layout, 3, error=True), call(screen_layout, 3, error=False)])
+        self.assertEqual(process_control_message_patch.mock_calls, [call(3, 'ERROR'), call(3, 'DONE')])
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    @patch('mpcurses.mpcurses.release_slot')
+    def test__process_control_message_Should_NotReleaseSlot_When_NoSlots(self, release_slot_patch, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout={'_screen': {}})
+        client.screen = Mock()
+        client.process_control_message(3, 'DONE')
+        release_slot_patch.assert_not_called()
+        process_control_message_patch.assert_called_once_with(3, 'DONE')
+
+    @patch('mpcurses.mpcurses.initialize_screen_offsets')
     @patch('mpcurses.mpcurses.finalize_screen')
     @patch('mpcurses.mpcurses.update_screen')
     def test__teardown_screen_Should_CallExpected_When_Called(self, update_screen_patch, finalize_screen_patch, *patches):
@@ -232,51 +405,14 @@ class TestMPcurses(unittest.TestCase):
         update_screen_patch.assert_called()
         finalize_screen_patch.assert_called_once_with(client.screen, client.screen_layout)
 
-    @patch('mpcurses.mpcurses.initialize_screen_offsets')
-    def test__get_blink_message_Should_ReturnExpected_When_Empty(self, *patches):
-        function_mock = Mock(__name__='_queue_handler')
-        screen_layout = {
-            '_screen': {
-                'blink': True
-            }
-        }
-        client = MPcurses(function=function_mock, screen_layout=screen_layout)
-        result = client.get_blink_message()
-        self.assertIsNone(result)
-
-    @patch('mpcurses.mpcurses.update_screen_status')
-    @patch('mpcurses.MPcurses.get_blink_message')
-    def test__get_message_Should_ReturnExpected_When_BlinkScreen(self, get_blink_message_patch, update_screen_status_patch, *patches):
-        get_blink_message_patch.return_value = 'blink-on'
-        function_mock = Mock(__name__='_queue_handler')
-        screen_layout = {
-            '_screen': {
-                'blink': True
-            }
-        }
-        client = MPcurses(function=function_mock, screen_layout=screen_layout)
-        message_queue_mock = Mock()
-        message_queue_mock.get.return_value = '#0-DONE'
-        client.message_queue = message_queue_mock
-        client.get_message()
-        update_screen_status_patch.assert_called_once_with(client.screen, 'blink-on', screen_layout['_screen'])
-
-    @patch('mpcurses.mpcurses.update_screen_status')
-    @patch('mpcurses.MPcurses.get_blink_message')
-    def test__get_message_Should_ReturnExpected_When_BlinkScreenNoMessage(self, get_blink_message_patch, update_screen_status_patch, *patches):
-        get_blink_message_patch.return_value = None
-        function_mock = Mock(__name__='_queue_handler')
-        screen_layout = {
-            '_screen': {
-                'blink': True
-            }
-        }
-        client = MPcurses(function=function_mock, screen_layout=screen_layout)
+    @patch('mpcurses.MPcurses.run_timers')
+    def test__get_message_Should_RunTimers_When_Called(self, run_timers_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': True}})
         message_queue_mock = Mock()
         message_queue_mock.get.return_value = '#0-DONE'
         client.message_queue = message_queue_mock
         client.get_message()
-        update_screen_status_patch.assert_not_called()
+        run_timers_patch.assert_called_once_with()
 
     def test__get_message_Should_ReturnExpected_When_ControlDone(self, *patches):
         process_data = [{'range': '0-1'}]
@@ -329,25 +465,26 @@ class TestMPcurses(unittest.TestCase):
     @patch('mpcurses.MPcurses.teardown_screen')
     @patch('mpcurses.MPcurses.setup_screen')
     @patch('mpcurses.MPcurses.start_processes')
-    @patch('mpcurses.mpcurses.refresh_screen')
+    @patch('mpcurses.MPcurses.render_screen')
     @patch('mpcurses.mpcurses.update_screen')
     @patch('mpcurses.mpcurses.logger')
     @patch('mpcurses.MPcurses.process_control_message')
-    @patch('mpcurses.MPcurses.get_message')
-    def test__run_screen_Should_CallExpected_When_Called(self, get_message_patch, process_control_message_patch, logger_patch, update_screen_patch, refresh_screen_patch, *patches):
+    @patch('mpcurses.MPcurses.get_messages')
+    def test__run_screen_Should_CallExpected_When_Called(self, get_messages_patch, process_control_message_patch, logger_patch, update_screen_patch, render_screen_patch, *patches):
         process_data = [{'range': '0-1'}]
         client = MPcurses(function=Mock(__name__='mockfunc'), process_data=process_data, screen_layout={'_screen': {'blink': False}})
 
-        get_message_patch.side_effect = [
+        get_messages_patch.side_effect = [
             # 1
-            {'offset': None, 'control': None, 'message': '#0-this is message1'},
+            [{'offset': None, 'control': None, 'message': '#0-this is message1'}],
             # 2
             Empty('empty'),
             # 3
-            {'offset': None, 'control': None, 'message': '#0-this is message2'},
+            [
+                {'offset': None, 'control': None, 'message': '#0-this is message2'},
+                {'offset': '0', 'control': 'DONE', 'message': '#0-DONE'}
+            ],
             # 4
-            {'offset': '0', 'control': 'DONE', 'message': '#0-DONE'},
-            # 5
             NoActiveProcesses()
         ]
         screen_mock = Mock()
@@ -357,15 +494,322 @@ class TestMPcurses(unittest.TestCase):
         update_screen_call1 = call('#0-this is message1', client.screen, client.screen_layout)
         self.assertTrue(update_screen_call1 in update_screen_patch.mock_calls)
         # 2
-        refresh_screen_patch.assert_called_once_with(client.screen)
+        self.assertEqual(len(render_screen_patch.mock_calls), 4)
+        render_screen_patch.assert_called_with(force=True)
         # 3
         update_screen_call2 = call('#0-this is message2', client.screen, client.screen_layout)
         self.assertTrue(update_screen_call2 in update_screen_patch.mock_calls)
-        # 4
         process_control_message_patch.assert_called_once_with('0', 'DONE')
-        # 5
+        # 4
         logger_patch.info.assert_called_once_with('there are no more active processses - quitting')
 
+    @patch('mpcurses.mpcurses.refresh_screen')
+    def test__render_screen_Should_NotRender_When_NothingPending(self, refresh_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30}})
+        client.screen = Mock()
+        client.rendered_at = 0
+        client.render_screen()
+        refresh_screen_patch.assert_not_called()
+
+    def test__get_wait_timeout_Should_ReturnWaitTimeout_When_NothingPending(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30}})
+        self.assertEqual(client.get_wait_timeout(), 0.1)
+
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.02)
+    def test__get_wait_timeout_Should_ReturnTimeUntilNextFrame_When_RenderPending(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 20}})
+        client.render_pending = True
+        client.rendered_at = 10.0
+        self.assertAlmostEqual(client.get_wait_timeout(), 0.03)
+        client.rendered_at = 9.0
+        self.assertEqual(client.get_wait_timeout(), 0)
+
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.0)
+    def test__get_wait_timeout_Should_ReturnTimeUntilNextTimer_When_TimerDueSooner(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 20}})
+        client.timers = [{'due_at': 10.04}]
+        self.assertAlmostEqual(client.get_wait_timeout(), 0.04)
+
+    @patch('mpcurses.MPcurses.get_wait_timeout', return_value=0.05)
+    def test__get_messages_Should_BlockForFirstMessage_When_WaitTimeout(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        message_queue_mock = Mock()
+        message_queue_mock.get.side_effect = ['#0-message1', Empty('empty')]
+        client.message_queue = message_queue_mock
+        client.get_messages()
+        self.assertEqual(message_queue_mock.get.mock_calls, [call(True, 0.05), call(False)])
+
+    def test__get_messages_Should_DrainUpToBatchSize_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'batch_size': 2, 'batch_time': 0}})
+        message_queue_mock = Mock()
+        message_queue_mock.get.side_effect = ['#0-message1', '#1-DONE', '#0-message2']
+        client.message_queue = message_queue_mock
+        result = client.get_messages()
+        expected_result = [
+            {'offset': None, 'control': None, 'message': '#0-message1'},
+            {'offset': 1, 'control': 'DONE', 'message': '#1-DONE'}
+        ]
+        self.assertEqual(result, expected_result)
+
+    def test__get_messages_Should_ReturnAvailable_When_QueueEmptied(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        message_queue_mock = Mock()
+        message_queue_mock.get.side_effect = ['#0-message1', Empty('empty')]
+        client.message_queue = message_queue_mock
+        result = client.get_messages()
+        self.assertEqual(result, [{'offset': None, 'control': None, 'message': '#0-message1'}])
+
+    @patch('mpcurses.mpcurses.monotonic')
+    def test__get_messages_Should_StopDraining_When_BatchTimeElapsed(self, monotonic_patch, *patches):
+        monotonic_patch.side_effect = [10.0, 10.01, 10.2]
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'max_fps': 0, 'batch_time': .1}})
+        message_queue_mock = Mock()
+        message_queue_mock.get.side_effect = ['#0-message1', '#0-message2', '#0-message3']
+        client.message_queue = message_queue_mock
+        result = client.get_messages()
+        self.assertEqual(len(result), 2)
+
+    def test__get_messages_Should_RaiseEmpty_When_QueueEmpty(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}})
+        message_queue_mock = Mock()
+        message_queue_mock.get.side_effect = Empty('empty')
+        client.message_queue = message_queue_mock
+        with self.assertRaises(Empty):
+            client.get_messages()
+
+    @patch('mpcurses.MPcurses.receive_channel_messages')
+    @patch('mpcurses.MPcurses.get_wait_timeout', return_value=0.05)
+    def test__get_messages_Should_ReceiveFromChannels_When_Isolate(self, get_wait_timeout_patch, receive_channel_messages_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'batch_size': 2}}, item_timeout=3)
+        process_mock = Mock()
+
+        def receive(timeout):
+            client.inbox.extend((process_mock, client.parse_message(message)) for message in ['#0-message1', '#0-DONE', '#1-message2'])
+
+        receive_channel_messages_patch.side_effect = receive
+        result = client.get_messages()
+        receive_channel_messages_patch.assert_called_once_with(0.05)
+        self.assertEqual([message['message'] for message in result], ['#0-message1', '#0-DONE'])
+        self.assertEqual(client.get_messages(), [{'offset': None, 'control': None, 'message': '#1-message2'}])
+        receive_channel_messages_patch.assert_called_once_with(0.05)
+
+    @patch('mpcurses.MPcurses.receive_channel_messages')
+    def test__get_messages_Should_RaiseEmpty_When_IsolateAndNothingReceived(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False}}, run_timeout=3)
+        with self.assertRaises(Empty):
+            client.get_messages()
+
+    @patch('mpcurses.mpcurses.wait')
+    def test__receive_channel_messages_Should_RouteMessagesAndResults_When_Received(self, wait_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], item_timeout=3)
+        process1_mock = Mock()
+        receiver1_mock = Mock()
+        receiver1_mock.poll.side_effect = [True, True, True, False]
+        receiver1_mock.recv.side_effect = ['#0-message', {'offset': 0, 'result': 'a'}, '#0-DONE']
+        process2_mock = Mock()
+        receiver2_mock = Mock()
+        receiver2_mock.poll.return_value = True
+        receiver2_mock.recv.side_effect = ['#1-DONE', EOFError()]
+        process3_mock = Mock()
+        receiver3_mock = Mock()
+        client.channels = {process1_mock: receiver1_mock, process2_mock: receiver2_mock, process3_mock: receiver3_mock}
+        wait_patch.return_value = [receiver1_mock, receiver2_mock]
+        client.receive_channel_messages(0.1)
+        wait_patch.assert_called_once_with([receiver1_mock, receiver2_mock, receiver3_mock], 0.1)
+        self.assertEqual(client.results, {0: 'a'})
+        self.assertEqual([(process, message['message']) for process, message in client.inbox], [
+            (process1_mock, '#0-message'), (process1_mock, '#0-DONE'), (process2_mock, '#1-DONE')])
+        # the channel of the process that exited is closed but its messages are still processed
+        receiver2_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {process1_mock: receiver1_mock, process3_mock: receiver3_mock})
+        receiver3_mock.recv.assert_not_called()
+
+    @patch('mpcurses.MPcurses.on_start_process')
+    @patch('mpcurses.mpcurses.open_channel')
+    @patch('mpcurses.mpcurses.Process')
+    def test__start_next_process_Should_StartProcessWithOwnChannel_When_Isolate(self, process_patch, open_channel_patch, *patches):
+
+        def mockfunc(name=None):
+            pass
+
+        receiver_mock = Mock()
+        channel_mock = Mock()
+        open_channel_patch.return_value = (receiver_mock, channel_mock)
+        client = MPcurses(function=mockfunc, process_data=[{'name': 'a'}], item_timeout=3)
+        client.populate_process_queue()
+        client.start_next_process()
+        process_patch.assert_called_once_with(
+            target=client.function, args=(), kwargs={'message_queue': channel_mock, 'offset': 0, 'result_queue': channel_mock, 'name': 'a'})
+        process_patch.return_value.start.assert_called_once_with()
+        channel_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {process_patch.return_value: receiver_mock})
+        self.assertIs(client.processes[0]['process'], process_patch.return_value)
+        self.assertEqual(client.active_processes, 1)
+
+    @patch('mpcurses.mpcurses.open_channel')
+    @patch('mpcurses.mpcurses.Worker')
+    def test__start_worker_Should_StartWorkerWithOwnChannel_When_Isolate(self, worker_patch, open_channel_patch, *patches):
+        receiver_mock = Mock()
+        channel_mock = Mock()
+        open_channel_patch.return_value = (receiver_mock, channel_mock)
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], pool=True, speculate=True)
+        client.start_worker()
+        worker_patch.assert_called_once_with(client.function, channel_mock, channel_mock, {}, False)
+        worker_patch.return_value.start.assert_called_once_with()
+        channel_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {worker_patch.return_value.process: receiver_mock})
+        self.assertEqual(client.workers, [worker_patch.return_value])
+
+    def test__init_Should_SetIsolate_When_ProcessesCanBeTerminated(self, *patches):
+        self.assertFalse(MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}]).isolate)
+        self.assertTrue(MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True).isolate)
+        self.assertTrue(MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], item_timeout=3).isolate)
+        self.assertTrue(MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], run_timeout=3).isolate)
+
+    def test__parse_message_Should_ReturnExpected_When_ControlLikeMessage(self, *patches):
+        result = MPcurses.parse_message('#0-this is not-DONE')
+        self.assertEqual(result, {'offset': None, 'control': None, 'message': '#0-this is not-DONE'})
+
+    def test__init_Should_SetRenderInterval_When_MaxFps(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 20}})
+        self.assertEqual(client.render_interval, 0.05)
+
+    def test__init_Should_NotSetRenderInterval_When_NoMaxFps(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 0}})
+        self.assertEqual(client.render_interval, 0)
+
+    @patch('mpcurses.mpcurses.monotonic')
+    @patch('mpcurses.mpcurses.flush_screen')
+    @patch('mpcurses.mpcurses.refresh_screen')
+    def test__render_screen_Should_RenderAtMostMaxFps_When_Called(self, refresh_screen_patch, flush_screen_patch, monotonic_patch, *patches):
+        monotonic_patch.side_effect = [10.0, 10.01, 10.04, 10.05]
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30}})
+        client.screen = Mock()
+        client.render_pending = True
+        client.render_screen()
+        client.render_pending = True
+        client.render_screen()
+        client.render_screen()
+        client.render_screen(force=True)
+        self.assertFalse(client.render_pending)
+        self.assertEqual(refresh_screen_patch.mock_calls, [call(client.screen)] * 3)
+        self.assertEqual(flush_screen_patch.mock_calls, [call(client.screen, client.screen_layout)] * 3)
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.setup_screen')
+    @patch('mpcurses.MPcurses.start_processes')
+    @patch('mpcurses.MPcurses.render_screen')
+    @patch('mpcurses.MPcurses.get_messages', side_effect=NoActiveProcesses())
+    @patch('mpcurses.mpcurses.CursesRenderer')
+    def test__run_screen_Should_WrapScreen_When_Shadow(self, curses_renderer_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'shadow': True}})
+        screen_mock = Mock()
+        client.run_screen(screen_mock)
+        curses_renderer_patch.assert_called_once_with(screen_mock)
+        self.assertEqual(client.screen, curses_renderer_patch.return_value)
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.setup_screen')
+    @patch('mpcurses.MPcurses.start_processes')
+    @patch('mpcurses.MPcurses.render_screen')
+    @patch('mpcurses.MPcurses.get_messages', side_effect=NoActiveProcesses())
+    @patch('mpcurses.mpcurses.RenderThread')
+    @patch('mpcurses.mpcurses.CursesRenderer')
+    def test__run_screen_Should_StartAndStopRenderThread_When_RenderThread(self, curses_renderer_patch, render_thread_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'render_thread': True, 'max_fps': 20}})
+        client.run_screen(Mock())
+        render_thread_patch.assert_called_once_with(curses_renderer_patch.return_value, 0.05)
+        render_thread_patch.return_value.start.assert_called_once_with()
+        render_thread_patch.return_value.stop.assert_called_once_with()
+        self.assertIsNone(client.render_thread)
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.setup_screen')
+    @patch('mpcurses.MPcurses.start_processes', side_effect=[Exception('error')])
+    @patch('mpcurses.mpcurses.RenderThread')
+    @patch('mpcurses.mpcurses.CursesRenderer')
+    def test__run_screen_Should_StopRenderThread_When_Exception(self, curses_renderer_patch, render_thread_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'render_thread': True, 'max_fps': 0}})
+        with self.assertRaises(Exception):
+            client.run_screen(Mock())
+        render_thread_patch.assert_called_once_with(curses_renderer_patch.return_value, 1 / 30)
+        render_thread_patch.return_value.stop.assert_called_once_with()
+
+    @patch('mpcurses.mpcurses.flush_screen')
+    @patch('mpcurses.mpcurses.refresh_screen')
+    def test__render_screen_Should_NotRefresh_When_RenderThread(self, refresh_screen_patch, flush_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30}})
+        client.screen = Mock()
+        client.render_thread = Mock()
+        client.render_screen(force=True)
+        flush_screen_patch.assert_called_once_with(client.screen, client.screen_layout)
+        refresh_screen_patch.assert_not_called()
+
+    @patch('mpcurses.mpcurses.scroll_screen', return_value=True)
+    @patch('mpcurses.mpcurses.follow_viewport')
+    @patch('mpcurses.mpcurses.flush_screen')
+    @patch('mpcurses.mpcurses.refresh_screen')
+    def test__render_screen_Should_FollowRunningRowsAndReadKeys_When_FrameRendered(self, refresh_screen_patch, flush_screen_patch, follow_viewport_patch, scroll_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30, '_viewport': {'follow': True}}})
+        client.screen = Mock()
+        client.processes = {0: {'start_time': 1, 'stop_time': 2}, 1: {'start_time': 1, 'stop_time': None}}
+        client.render_screen(force=True)
+        follow_viewport_patch.assert_called_once_with(client.screen, client.screen_layout, [1])
+        scroll_screen_patch.assert_called_once_with(client.screen, client.screen_layout)
+        self.assertTrue(client.render_pending)
+
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.01)
+    @patch('mpcurses.mpcurses.scroll_screen')
+    @patch('mpcurses.mpcurses.refresh_screen')
+    def test__render_screen_Should_NotReadKeys_When_FrameNotDue(self, refresh_screen_patch, scroll_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'max_fps': 30}})
+        client.screen = Mock()
+        client.rendered_at = 10.0
+        client.render_pending = True
+        client.render_screen()
+        refresh_screen_patch.assert_not_called()
+        scroll_screen_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.start_processes')
+    @patch('mpcurses.MPcurses.render_screen')
+    @patch('mpcurses.MPcurses.get_messages', side_effect=NoActiveProcesses())
+    def test__run_screen_Should_ShowFirstRowsAndReadKeysWithoutWaiting_When_VirtualTable(self, *patches):
+        screen_layout = {
+            '_screen': {'blink': False, 'show_process_status': False},
+            'table': {'virtual': True},
+            'number': {'position': (1, 0), 'table': True, 'regex': r"^'number' is '(?P<value>.*)'$"}
+        }
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{'number': index} for index in range(1000)], screen_layout=screen_layout)
+        screen = NullRenderer(5, 80)
+        client.run_screen(screen)
+        self.assertEqual(screen_layout['_screen']['_viewport']['scroll'], 0)
+        self.assertEqual(screen.get_lines()[1:4], ['0', '1', '2'])
+        self.assertTrue(screen.no_delay)
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.start_processes')
+    @patch('mpcurses.MPcurses.get_messages', side_effect=NoActiveProcesses())
+    def test__update_row_Should_RenderItemStatusMessages_When_LayoutHasStatusField(self, *patches):
+        screen_layout = {
+            '_screen': {'blink': False, 'show_process_status': False},
+            'number': {'position': (1, 0), 'table': True, 'regex': r"^'number' is '(?P<value>.*)'$"},
+            'status': {'position': (1, 4), 'table': True, 'clear': True, 'regex': r'^(?P<value>(mpcurses|ERROR): .*)$'}
+        }
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{'number': index} for index in range(4)], screen_layout=screen_layout)
+        screen = NullRenderer(6, 120)
+        client.run_screen(screen)
+        client.update_row(0, 'mpcurses: started speculative attempt')
+        client.update_row(1, 'mpcurses: speculative attempt completed first')
+        client.update_row(2, 'mpcurses: attempt 2 of 3 in 1.5s')
+        client.update_row(3, 'ERROR: timed out after 3 seconds')
+        client.render_screen(force=True)
+        self.assertEqual(screen.get_lines()[1:5], [
+            '0   mpcurses: started speculative attempt',
+            '1   mpcurses: speculative attempt completed first',
+            '2   mpcurses: attempt 2 of 3 in 1.5s',
+            '3   ERROR: timed out after 3 seconds'])
+
     @patch('mpcurses.MPcurses.run')
     def test__execute_run_Should_CallExpected_When_NoScreenLayout(self, run_patch, *patches):
         function_mock = Mock(__name__='mockfunc')
@@ -374,6 +818,55 @@ class TestMPcurses(unittest.TestCase):
         client.execute_run()
         run_patch.assert_called_once_with()
 
+    @patch('mpcurses.MPcurses.run_screen')
+    @patch('mpcurses.mpcurses.wrapper')
+    def test__execute_run_Should_RunScreenWithNullRenderer_When_NullRenderer(self, wrapper_patch, run_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout={'_screen': {'blink': False}}, renderer='null')
+        client.execute_run()
+        wrapper_patch.assert_not_called()
+        screen = run_screen_patch.call_args[0][0]
+        self.assertIsInstance(screen, NullRenderer)
+
+    @patch('mpcurses.MPcurses.run_screen')
+    @patch('mpcurses.mpcurses.wrapper')
+    def test__execute_run_Should_RunScreenWithGivenRenderer_When_NullRendererInstance(self, wrapper_patch, run_screen_patch, *patches):
+        screen = NullRenderer(60, 120)
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout={'_screen': {'blink': False}}, renderer=screen)
+        client.execute_run()
+        wrapper_patch.assert_not_called()
+        run_screen_patch.assert_called_once_with(screen)
+
+    @patch('mpcurses.MPcurses.run_screen')
+    def test__execute_run_Should_StartAndStopGivenRenderer_When_AnsiRendererInstance(self, run_screen_patch, *patches):
+        screen = Mock(spec=AnsiRenderer)
+        screen.__enter__ = Mock(return_value=screen)
+        screen.__exit__ = Mock(return_value=None)
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout={'_screen': {'blink': False}}, renderer=screen)
+        client.execute_run()
+        run_screen_patch.assert_called_once_with(screen)
+        screen.__exit__.assert_called_once()
+
+    @patch('mpcurses.MPcurses.run_screen')
+    @patch('mpcurses.mpcurses.AnsiRenderer')
+    def test__execute_run_Should_RunScreenWithAnsiRenderer_When_AnsiRenderer(self, ansi_renderer_patch, run_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout={'_screen': {'blink': False}}, renderer='ansi')
+        client.execute_run()
+        run_screen_patch.assert_called_once_with(ansi_renderer_patch.return_value.__enter__.return_value)
+        ansi_renderer_patch.return_value.__exit__.assert_called_once()
+
+    @patch('mpcurses.MPcurses.teardown_screen')
+    @patch('mpcurses.MPcurses.setup_screen')
+    @patch('mpcurses.MPcurses.start_processes')
+    @patch('mpcurses.MPcurses.render_screen')
+    @patch('mpcurses.MPcurses.get_messages', side_effect=NoActiveProcesses())
+    @patch('mpcurses.mpcurses.RenderThread')
+    def test__run_screen_Should_NotWrapScreenOrStartRenderThread_When_NullRenderer(self, render_thread_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), screen_layout={'_screen': {'blink': False, 'shadow': True, 'render_thread': True}})
+        screen = NullRenderer(10, 10)
+        client.run_screen(screen)
+        self.assertIs(client.screen, screen)
+        render_thread_patch.assert_not_called()
+
     @patch('mpcurses.MPcurses.run_screen')
     @patch('mpcurses.mpcurses.wrapper')
     def test__execute_run_Should_CallExpected_When_ScreenLayout(self, wrapper_patch, run_screen_patch, *patches):
@@ -382,3 +875,792 @@ class TestMPcurses(unittest.TestCase):
         client = MPcurses(function=function_mock, process_data=process_data, screen_layout={'_screen': {'blink': False}})
         client.execute_run()
         wrapper_patch.assert_called_once_with(run_screen_patch)
+
+    @patch('mpcurses.mpcurses.MPmq.start_processes')
+    def test__start_processes_Should_CallParent_When_NoPool(self, start_processes_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}])
+        client.start_processes()
+        start_processes_patch.assert_called_once_with()
+
+    @staticmethod
+    def get_worker_mock(*args):
+        worker_mock = Mock(offsets=set())
+        worker_mock.submit.side_effect = lambda chunk: worker_mock.offsets.update(offset for offset, _ in chunk)
+        return worker_mock
+
+    @patch('mpcurses.mpcurses.Worker')
+    def test__start_processes_Should_StartWorkersAndSubmitItems_When_Pool(self, worker_patch, *patches):
+        worker_patch.side_effect = self.get_worker_mock
+
+        def mockfunc(nrange=None):
+            pass
+
+        process_data = [{'nrange': '1'}, {'nrange': '2'}, {'nrange': '3'}]
+        client = MPcurses(function=mockfunc, process_data=process_data, processes_to_start=2, pool=True)
+        client.start_processes()
+        self.assertEqual(worker_patch.call_count, 2)
+        worker_patch.assert_called_with(client.function, client.message_queue, client.result_queue, {}, True)
+        self.assertEqual(client.workers[0].submit.mock_calls, [call([(0, {'nrange': '1'})])])
+        self.assertEqual(client.workers[1].submit.mock_calls, [call([(1, {'nrange': '2'})])])
+        self.assertEqual(client.active_processes, 2)
+        self.assertEqual(client.process_queue.qsize(), 1)
+        self.assertIs(client.processes[1]['worker'], client.workers[1])
+
+    @patch('mpcurses.mpcurses.Worker')
+    def test__start_processes_Should_StartOneWorkerPerItem_When_FewerItemsThanProcessesToStart(self, worker_patch, *patches):
+        worker_patch.side_effect = lambda *args: Mock(offsets=set())
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=4, pool=True)
+        client.start_processes()
+        self.assertEqual(worker_patch.call_count, 1)
+
+    @patch('mpcurses.mpcurses.Worker')
+    def test__start_processes_Should_SubmitChunks_When_Chunksize(self, worker_patch, *patches):
+        worker_patch.side_effect = self.get_worker_mock
+        process_data = [{'n': n} for n in range(5)]
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=process_data, processes_to_start=4, pool=True, chunksize=2)
+        client.start_processes()
+        self.assertEqual(worker_patch.call_count, 3)
+        self.assertEqual(client.workers[0].submit.mock_calls, [call([(0, {'n': 0}), (1, {'n': 1})])])
+        self.assertEqual(client.workers[2].submit.mock_calls, [call([(4, {'n': 4})])])
+        self.assertEqual(client.active_processes, 5)
+        self.assertIs(client.processes[3]['worker'], client.workers[1])
+
+    def test__start_next_process_Should_NotSubmit_When_NoIdleWorker(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], pool=True, chunksize=2)
+        worker_mock = Mock(offsets={0})
+        client.workers = [worker_mock]
+        client.process_queue.put((1, {}))
+        client.start_next_process()
+        worker_mock.submit.assert_not_called()
+        self.assertEqual(client.process_queue.qsize(), 1)
+
+    def test__init_Should_RaiseValueError_When_ChunksizeWithoutPool(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], chunksize=2)
+
+    def test__init_Should_RaiseValueError_When_ChunksizeInvalid(self, *patches):
+        for chunksize in [0, 'big', 1.5]:
+            with self.assertRaises(ValueError):
+                MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], pool=True, chunksize=chunksize)
+
+    def test__complete_process_Should_ReleaseWorker_When_Pool(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], pool=True)
+        worker_mock = Mock(offsets={1}, completed_at=None)
+        client.workers = [worker_mock]
+        client.process_queue.put((1, {}))
+        client.start_next_process = Mock()
+        client.processes[1] = {'process': worker_mock.process, 'worker': worker_mock, 'start_time': datetime.now(), 'stop_time': None, 'duration': None}
+        client.active_processes = 1
+        client.process_control_message(1, 'DONE')
+        self.assertEqual(worker_mock.offsets, set())
+        worker_mock.process.join.assert_not_called()
+        self.assertEqual(client.processes[1]['duration'], '0:00:00')
+        self.assertEqual(client.active_processes, 0)
+        self.assertEqual(client.completed_processes, 1)
+        client.start_next_process.assert_called_once_with()
+
+    @patch('mpcurses.mpcurses.MPmq.complete_process')
+    def test__complete_process_Should_CallParent_When_NoPool(self, complete_process_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}])
+        start_time = datetime(2021, 1, 1, 0, 0, 0)
+        client.processes = {0: {'start_time': start_time, 'stop_time': start_time + timedelta(seconds=2)}}
+        client.complete_process(0)
+        complete_process_patch.assert_called_once_with(0)
+        self.assertEqual(client.durations, [2.0])
+
+    @patch('mpcurses.MPcurses.run')
+    def test__execute_run_Should_StopWorkers_When_RunRaises(self, run_patch, *patches):
+        run_patch.side_effect = KeyboardInterrupt()
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], pool=True)
+        worker_mock = Mock()
+        client.workers = [worker_mock]
+        with self.assertRaises(KeyboardInterrupt):
+            client.execute_run()
+        worker_mock.stop.assert_called_once_with(client.timeout)
+        self.assertEqual(client.workers, [])
+
+    def test__get_results_Should_ReturnResultsInOffsetOrderAndStopWorkers_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}], pool=True)
+        client.timeout = 0.01
+        result_queue_mock = Mock()
+        result_queue_mock.get.side_effect = [{'offset': 2, 'result': 'c'}, {'offset': 0, 'result': 'a'}, {'offset': 1, 'result': 'b'}, Empty('empty')]
+        client.result_queue = result_queue_mock
+        worker_mock = Mock()
+        client.workers = [worker_mock]
+        self.assertEqual(client.get_results(), ['a', 'b', 'c'])
+        result_queue_mock.close.assert_called_once_with()
+        worker_mock.stop.assert_called_once_with(0.01)
+
+    def test__init_Should_RaiseValueError_When_AutoscaleInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], autoscale=4)
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], autoscale={'min': 3, 'max': 2})
+
+    def test__init_Should_AddAutoscaleTimer_When_Autoscale(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], autoscale={'min': 2, 'max': 6, 'interval': 5})
+        self.assertEqual(client.autoscaler.minimum, 2)
+        self.assertEqual(client.autoscaler.maximum, 6)
+        self.assertEqual(client.timers, [{'interval': 5, 'callback': client.autoscale, 'due_at': None}])
+
+    @patch('mpcurses.mpcurses.MPmq.start_processes')
+    def test__start_processes_Should_ClampProcessesToStart_When_Autoscale(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}] * 10, autoscale={'min': 2, 'max': 6})
+        client.start_processes()
+        self.assertEqual(client.processes_to_start, 6)
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.MPcurses.retire_workers')
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.mpcurses.get_pressure', return_value=10.0)
+    @patch('mpcurses.mpcurses.get_load', return_value=.5)
+    @patch('mpcurses.mpcurses.monotonic', return_value=10.0)
+    def test__autoscale_Should_UpdateProcessesToStart_When_TargetChanges(self, monotonic_patch, get_load_patch, get_pressure_patch, start_queued_processes_patch, retire_workers_patch, on_state_change_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=2, autoscale=True)
+        client.autoscaler = Mock()
+        client.autoscaler.update.return_value = 3
+        client.completed_processes = 7
+        client.autoscale()
+        client.autoscaler.update.assert_called_once_with(7, 10.0, load=.5, pressure=10.0)
+        self.assertEqual(client.processes_to_start, 3)
+        start_queued_processes_patch.assert_called_once_with()
+        retire_workers_patch.assert_called_once_with()
+        on_state_change_patch.assert_called_once_with()
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.mpcurses.get_pressure')
+    @patch('mpcurses.mpcurses.get_load')
+    def test__autoscale_Should_DoNothing_When_TargetUnchanged(self, get_load_patch, get_pressure_patch, start_queued_processes_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=2, autoscale=True)
+        client.autoscaler = Mock()
+        client.autoscaler.update.return_value = 2
+        client.autoscale()
+        start_queued_processes_patch.assert_not_called()
+
+    def test__retire_workers_Should_RetireIdleWorkersAboveProcessesToStart_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=1, pool=True)
+        busy_mock = Mock(offsets={0})
+        idle_mock1 = Mock(offsets=set())
+        idle_mock2 = Mock(offsets=set())
+        client.workers = [busy_mock, idle_mock1, idle_mock2]
+        client.retire_workers()
+        self.assertEqual(client.workers, [busy_mock])
+        self.assertEqual(client.retired_workers, [idle_mock1, idle_mock2])
+        idle_mock1.retire.assert_called_once_with()
+        busy_mock.retire.assert_not_called()
+
+    def test__stop_workers_Should_StopRetiredWorkers_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], pool=True)
+        worker_mock = Mock()
+        retired_mock = Mock()
+        client.workers = [worker_mock]
+        client.retired_workers = [retired_mock]
+        client.stop_workers()
+        worker_mock.stop.assert_called_once_with(client.timeout)
+        retired_mock.stop.assert_called_once_with(client.timeout)
+        self.assertEqual(client.retired_workers, [])
+
+    @patch('mpcurses.mpcurses.MPmq.start_next_process')
+    def test__start_next_process_Should_NotStartProcess_When_ProcessesToStartRunning(self, start_next_process_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], processes_to_start=1)
+        client.active_processes = 1
+        client.start_next_process()
+        start_next_process_patch.assert_not_called()
+        client.active_processes = 0
+        client.start_next_process()
+        start_next_process_patch.assert_called_once_with()
+
+    def test__start_next_process_Should_NotSubmit_When_ProcessesToStartBusy(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], processes_to_start=1, pool=True)
+        busy_mock = Mock(offsets={0})
+        idle_mock = Mock(offsets=set())
+        client.workers = [busy_mock, idle_mock]
+        client.process_queue.put((1, {}))
+        client.start_next_process()
+        idle_mock.submit.assert_not_called()
+
+    @patch('mpcurses.mpcurses.update_screen_status')
+    def test__on_state_change_Should_ShowTarget_When_Autoscale(self, update_screen_status_patch, *patches):
+        screen_layout = {'_screen': {'blink': False}}
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], processes_to_start=3, screen_layout=screen_layout, autoscale=True)
+        client.screen = Mock()
+        client.on_state_change()
+        update_screen_status_patch.assert_called_once_with(client.screen, 'process-update', screen_layout['_screen'], running=0, queued=0, completed=0, target=3, finish=None)
+
+    def test__init_Should_RaiseValueError_When_ItemKeyWithoutHistory(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], item_key='name')
+
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__init_Should_AddProjectionTimer_When_HistoryAndScreenLayout(self, load_history_patch, *patches):
+        screen_layout = {'_screen': {'blink': False}}
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], screen_layout=screen_layout, history='history.json')
+        load_history_patch.assert_called_once_with('history.json')
+        self.assertTrue(any(timer['callback'] == client.update_projection for timer in client.timers))
+
+    @patch('mpcurses.mpcurses.load_history')
+    def test__populate_process_queue_Should_OrderLongestFirst_When_History(self, load_history_patch, *patches):
+        load_history_patch.return_value = {'a': 1.0, 'b': 5.0}
+        process_data = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=process_data, history='history.json', item_key='name')
+        client.populate_process_queue()
+        self.assertEqual([offset for offset, _ in client.process_queue.queue], [1, 2, 0])
+        self.assertEqual(client.costs, {0: 1.0, 1: 5.0})
+
+    def test__populate_process_queue_Should_KeepOrder_When_NoHistory(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}])
+        client.populate_process_queue()
+        self.assertEqual([offset for offset, _ in client.process_queue.queue], [0, 1, 2])
+
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__record_duration_Should_UpdateHistory_When_Completed(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{'name': 'a'}, {'name': 'b'}], history='history.json', item_key='name')
+        start_time = datetime(2021, 1, 1, 0, 0, 0)
+        client.processes = {
+            0: {'start_time': start_time, 'stop_time': start_time + timedelta(seconds=4)},
+            1: {'start_time': start_time, 'stop_time': start_time + timedelta(seconds=2)}
+        }
+        client.failed.add(1)
+        client.record_duration(0)
+        client.record_duration(1)
+        self.assertEqual(client.history, {'a': 4.0})
+        self.assertEqual(client.durations, [4.0])
+
+    @patch('mpcurses.mpcurses.save_history')
+    @patch('mpcurses.mpcurses.load_history', return_value={'a': 1.0})
+    def test__write_history_Should_LogWarning_When_SaveFails(self, load_history_patch, save_history_patch, *patches):
+        save_history_patch.side_effect = OSError('read-only file system')
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], history='history.json')
+        with self.assertLogs('mpcurses.mpcurses', level='WARNING'):
+            client.write_history()
+        save_history_patch.assert_called_once_with('history.json', {'a': 1.0})
+
+    @patch('mpcurses.mpcurses.save_history')
+    def test__write_history_Should_DoNothing_When_NoHistory(self, save_history_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}])
+        client.write_history()
+        save_history_patch.assert_not_called()
+
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__get_cost_Should_ReturnExpected_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], history='history.json')
+        self.assertIsNone(client.get_cost(0))
+        client.durations = [1.0, 3.0]
+        self.assertEqual(client.get_cost(0), 2.0)
+        client.costs = {0: 4.0, 2: 6.0}
+        self.assertEqual(client.get_cost(0), 4.0)
+        self.assertEqual(client.get_cost(1), 5.0)
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.mpcurses.datetime')
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__update_projection_Should_SetProjectedFinish_When_Costs(self, load_history_patch, datetime_patch, on_state_change_patch, *patches):
+        now = datetime(2021, 1, 1, 12, 0, 0)
+        datetime_patch.now.return_value = now
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}], processes_to_start=2, history='history.json')
+        client.populate_process_queue()
+        client.process_queue.get()
+        client.costs = {0: 10.0, 1: 3.0, 2: 4.0}
+        client.processes = {0: {'start_time': now - timedelta(seconds=2), 'stop_time': None}}
+        client.update_projection()
+        # item 0 has 8 seconds left - items 1 and 2 run one after the other on the second process
+        self.assertEqual(client.projected_finish, '12:00:08')
+        on_state_change_patch.assert_called_once_with()
+        client.update_projection()
+        on_state_change_patch.assert_called_once_with()
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.mpcurses.datetime')
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__update_projection_Should_ProjectRestOfChunkOnWorker_When_Pool(self, load_history_patch, datetime_patch, *patches):
+        now = datetime(2021, 1, 1, 12, 0, 0)
+        datetime_patch.now.return_value = now
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}] * 10, processes_to_start=1, pool=True, chunksize=10, history='history.json')
+        client.populate_process_queue()
+        while not client.process_queue.empty():
+            client.process_queue.get()
+        client.costs = {offset: 1.0 for offset in range(10)}
+        worker = Mock(completed_at=None)
+        client.processes = {offset: {'start_time': now, 'stop_time': None, 'worker': worker} for offset in range(10)}
+        client.update_projection()
+        # the worker executes the ten items of its chunk one after the other
+        self.assertEqual(client.projected_finish, '12:00:10')
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.mpcurses.load_history', return_value={})
+    def test__update_projection_Should_NotProject_When_NoCosts(self, load_history_patch, on_state_change_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], history='history.json')
+        client.populate_process_queue()
+        client.update_projection()
+        self.assertIsNone(client.projected_finish)
+        on_state_change_patch.assert_not_called()
+
+    def test__init_Should_RaiseValueError_When_SpeculateInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=5)
+
+    def test__init_Should_AddSpeculateTimer_When_Speculate(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate={'factor': 3, 'interval': 2})
+        self.assertEqual(client.speculation, {'percentile': 95, 'factor': 3, 'min_completed': 5})
+        self.assertTrue(any(timer['callback'] == client.speculate and timer['interval'] == 2 for timer in client.timers))
+
+    def get_speculating_client(self, **kwargs):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}], processes_to_start=3, speculate=True, **kwargs)
+        client.durations = [1.0] * 5
+        now = datetime(2021, 1, 1, 12, 0, 0)
+        client.processes = {
+            0: {'start_time': now - timedelta(seconds=5), 'stop_time': None},
+            1: {'start_time': now - timedelta(seconds=1), 'stop_time': None},
+            2: {'start_time': now - timedelta(seconds=9), 'stop_time': now}
+        }
+        client.active_processes = 2
+        return client, now
+
+    @patch('mpcurses.MPcurses.start_attempt')
+    @patch('mpcurses.MPcurses.receive_attempt_messages')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__speculate_Should_StartAttemptOfStragglers_When_IdleSlot(self, datetime_patch, receive_attempt_messages_patch, start_attempt_patch, *patches):
+        client, now = self.get_speculating_client()
+        datetime_patch.now.return_value = now
+        client.speculate()
+        receive_attempt_messages_patch.assert_called_once_with()
+        start_attempt_patch.assert_called_once_with(0, 5.0)
+
+    @patch('mpcurses.MPcurses.start_attempt')
+    @patch('mpcurses.MPcurses.receive_attempt_messages')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__speculate_Should_NotStartAttempt_When_NoIdleSlotOrAlreadySpeculated(self, datetime_patch, receive_attempt_messages_patch, start_attempt_patch, *patches):
+        client, now = self.get_speculating_client()
+        datetime_patch.now.return_value = now
+        client.speculated.add(0)
+        client.speculate()
+        client.speculated.clear()
+        client.processes_to_start = 2
+        client.speculate()
+        start_attempt_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.start_attempt')
+    @patch('mpcurses.MPcurses.receive_attempt_messages')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__speculate_Should_NotStartAttempt_When_ItemsQueuedOrTooFewCompleted(self, datetime_patch, receive_attempt_messages_patch, start_attempt_patch, *patches):
+        client, now = self.get_speculating_client()
+        datetime_patch.now.return_value = now
+        client.process_queue.put((3, {}))
+        client.speculate()
+        client.process_queue.get()
+        client.durations = [1.0]
+        client.speculate()
+        start_attempt_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.start_attempt')
+    @patch('mpcurses.MPcurses.receive_attempt_messages')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__speculate_Should_OnlyStartAttemptOfLastItemOfWorker_When_Pool(self, datetime_patch, receive_attempt_messages_patch, start_attempt_patch, *patches):
+        client, now = self.get_speculating_client(pool=True)
+        datetime_patch.now.return_value = now
+        worker_mock = Mock(offsets={0, 1}, completed_at=None)
+        client.processes[0]['worker'] = worker_mock
+        client.processes[1]['worker'] = worker_mock
+        client.speculate()
+        start_attempt_patch.assert_not_called()
+        worker_mock.offsets = {0}
+        worker_mock.completed_at = now - timedelta(seconds=3)
+        client.speculate()
+        start_attempt_patch.assert_called_once_with(0, 3.0)
+
+    @patch('mpcurses.MPcurses.update_row')
+    @patch('mpcurses.mpcurses.open_channel')
+    @patch('mpcurses.mpcurses.Process')
+    def test__start_attempt_Should_StartProcessWithOwnChannel_When_Called(self, process_patch, open_channel_patch, update_row_patch, *patches):
+
+        def mockfunc(name=None):
+            pass
+
+        receiver_mock = Mock()
+        channel_mock = Mock()
+        open_channel_patch.return_value = (receiver_mock, channel_mock)
+        client = MPcurses(function=mockfunc, process_data=[{'name': 'a'}], speculate=True)
+        client.start_attempt(0, 5.0)
+        process_patch.assert_called_once_with(
+            target=client.function, args=(), kwargs={'message_queue': channel_mock, 'offset': 0, 'result_queue': channel_mock, 'name': 'a'})
+        process_patch.return_value.start.assert_called_once_with()
+        channel_mock.close.assert_called_once_with()
+        self.assertEqual(client.attempts, {0: {'process': process_patch.return_value, 'receiver': receiver_mock, 'error': False}})
+        self.assertEqual(client.channels, {})
+        self.assertEqual(client.speculated, {0})
+        update_row_patch.assert_called_once_with(0, 'mpcurses: started speculative attempt')
+
+    @patch('mpcurses.mpcurses.update_screen')
+    @patch('mpcurses.MPcurses.complete_attempt')
+    def test__receive_attempt_messages_Should_UpdateScreenAndCompleteAttempt_When_Done(self, complete_attempt_patch, update_screen_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], screen_layout={'_screen': {'blink': False}}, speculate=True)
+        client.screen = Mock()
+        receiver_mock = Mock()
+        receiver_mock.poll.side_effect = [True, True, True, True, True, False]
+        receiver_mock.recv.side_effect = ['#1-working', {'offset': 1, 'result': 'b'}, '#1-ERROR', '#1-DONE', '#1-late']
+        client.attempts = {1: {'process': Mock(), 'receiver': receiver_mock, 'error': False}}
+        client.receive_attempt_messages()
+        update_screen_patch.assert_called_once_with('#1-working', client.screen, client.screen_layout)
+        self.assertEqual(client.results, {1: 'b'})
+        self.assertTrue(client.attempts[1]['error'])
+        complete_attempt_patch.assert_called_once_with(1)
+
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__receive_attempt_messages_Should_DiscardAttempt_When_AttemptExitedWithoutDone(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        receiver_mock = Mock()
+        receiver_mock.poll.return_value = True
+        receiver_mock.recv.side_effect = ['#0-working', EOFError()]
+        client.attempts = {0: {'process': Mock(), 'receiver': receiver_mock, 'error': False}}
+        client.processes = {0: {'process': Mock(), 'stop_time': None}}
+        client.receive_attempt_messages()
+        self.assertEqual(client.attempts, {})
+        receiver_mock.close.assert_called_once_with()
+        process_control_message_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.update_row')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__complete_attempt_Should_TerminateProcessAndCompleteItem_When_AttemptSucceeded(self, process_control_message_patch, update_row_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        process_mock = Mock()
+        receiver_mock = Mock()
+        attempt = {'process': Mock(), 'receiver': Mock(), 'error': False}
+        client.attempts = {0: attempt}
+        client.processes = {0: {'process': process_mock, 'stop_time': None}}
+        client.channels = {process_mock: receiver_mock}
+        client.inbox.extend([(process_mock, {'offset': 0, 'control': 'DONE', 'message': '#0-DONE'})])
+        client.complete_attempt(0)
+        self.assertEqual(client.attempts, {})
+        attempt['process'].join.assert_called_once_with(client.timeout)
+        process_mock.terminate.assert_called_once_with()
+        receiver_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {})
+        self.assertEqual(list(client.inbox), [])
+        update_row_patch.assert_called_once_with(0, 'mpcurses: speculative attempt completed first')
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__complete_attempt_Should_StopWorker_When_AttemptSucceededAndPool(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], pool=True, speculate=True)
+        worker_mock = Mock()
+        client.workers = [worker_mock]
+        client.attempts = {0: {'process': Mock(), 'receiver': Mock(), 'error': False}}
+        client.processes = {0: {'worker': worker_mock, 'stop_time': None}}
+        client.complete_attempt(0)
+        worker_mock.process.terminate.assert_called_once_with()
+        worker_mock.stop.assert_called_once_with(client.timeout)
+        self.assertEqual(client.workers, [])
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__complete_attempt_Should_DiscardAttempt_When_AttemptFailed(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        process_mock = Mock()
+        client.attempts = {0: {'process': Mock(), 'receiver': Mock(), 'error': True}}
+        client.processes = {0: {'process': process_mock, 'stop_time': None}}
+        client.complete_attempt(0)
+        self.assertEqual(client.attempts, {})
+        process_mock.terminate.assert_not_called()
+        process_control_message_patch.assert_not_called()
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    def test__process_control_message_Should_StopAttempt_When_ItemCompletedFirst(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        attempt = {'process': Mock(), 'receiver': Mock(), 'error': False}
+        client.attempts = {0: attempt}
+        client.processes = {0: {'process': Mock(), 'stop_time': None}}
+        client.process_control_message(0, 'DONE')
+        attempt['process'].terminate.assert_called_once_with()
+        attempt['receiver'].close.assert_called_once_with()
+        self.assertEqual(client.attempts, {})
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    def test__process_control_message_Should_Ignore_When_ItemAlreadyCompleted(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        client.processes = {0: {'process': Mock(), 'stop_time': datetime.now()}}
+        client.process_control_message(0, 'DONE')
+        process_control_message_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.stop_attempts')
+    @patch('mpcurses.MPcurses.run')
+    def test__execute_run_Should_StopAttempts_When_RunRaises(self, run_patch, stop_attempts_patch, *patches):
+        run_patch.side_effect = KeyboardInterrupt()
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], speculate=True)
+        with self.assertRaises(KeyboardInterrupt):
+            client.execute_run()
+        stop_attempts_patch.assert_called_once_with()
+
+    def test__init_Should_RaiseValueError_When_TimeoutInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], item_timeout=0)
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], run_timeout='10')
+
+    def test__init_Should_AddTimeoutTimer_When_Timeout(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], item_timeout=5)
+        self.assertTrue(any(timer['callback'] == client.enforce_timeouts for timer in client.timers))
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}])
+        self.assertFalse(any(timer['callback'] == client.enforce_timeouts for timer in client.timers))
+
+    def test__get_running_items_Should_ReturnItemsNotCompleted_When_Called(self, *patches):
+        client, now = self.get_speculating_client()
+        self.assertEqual(client.get_running_items(), [(0, now - timedelta(seconds=5)), (1, now - timedelta(seconds=1))])
+
+    def test__get_running_items_Should_ReturnFirstItemOfEveryWorker_When_Pool(self, *patches):
+        client, now = self.get_speculating_client(pool=True)
+        worker_mock = Mock(offsets={0, 1}, completed_at=now - timedelta(seconds=2))
+        client.processes[0]['worker'] = worker_mock
+        client.processes[1]['worker'] = worker_mock
+        self.assertEqual(client.get_running_items(), [(0, now - timedelta(seconds=2))])
+
+    @patch('mpcurses.MPcurses.time_out_item')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__enforce_timeouts_Should_TimeOutItemsRunningLongerThanItemTimeout_When_Called(self, datetime_patch, time_out_item_patch, *patches):
+        client, now = self.get_speculating_client(item_timeout=3)
+        datetime_patch.now.return_value = now
+        client.enforce_timeouts()
+        time_out_item_patch.assert_called_once_with(0, ANY)
+        self.assertEqual(str(time_out_item_patch.call_args[0][1]), 'timed out after 3 seconds')
+
+    @patch('mpcurses.MPcurses.time_out_item')
+    @patch('mpcurses.MPcurses.time_out_run')
+    @patch('mpcurses.mpcurses.datetime')
+    def test__enforce_timeouts_Should_TimeOutRun_When_RunTimeoutExpired(self, datetime_patch, time_out_run_patch, time_out_item_patch, *patches):
+        client, now = self.get_speculating_client(item_timeout=3, run_timeout=10)
+        datetime_patch.now.return_value = now
+        client.started_at = now - timedelta(seconds=5)
+        client.enforce_timeouts()
+        time_out_run_patch.assert_not_called()
+        client.started_at = now - timedelta(seconds=11)
+        time_out_item_patch.reset_mock()
+        client.enforce_timeouts()
+        self.assertEqual(str(time_out_run_patch.call_args[0][0]), 'run timed out after 10 seconds')
+        time_out_item_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.time_out_item')
+    def test__time_out_run_Should_RecordQueuedItemsAndTimeOutRunningItems_When_Called(self, time_out_item_patch, *patches):
+        client, now = self.get_speculating_client(run_timeout=10)
+        client.process_data.append({})
+        client.process_queue.put((3, client.process_data[3]))
+        client.streaming = True
+        exception = TimeoutError('run timed out after 10 seconds')
+        client.time_out_run(exception)
+        self.assertTrue(client.expired)
+        self.assertFalse(client.streaming)
+        self.assertTrue(client.process_queue.empty())
+        self.assertEqual(client.timed_out, {3: exception})
+        self.assertEqual(time_out_item_patch.mock_calls, [call(0, exception), call(1, exception)])
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.update_row')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__time_out_item_Should_TerminateProcessAndCompleteItem_When_Called(self, process_control_message_patch, update_row_patch, start_queued_processes_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{'name': 'a'}], item_timeout=3)
+        process_mock = Mock()
+        client.processes = {0: {'process': process_mock, 'stop_time': None}}
+        exception = TimeoutError('timed out after 3 seconds')
+        client.time_out_item(0, exception)
+        process_mock.terminate.assert_called_once_with()
+        self.assertEqual(client.process_data[0]['result'], exception)
+        self.assertEqual(client.timed_out, {0: exception})
+        self.assertEqual(client.failed, {0})
+        update_row_patch.assert_called_once_with(0, 'ERROR: timed out after 3 seconds')
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+        start_queued_processes_patch.assert_called_once_with()
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__time_out_item_Should_TerminateWorkerAndQueueItsOtherItems_When_Pool(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}], item_timeout=3, pool=True)
+        worker_mock = Mock(offsets={0, 1})
+        client.workers = [worker_mock]
+        client.processes = {0: {'worker': worker_mock, 'stop_time': None}, 1: {'worker': worker_mock, 'stop_time': None}}
+        client.active_processes = 2
+        client.time_out_item(0, TimeoutError('timed out after 3 seconds'))
+        worker_mock.process.terminate.assert_called_once_with()
+        self.assertEqual(client.workers, [])
+        self.assertEqual(list(client.process_queue.queue), [(1, {})])
+        self.assertEqual(list(client.processes), [0])
+        self.assertEqual(worker_mock.offsets, {0})
+        self.assertEqual(client.active_processes, 1)
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__time_out_item_Should_RecordOtherItemsOfWorker_When_PoolAndRunExpired(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], run_timeout=3, pool=True)
+        worker_mock = Mock(offsets={0, 1})
+        client.processes = {0: {'worker': worker_mock, 'stop_time': None}, 1: {'worker': worker_mock, 'stop_time': None}}
+        client.expired = True
+        exception = TimeoutError('run timed out after 3 seconds')
+        client.time_out_item(0, exception)
+        self.assertTrue(client.process_queue.empty())
+        self.assertEqual(client.timed_out, {0: exception, 1: exception})
+
+    def test__get_results_Should_IncludeTimedOutItems_When_Called(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}])
+        client.timeout = 0.01
+        result_queue_mock = Mock()
+        result_queue_mock.get.side_effect = [{'offset': 2, 'result': 'c'}, {'offset': 0, 'result': 'a'}, Empty('empty')]
+        client.result_queue = result_queue_mock
+        exception = TimeoutError('timed out after 3 seconds')
+        client.timed_out = {1: exception}
+        self.assertEqual(client.get_results(), ['a', exception, 'c'])
+
+    @patch('mpcurses.MPcurses.receive_channel_messages')
+    def test__get_results_Should_ReturnChannelResults_When_Isolate(self, receive_channel_messages_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}, {}], item_timeout=3)
+        result_queue_mock = Mock()
+        client.result_queue = result_queue_mock
+        client.results = {2: 'c', 0: 'a'}
+        exception = TimeoutError('timed out after 3 seconds')
+        client.timed_out = {1: exception}
+        process_mock = Mock()
+        receiver_mock = Mock()
+        client.channels = {process_mock: receiver_mock}
+        self.assertEqual(client.get_results(), ['a', exception, 'c'])
+        receive_channel_messages_patch.assert_called_once_with(0)
+        result_queue_mock.get.assert_not_called()
+        receiver_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {})
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__time_out_item_Should_CloseChannelOfWorker_When_PoolAndIsolate(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], item_timeout=3, pool=True)
+        worker_mock = Mock(offsets={0, 1})
+        receiver_mock = Mock()
+        client.workers = [worker_mock]
+        client.channels = {worker_mock.process: receiver_mock}
+        client.processes = {0: {'worker': worker_mock, 'stop_time': None}, 1: {'worker': worker_mock, 'stop_time': None}}
+        # the DONE control message of the other item of the worker was received but not processed
+        client.inbox.append((worker_mock.process, client.parse_message('#1-DONE')))
+        client.time_out_item(0, TimeoutError('timed out after 3 seconds'))
+        receiver_mock.close.assert_called_once_with()
+        self.assertEqual(client.channels, {})
+        self.assertEqual(list(client.inbox), [])
+        self.assertEqual(list(client.process_queue.queue), [(1, {})])
+
+    def test__init_Should_RaiseValueError_When_RetryInvalid(self, *patches):
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry=3)
+        with self.assertRaises(ValueError):
+            MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry={'attempts': 0})
+
+    def test__init_Should_WrapFunctionAndAddRetryTimer_When_Retry(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry={'attempts': 5, 'exceptions': ValueError})
+        self.assertEqual(client.retry['attempts'], 5)
+        self.assertEqual(client.retry['exceptions'], (ValueError,))
+        self.assertEqual(client.function.function.exceptions, (ValueError,))
+        self.assertTrue(any(timer['callback'] == client.queue_retries for timer in client.timers))
+
+    def test__parse_message_Should_ReturnRetryControl_When_RetryMessage(self, *patches):
+        self.assertEqual(MPcurses.parse_message('#3-RETRY'), {'offset': 3, 'control': 'RETRY', 'message': '#3-RETRY'})
+
+    @patch('mpcurses.MPcurses.retry_item')
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    def test__process_control_message_Should_RetryItem_When_RetryableAndAttemptsLeft(self, process_control_message_patch, retry_item_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry=True)
+        client.processes = {0: {'process': Mock(), 'stop_time': None}}
+        client.process_control_message(0, 'RETRY')
+        client.process_control_message(0, 'ERROR')
+        client.process_control_message(0, 'DONE')
+        self.assertEqual(client.failed, set())
+        retry_item_patch.assert_called_once_with(0)
+        process_control_message_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.retry_item')
+    @patch('mpcurses.mpcurses.MPmq.process_control_message')
+    def test__process_control_message_Should_FailItem_When_AttemptsExhausted(self, process_control_message_patch, retry_item_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], retry={'attempts': 2})
+        client.processes = {0: {'process': Mock(), 'stop_time': None}}
+        client.retried = {0: 1}
+        client.retries = [(10, 1)]
+        client.process_control_message(0, 'RETRY')
+        client.process_control_message(0, 'ERROR')
+        self.assertEqual(client.failed, {0})
+        self.assertEqual(client.retryable, set())
+        self.assertEqual(client.retries, [])
+        retry_item_patch.assert_not_called()
+        process_control_message_patch.assert_called_once_with(0, 'ERROR')
+
+    @patch('mpcurses.mpcurses.MPmq.process_control_message', side_effect=NoActiveProcesses())
+    def test__process_control_message_Should_NotRaiseNoActiveProcesses_When_RetriesPending(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], retry=True)
+        client.retries = [(10, 1)]
+        client.process_control_message(0, 'DONE')
+        client.retries = []
+        with self.assertRaises(NoActiveProcesses):
+            client.process_control_message(0, 'DONE')
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.update_row')
+    @patch('mpcurses.mpcurses.get_backoff', return_value=1.5)
+    @patch('mpcurses.mpcurses.monotonic', return_value=100)
+    def test__retry_item_Should_ScheduleRetry_When_Called(self, monotonic_patch, get_backoff_patch, update_row_patch, start_queued_processes_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry=True)
+        process_mock = Mock()
+        client.processes = {0: {'process': process_mock, 'stop_time': None}}
+        client.active_processes = 1
+        client.retryable.add(0)
+        client.retry_item(0)
+        process_mock.join.assert_called_once_with(client.timeout)
+        self.assertEqual(client.processes, {})
+        self.assertEqual(client.active_processes, 0)
+        self.assertEqual(client.retryable, set())
+        self.assertEqual(client.retried, {0: 1})
+        self.assertEqual(client.retries, [(101.5, 0)])
+        get_backoff_patch.assert_called_once_with(1, backoff=1, multiplier=2, max_backoff=60, jitter=.5)
+        update_row_patch.assert_called_once_with(0, 'mpcurses: attempt 2 of 3 in 1.5s')
+        start_queued_processes_patch.assert_called_once_with()
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    def test__retry_item_Should_ReleaseWorker_When_Pool(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], retry=True, pool=True)
+        worker_mock = Mock(offsets={0})
+        client.workers = [worker_mock]
+        client.processes = {0: {'worker': worker_mock, 'stop_time': None}}
+        client.active_processes = 1
+        client.retry_item(0)
+        self.assertEqual(worker_mock.offsets, set())
+        self.assertIsNotNone(worker_mock.completed_at)
+        self.assertEqual(client.active_processes, 0)
+
+    @patch('mpcurses.MPcurses.on_state_change')
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.mpcurses.monotonic', return_value=100)
+    def test__queue_retries_Should_QueueItemsWhoseBackoffExpired_When_Called(self, monotonic_patch, start_queued_processes_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{'a': 0}, {'a': 1}, {'a': 2}], retry=True)
+        client.retries = [(99, 2), (101, 0), (100, 1)]
+        client.queue_retries()
+        self.assertEqual(list(client.process_queue.queue), [(2, {'a': 2}), (1, {'a': 1})])
+        self.assertEqual(client.retries, [(101, 0)])
+        start_queued_processes_patch.assert_called_once_with()
+        start_queued_processes_patch.reset_mock()
+        monotonic_patch.return_value = 100.5
+        client.queue_retries()
+        start_queued_processes_patch.assert_not_called()
+
+    @patch('mpcurses.MPcurses.start_queued_processes')
+    @patch('mpcurses.MPcurses.process_control_message')
+    def test__time_out_item_Should_RetryItem_When_TimeoutRetryable(self, process_control_message_patch, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}], item_timeout=3, retry=True)
+        client.processes = {0: {'process': Mock(), 'stop_time': None}}
+        client.time_out_item(0, TimeoutError('timed out after 3 seconds'))
+        self.assertEqual(client.retryable, {0})
+        self.assertEqual(client.timed_out, {})
+        self.assertEqual(client.failed, set())
+        process_control_message_patch.assert_called_once_with(0, 'DONE')
+
+    def test__get_results_Should_KeepResult_When_FailedAttemptResultArrivesLater(self, *patches):
+        client = MPcurses(function=Mock(__name__='mockfunc'), process_data=[{}, {}], retry=True)
+        client.timeout = 0.01
+        result_queue_mock = Mock()
+        exception = ValueError('flaky')
+        result_queue_mock.get.side_effect = [
+            {'offset': 0, 'result': exception}, {'offset': 0, 'result': 'a'}, {'offset': 1, 'result': 'b'}, {'offset': 1, 'result': exception}, Empty('empty')]
+        client.result_queue = result_queue_mock
+        self.assertEqual(client.get_results(), ['a', 'b'])
@@ -0,0 +1,135 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from mock import patch
+from mock import call
+from mock import Mock
+
+from mpcurses.pool import use_keyword_arguments
+from mpcurses.pool import get_chunksize
+from mpcurses.pool import get_arguments
+from mpcurses.pool import work
+from mpcurses.pool import Worker
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestPool(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    def test__use_keyword_arguments_Should_ReturnTrue_When_AllParametersHaveDefaults(self, *patches):
+
+        def function(nrange=None, **kwargs):
+            pass
+
+        self.assertTrue(use_keyword_arguments(function))
+
+    def test__use_keyword_arguments_Should_ReturnFalse_When_PositionalParameters(self, *patches):
+
+        def function(data, shared_data):
+            pass
+
+        self.assertFalse(use_keyword_arguments(function))
+
+    def test__get_chunksize_Should_ReturnChunksize_When_Fixed(self, *patches):
+        self.assertEqual(get_chunksize(10, 5, 2), 10)
+        self.assertEqual(get_chunksize(None, 5, 2), 1)
+
+    def test__get_chunksize_Should_ShrinkWithQueue_When_Auto(self, *patches):
+        self.assertEqual(get_chunksize('auto', 1000, 4), 63)
+        self.assertEqual(get_chunksize('auto', 10, 4), 1)
+        self.assertEqual(get_chunksize('auto', 0, 0), 1)
+
+    def test__get_arguments_Should_ReturnExpected_When_Called(self, *patches):
+        kwargs = {'message_queue': '--mq--', 'offset': 2, 'result_queue': '--rq--'}
+        self.assertEqual(get_arguments(2, {'a': 1}, '--mq--', '--rq--', {'s': 0}, True), ((), {**kwargs, 'a': 1, 's': 0}))
+        self.assertEqual(get_arguments(2, {'a': 1}, '--mq--', '--rq--', {'s': 0}, False), (({'a': 1}, {'s': 0}), kwargs))
+
+    def test__work_Should_ExecuteItemsWithKeywordArguments_When_UseKwargs(self, *patches):
+        function_mock = Mock()
+        connection_mock = Mock()
+        connection_mock.recv.side_effect = [[(0, {'a': 1}), (3, {'a': 2})], [(4, {'a': 3})], None]
+        work(function_mock, connection_mock, '--mq--', '--rq--', {'s': 0}, True)
+        self.assertEqual(function_mock.mock_calls, [
+            call(message_queue='--mq--', offset=0, result_queue='--rq--', a=1, s=0),
+            call(message_queue='--mq--', offset=3, result_queue='--rq--', a=2, s=0),
+            call(message_queue='--mq--', offset=4, result_queue='--rq--', a=3, s=0)])
+
+    def test__work_Should_ExecuteItemsWithPositionalArguments_When_NotUseKwargs(self, *patches):
+        function_mock = Mock()
+        connection_mock = Mock()
+        connection_mock.recv.side_effect = [[(1, {'a': 1})], EOFError()]
+        work(function_mock, connection_mock, '--mq--', '--rq--', {'s': 0}, False)
+        function_mock.assert_called_once_with({'a': 1}, {'s': 0}, message_queue='--mq--', offset=1, result_queue='--rq--')
+
+    @patch('mpcurses.pool.Process')
+    @patch('mpcurses.pool.Pipe')
+    def test__Worker_Should_StartProcessAndSubmitItems_When_Called(self, pipe_patch, process_patch, *patches):
+        receiver_mock = Mock()
+        sender_mock = Mock()
+        pipe_patch.return_value = (receiver_mock, sender_mock)
+        worker = Worker('--function--', '--mq--', '--rq--', {}, True)
+        process_patch.assert_called_once_with(target=work, args=('--function--', receiver_mock, '--mq--', '--rq--', {}, True))
+        self.assertEqual(worker.offsets, set())
+        worker.start()
+        process_patch.return_value.start.assert_called_once_with()
+        receiver_mock.close.assert_called_once_with()
+        worker.submit([(4, {'a': 1}), (5, {'a': 2})])
+        sender_mock.send.assert_called_once_with([(4, {'a': 1}), (5, {'a': 2})])
+        self.assertEqual(worker.offsets, {4, 5})
+
+    @patch('mpcurses.pool.Process')
+    @patch('mpcurses.pool.Pipe')
+    def test__Worker_Should_TerminateProcess_When_StopTimesOut(self, pipe_patch, process_patch, *patches):
+        sender_mock = Mock()
+        sender_mock.send.side_effect = BrokenPipeError()
+        pipe_patch.return_value = (Mock(), sender_mock)
+        process_patch.return_value.is_alive.return_value = True
+        worker = Worker('--function--', '--mq--', '--rq--', {}, True)
+        worker.stop(1)
+        process_patch.return_value.join.assert_called_once_with(1)
+        process_patch.return_value.terminate.assert_called_once_with()
+        sender_mock.close.assert_called_once_with()
+
+    @patch('mpcurses.pool.Process')
+    @patch('mpcurses.pool.Pipe')
+    def test__Worker_Should_NotTerminateProcess_When_ProcessExits(self, pipe_patch, process_patch, *patches):
+        pipe_patch.return_value = (Mock(), Mock())
+        process_patch.return_value.is_alive.return_value = False
+        worker = Worker('--function--', '--mq--', '--rq--', {}, True)
+        worker.stop()
+        process_patch.return_value.join.assert_called_once_with(3)
+        process_patch.return_value.terminate.assert_not_called()
+
+    @patch('mpcurses.pool.Process')
+    @patch('mpcurses.pool.Pipe')
+    def test__Worker_Should_SignalExitWithoutJoin_When_Retire(self, pipe_patch, process_patch, *patches):
+        sender_mock = Mock()
+        pipe_patch.return_value = (Mock(), sender_mock)
+        worker = Worker('--function--', '--mq--', '--rq--', {}, True)
+        worker.retire()
+        sender_mock.send.assert_called_once_with(None)
+        process_patch.return_value.join.assert_not_called()
@@ -0,0 +1,314 @@
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import curses
+import unittest
+import subprocess
+from threading import Thread
+from time import monotonic
+from mock import patch
+from mock import call
+from mock import Mock
+
+from mpcurses.renderer import FrameBuffer
+from mpcurses.renderer import CursesRenderer
+from mpcurses.renderer import RenderThread
+from mpcurses.renderer import NullRenderer
+from mpcurses.renderer import AnsiRenderer
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    def test__addstr_Should_UpdateCellsAndDirtyRows_When_Called(self, *patches):
+        frame_buffer = FrameBuffer(3, 10)
+        frame_buffer.addstr(1, 2, 'abc', 5)
+        self.assertEqual(frame_buffer.get_text(1), '  abc     ')
+        self.assertEqual(frame_buffer.attrs[1][2:5], [5, 5, 5])
+        self.assertEqual(frame_buffer.dirty, {1})
+
+    def test__addstr_Should_NotMarkDirty_When_CellsUnchanged(self, *patches):
+        frame_buffer = FrameBuffer(3, 10)
+        frame_buffer.addstr(1, 2, 'abc', 5)
+        frame_buffer.dirty.clear()
+        frame_buffer.addstr(1, 2, 'abc', 5)
+        self.assertEqual(frame_buffer.dirty, set())
+
+    def test__addstr_Should_WrapText_When_TextLongerThanRow(self, *patches):
+        frame_buffer = FrameBuffer(3, 4)
+        frame_buffer.addstr(0, 2, 'abcd')
+        self.assertEqual(frame_buffer.get_text(0), '  ab')
+        self.assertEqual(frame_buffer.get_text(1), 'cd  ')
+
+    def test__addstr_Should_RaiseError_When_PositionOutsideScreen(self, *patches):
+        frame_buffer = FrameBuffer(3, 4)
+        with self.assertRaises(curses.error):
+            frame_buffer.addstr(3, 0, 'a')
+        with self.assertRaises(curses.error):
+            frame_buffer.addstr(2, 2, 'abcd')
+
+    def test__clrtoeol_Should_ClearToEndOfLine_When_Called(self, *patches):
+        frame_buffer = FrameBuffer(3, 6)
+        frame_buffer.addstr(0, 0, 'abcdef', 2)
+        frame_buffer.move(0, 2)
+        frame_buffer.clrtoeol()
+        self.assertEqual(frame_buffer.get_text(0), 'ab    ')
+        self.assertEqual(frame_buffer.attrs[0], [2, 2, 0, 0, 0, 0])
+
+    def test__get_changes_Should_ReturnRunsOfChangedCells_When_Called(self, *patches):
+        frame_buffer = FrameBuffer(2, 8)
+        front_chars = [[' '] * 8 for _ in range(2)]
+        front_attrs = [[0] * 8 for _ in range(2)]
+        frame_buffer.addstr(0, 0, 'abcdef', 1)
+        frame_buffer.addstr(0, 3, 'x', 2)
+        result = frame_buffer.get_changes(front_chars, front_attrs)
+        self.assertEqual(result, [(0, 0, 'abc', 1), (0, 3, 'x', 2), (0, 4, 'ef', 1)])
+        self.assertEqual(''.join(front_chars[0]), 'abcxef  ')
+        self.assertEqual(frame_buffer.dirty, set())
+        frame_buffer.addstr(0, 0, 'abd', 1)
+        result = frame_buffer.get_changes(front_chars, front_attrs)
+        self.assertEqual(result, [(0, 2, 'd', 1)])
+
+    def test__flush_Should_WriteOnlyChangedCells_When_Called(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        renderer = CursesRenderer(window_mock)
+        renderer.addstr(1, 0, 'value', 3)
+        renderer.move(1, 0)
+        renderer.clrtoeol()
+        renderer.addstr(1, 0, 'value', 3)
+        renderer.noutrefresh()
+        renderer.addstr(1, 0, 'value', 3)
+        renderer.refresh()
+        self.assertEqual(window_mock.addstr.mock_calls, [call(1, 0, 'value', 3)])
+        window_mock.noutrefresh.assert_called_once_with()
+        window_mock.refresh.assert_called_once_with()
+
+    def test__flush_Should_IgnoreError_When_WritingLastCell(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (2, 2)
+        window_mock.addstr.side_effect = curses.error('error')
+        renderer = CursesRenderer(window_mock)
+        renderer.addstr(1, 1, 'x')
+        renderer.flush()
+        window_mock.addstr.assert_called_once_with(1, 1, 'x', 0)
+
+    def test__getattr_Should_DelegateToWindow_When_NotModeled(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (2, 2)
+        renderer = CursesRenderer(window_mock)
+        renderer.nodelay(True)
+        window_mock.nodelay.assert_called_once_with(True)
+        self.assertEqual(renderer.getch(), window_mock.getch.return_value)
+
+    def test__refresh_Should_NotWriteWindow_When_Deferred(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        renderer = CursesRenderer(window_mock)
+        renderer.deferred = True
+        renderer.addstr(1, 0, 'value')
+        renderer.refresh()
+        renderer.noutrefresh()
+        window_mock.addstr.assert_not_called()
+        window_mock.refresh.assert_not_called()
+        window_mock.noutrefresh.assert_not_called()
+        self.assertEqual(renderer.dirty, {1})
+
+    @patch('mpcurses.renderer.os.write')
+    @patch('mpcurses.renderer.curses.doupdate')
+    def test__paint_Should_WriteChangesToWindowAndTerminal_When_Called(self, doupdate_patch, write_patch, *patches):
+        write_patch.side_effect = lambda fd, data: len(data)
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        renderer = CursesRenderer(window_mock)
+        renderer.addstr(1, 0, 'value', 237 << 8)
+        render_thread = RenderThread(renderer, .1, fd=5)
+        render_thread.paint()
+        render_thread.paint()
+        window_mock.addstr.assert_called_once_with(1, 0, 'value', 237 << 8)
+        write_patch.assert_called_once_with(5, b'\x1b[2;1H\x1b[0;38;5;15;48;5;160mvalue\x1b[0m')
+        window_mock.noutrefresh.assert_not_called()
+        doupdate_patch.assert_not_called()
+
+    def test__paint_Should_NotStallWriter_When_TerminalBlocks(self, *patches):
+        read_fd, write_fd = os.pipe()
+        # fill the pipe so writing the frame blocks until the reader drains it
+        os.set_blocking(write_fd, False)
+        try:
+            while True:
+                os.write(write_fd, b'x' * 4096)
+        except BlockingIOError:
+            pass
+        os.set_blocking(write_fd, True)
+        reader = subprocess.Popen(['sh', '-c', 'sleep 2; cat > /dev/null'], stdin=read_fd)
+        os.close(read_fd)
+        try:
+            window_mock = Mock()
+            window_mock.getmaxyx.return_value = (3, 10)
+            renderer = CursesRenderer(window_mock)
+            renderer.addstr(0, 0, 'value')
+            painter = Thread(target=RenderThread(renderer, 60, fd=write_fd).paint)
+            painter.start()
+            start = monotonic()
+            for index in range(20000):
+                renderer.addstr(1, 0, str(index))
+            elapsed = monotonic() - start
+            self.assertTrue(painter.is_alive())
+            self.assertLess(elapsed, 1)
+            painter.join()
+        finally:
+            os.close(write_fd)
+            reader.wait()
+
+    @patch('mpcurses.renderer.curses.doupdate')
+    def test__stop_Should_PaintFinalFrameAndUndefer_When_Called(self, doupdate_patch, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        renderer = CursesRenderer(window_mock)
+        render_thread = RenderThread(renderer, 60)
+        render_thread.start()
+        self.assertTrue(renderer.deferred)
+        renderer.addstr(2, 0, 'final')
+        render_thread.stop()
+        self.assertFalse(render_thread.is_alive())
+        self.assertFalse(renderer.deferred)
+        self.assertEqual(window_mock.leaveok.mock_calls, [call(True), call(False)])
+        window_mock.addstr.assert_called_once_with(2, 0, 'final', 0)
+        window_mock.touchwin.assert_called_once_with()
+        window_mock.clearok.assert_called_once_with(True)
+        window_mock.noutrefresh.assert_called_once_with()
+        doupdate_patch.assert_called_once_with()
+
+    def test__NullRenderer_Should_KeepScreenInMemory_When_Refreshed(self, *patches):
+        renderer = NullRenderer(3, 8)
+        renderer.addstr(1, 1, 'value', renderer.color_pair(4))
+        renderer.noutrefresh()
+        renderer.refresh()
+        self.assertEqual(renderer.dirty, set())
+        self.assertEqual(renderer.get_lines(), ['', ' value', ''])
+        self.assertEqual(renderer.attrs[1][1], 4)
+        self.assertEqual(renderer.getch(), ord('q'))
+        self.assertEqual(NullRenderer().getmaxyx(), (NullRenderer.HEIGHT, NullRenderer.WIDTH))
+
+    def test__NullRenderer_Should_NotWaitForKey_When_NoDelay(self, *patches):
+        renderer = NullRenderer(3, 8)
+        renderer.nodelay(True)
+        self.assertEqual(renderer.getch(), -1)
+        renderer.nodelay(False)
+        self.assertEqual(renderer.getch(), ord('q'))
+
+    def test__getch_Should_ReturnQueuedKeys_When_Deferred(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        renderer = CursesRenderer(window_mock)
+        renderer.nodelay(True)
+        self.assertTrue(renderer.no_delay)
+        window_mock.nodelay.assert_called_once_with(True)
+        renderer.deferred = True
+        renderer.keys.append(ord('j'))
+        renderer.addstr(0, 0, 'value')
+        self.assertEqual(renderer.getch(), ord('j'))
+        self.assertEqual(renderer.getch(), -1)
+        window_mock.getch.assert_not_called()
+        window_mock.addstr.assert_not_called()
+
+    def test__read_keys_Should_QueueKeysWithoutRefresh_When_Called(self, *patches):
+        window_mock = Mock()
+        window_mock.getmaxyx.return_value = (3, 10)
+        window_mock.getch.side_effect = [ord('j'), ord('k'), -1]
+        renderer = CursesRenderer(window_mock)
+        RenderThread(renderer, 60, fd=5).read_keys()
+        window_mock.untouchwin.assert_called_once_with()
+        self.assertEqual(list(renderer.keys), [ord('j'), ord('k')])
+
+    def test__get_sgr_Should_ReturnExpected_When_Called(self, *patches):
+        renderer = AnsiRenderer(fd=1, height=2, width=2)
+        self.assertEqual(renderer.get_sgr(0), '\x1b[0m')
+        self.assertEqual(renderer.get_sgr(14), '\x1b[0;38;5;14m')
+        self.assertEqual(renderer.get_sgr(237), '\x1b[0;38;5;15;48;5;160m')
+        self.assertEqual(renderer.sgr[237], '\x1b[0;38;5;15;48;5;160m')
+
+    def test__get_frame_Should_ReturnMinimalSequences_When_Called(self, *patches):
+        renderer = AnsiRenderer(fd=1, height=3, width=20)
+        renderer.addstr(1, 0, 'ab', 14)
+        renderer.addstr(1, 5, 'cd', 14)
+        renderer.addstr(1, 7, 'e', 237)
+        renderer.addstr(2, 3, 'f', 14)
+        result = renderer.get_frame()
+        expected = '\x1b[2;1H\x1b[0;38;5;14mab\x1b[3Ccd\x1b[0;38;5;15;48;5;160me\x1b[3;4H\x1b[0;38;5;14mf'
+        self.assertEqual(result, expected)
+        self.assertEqual(renderer.get_frame(), '')
+
+    @patch('mpcurses.renderer.os.write')
+    def test__refresh_Should_WriteFrameOnce_When_Changes(self, write_patch, *patches):
+        write_patch.side_effect = lambda fd, data: len(data)
+        renderer = AnsiRenderer(fd=5, height=3, width=20)
+        renderer.addstr(0, 0, 'ab', 0)
+        renderer.addstr(2, 0, 'cd', 0)
+        renderer.noutrefresh()
+        write_patch.assert_not_called()
+        renderer.refresh()
+        renderer.refresh()
+        write_patch.assert_called_once_with(5, b'\x1b[1;1H\x1b[0mab\x1b[3;1Hcd')
+
+    @patch('mpcurses.renderer.os.write')
+    def test__write_Should_WriteRemainder_When_PartialWrite(self, write_patch, *patches):
+        write_patch.side_effect = [2, 2]
+        renderer = AnsiRenderer(fd=5, height=1, width=1)
+        renderer.write('abcd')
+        self.assertEqual(write_patch.mock_calls, [call(5, b'abcd'), call(5, b'cd')])
+
+    @patch('mpcurses.renderer.sys.stdin')
+    @patch('mpcurses.renderer.os.write')
+    def test__AnsiRenderer_Should_SwitchScreens_When_UsedAsContextManager(self, write_patch, stdin_patch, *patches):
+        write_patch.side_effect = lambda fd, data: len(data)
+        stdin_patch.isatty.return_value = False
+        with AnsiRenderer(fd=5, height=1, width=1) as renderer:
+            self.assertEqual(renderer.getch(), ord('q'))
+        self.assertEqual(write_patch.mock_calls, [
+            call(5, b'\x1b[?1049h\x1b[0m\x1b[2J\x1b[?25l'),
+            call(5, b'\x1b[0m\x1b[?25h\x1b[?1049l')])
+
+    @patch('mpcurses.renderer.select.select', return_value=([], [], []))
+    @patch('mpcurses.renderer.os.read')
+    @patch('mpcurses.renderer.os.write')
+    def test__getch_Should_NotWaitForKey_When_NoDelay(self, write_patch, read_patch, select_patch, *patches):
+        renderer = AnsiRenderer(fd=5, height=1, width=1)
+        renderer.nodelay(True)
+        self.assertEqual(renderer.getch(), -1)
+        renderer.input_fd = 0
+        self.assertEqual(renderer.getch(), -1)
+        select_patch.assert_called_once_with([0], [], [], 0)
+        read_patch.assert_not_called()
+
+    @patch('mpcurses.renderer.os.read', return_value=b'q')
+    @patch('mpcurses.renderer.os.write')
+    def test__getch_Should_ReadTerminal_When_Input(self, write_patch, read_patch, *patches):
+        renderer = AnsiRenderer(fd=5, height=1, width=1)
+        renderer.input_fd = 0
+        self.assertEqual(renderer.getch(), ord('q'))
+        read_patch.assert_called_once_with(0, 1)
@@ -0,0 +1,68 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from mock import patch
+from mock import Mock
+
+from mpcurses.retry import get_backoff
+from mpcurses.retry import Retryable
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestRetry(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    @patch('mpcurses.retry.random.uniform', side_effect=lambda low, high: high)
+    def test__get_backoff_Should_GrowExponentiallyUpToMaxBackoff_When_Called(self, uniform_patch, *patches):
+        self.assertEqual(get_backoff(1, backoff=1, multiplier=2, max_backoff=10, jitter=.5), 1.5)
+        self.assertEqual(get_backoff(3, backoff=1, multiplier=2, max_backoff=10, jitter=.5), 6.0)
+        self.assertEqual(get_backoff(5, backoff=1, multiplier=2, max_backoff=10, jitter=.5), 15.0)
+        uniform_patch.assert_called_with(.5, 1.5)
+
+    def test__get_backoff_Should_ReturnDelay_When_NoJitter(self, *patches):
+        self.assertEqual(get_backoff(2, backoff=.5, multiplier=3, max_backoff=60, jitter=0), 1.5)
+
+    def test__Retryable_Should_ReturnResult_When_NoException(self, *patches):
+        function_mock = Mock(__name__='mockfunc', return_value='result')
+        retryable = Retryable(function_mock, (ValueError,))
+        self.assertEqual(retryable.__name__, 'mockfunc')
+        self.assertEqual(retryable('data', key='value'), 'result')
+        function_mock.assert_called_once_with('data', key='value')
+
+    @patch('mpcurses.retry.logger')
+    def test__Retryable_Should_SendRetry_When_RetryException(self, logger_patch, *patches):
+        retryable = Retryable(Mock(__name__='mockfunc', side_effect=ValueError('flaky')), (ValueError,))
+        with self.assertRaises(ValueError):
+            retryable()
+        logger_patch.debug.assert_called_once_with('RETRY')
+
+    @patch('mpcurses.retry.logger')
+    def test__Retryable_Should_NotSendRetry_When_OtherException(self, logger_patch, *patches):
+        retryable = Retryable(Mock(__name__='mockfunc', side_effect=KeyError('broken')), (ValueError,))
+        with self.assertRaises(KeyError):
+            retryable()
+        logger_patch.debug.assert_not_called()
@@ -18,6 +18,8 @@ from mock import patch
 from mock import call
 from mock import Mock
 from mock import MagicMock
+from mock import mock_open
+from mock import ANY
 
 from mpcurses.screen import initialize_colors
 from mpcurses.screen import initialize_counter
@@ -25,10 +27,19 @@ from mpcurses.screen import initialize_keep_count
 from mpcurses.screen import update_screen_status
 from mpcurses.screen import initialize_screen
 from mpcurses.screen import initialize_screen_offsets
+from mpcurses.screen import extend_screen_offsets
 from mpcurses.screen import finalize_screen
 from mpcurses.screen import get_category_values
+from mpcurses.screen import compile_screen_layout
+from mpcurses.screen import get_screen_plan
+from mpcurses.screen import has_top_level_alternation
+from mpcurses.screen import get_literal_prefix
+from mpcurses.screen import get_category_matchers
+from mpcurses.screen import get_category_position
 from mpcurses.screen import sanitize_message
 from mpcurses.screen import update_screen
+from mpcurses.screen import write_screen
+from mpcurses.screen import flush_screen
 from mpcurses.screen import echo_to_screen
 from mpcurses.screen import refresh_screen
 from mpcurses.screen import get_position
@@ -36,6 +47,7 @@ from mpcurses.screen import process_clear
 from mpcurses.screen import process_counter
 from mpcurses.screen import get_category_color
 from mpcurses.screen import get_category_count
+from mpcurses.screen import compile_category
 from mpcurses.screen import get_category_x_pos
 from mpcurses.screen import get_category_y_pos
 from mpcurses.screen import initialize_text
@@ -47,7 +59,26 @@ from mpcurses.screen import set_screen_defaults
 from mpcurses.screen import set_screen_defaults_processes
 from mpcurses.screen import validate_screen_layout_processes
 from mpcurses.screen import validate_screen_size
-from mpcurses.screen import blink
+from mpcurses.screen import get_color_pair
+from mpcurses.screen import initialize_viewport
+from mpcurses.screen import write_viewport
+from mpcurses.screen import clear_viewport
+from mpcurses.screen import scroll_viewport
+from mpcurses.screen import get_scroll_delta
+from mpcurses.screen import follow_viewport
+from mpcurses.screen import scroll_screen
+from mpcurses.screen import get_row_segments
+from mpcurses.screen import initialize_slots
+from mpcurses.screen import get_slot_cells
+from mpcurses.screen import get_slot
+from mpcurses.screen import release_slot
+from mpcurses.screen import initialize_list
+from mpcurses.screen import write_list
+from mpcurses.screen import close_lists
+from mpcurses.screen import draw_lists
+from mpcurses.screen import count_counter
+from mpcurses.screen import draw_counters
+from mpcurses.renderer import NullRenderer
 
 import sys
 import logging
@@ -271,6 +302,32 @@ class TestScreen(unittest.TestCase):
         self.assertTrue(call1 in screen_mock.addstr.mock_calls)
         self.assertTrue(call2 in screen_mock.addstr.mock_calls)
         self.assertTrue(call3 in screen_mock.addstr.mock_calls)
+        screen_mock.noutrefresh.assert_called_once_with()
+        screen_mock.refresh.assert_not_called()
+
+    @patch('mpcurses.screen.curses.color_pair')
+    def test__update_screen_status_Should_ShowTarget_When_Target(self, color_pair_patch, *patches):
+        screen_mock = Mock()
+        screen_mock.getmaxyx.return_value = (100, 200)
+        config_mock = {
+            'color': 0,
+            'show_process_status': True,
+            'zfill': 2
+        }
+        update_screen_status(screen_mock, 'process-update', config_mock, running=3, queued=5, completed=2, target=4)
+        self.assertTrue(call(96, 1, '  Running: 03 of 04', color_pair_patch.return_value) in screen_mock.addstr.mock_calls)
+
+    @patch('mpcurses.screen.curses.color_pair')
+    def test__update_screen_status_Should_ShowFinish_When_Finish(self, color_pair_patch, *patches):
+        screen_mock = Mock()
+        screen_mock.getmaxyx.return_value = (100, 200)
+        config_mock = {
+            'color': 0,
+            'show_process_status': True,
+            'zfill': 2
+        }
+        update_screen_status(screen_mock, 'process-update', config_mock, running=3, queued=5, completed=2, finish='12:00:08')
+        self.assertTrue(call(98, 1, 'Completed: 02   Finish: 12:00:08', color_pair_patch.return_value) in screen_mock.addstr.mock_calls)
 
     @patch('mpcurses.screen.curses.color_pair')
     def test__update_screen_status_Should_CallExpected_When_GetProcessDataWithData(self, color_pair_patch, *patches):
@@ -323,8 +380,57 @@ class TestScreen(unittest.TestCase):
         initialize_screen_offsets(screen_mock, screen_layout_mock, 100, 10)
         set_screen_defaults_processes_patch.assert_called_once_with(100, 10, screen_layout_mock)
         validate_screen_layout_processes_patch.assert_called_once_with(100, screen_layout_mock)
+        self.assertIn('_plan', screen_layout_mock['_screen'])
         update_screen_status_patch.assert_called_once_with(screen_mock, 'process-update', screen_layout_mock['_screen'])
 
+    @patch('mpcurses.screen.update_screen_status')
+    @patch('mpcurses.screen.validate_screen_layout_processes')
+    def test__initialize_screen_offsets_Should_SetStreamingDefaults_When_Streaming(self, validate_screen_layout_processes_patch, *patches):
+        screen_layout = {'_screen': {}}
+        initialize_screen_offsets(Mock(), screen_layout, 0, 4, streaming=True)
+        self.assertEqual(screen_layout['_screen']['zfill'], 5)
+        self.assertTrue(screen_layout['_screen']['show_process_status'])
+        validate_screen_layout_processes_patch.assert_not_called()
+
+    @patch('mpcurses.screen.update_screen_status')
+    @patch('mpcurses.screen.initialize_slots')
+    def test__initialize_screen_offsets_Should_InitializeProcessesToStartSlots_When_StreamingSlots(self, initialize_slots_patch, *patches):
+        screen_layout = {'_screen': {'slots': True, 'zfill': 2}}
+        initialize_screen_offsets(Mock(), screen_layout, 0, 4, streaming=True)
+        initialize_slots_patch.assert_called_once_with(ANY, screen_layout, 4)
+        self.assertEqual(screen_layout['_screen']['zfill'], 2)
+
+    @patch('mpcurses.screen.initialize_text')
+    def test__extend_screen_offsets_Should_InitializeAddedOffsets_When_Called(self, initialize_text_patch, *patches):
+        screen_mock = Mock()
+        screen_layout = {
+            '_screen': {'_viewport': {'bottom': 4}},
+            'table': {'virtual': True},
+            '_counter_': {'position': (1, 10), 'categories': ['name']},
+            'name': {'position': (1, 0), 'table': True, 'text': 'Name:', 'keep_count': True},
+            'title': {'position': (0, 0), 'text': 'Title'}
+        }
+        extend_screen_offsets(screen_mock, screen_layout, 2, 5)
+        self.assertEqual(screen_layout['_screen']['_viewport']['bottom'], 7)
+        self.assertEqual(screen_layout['_counter_'][4], {'_count': 0})
+        self.assertFalse(1 in screen_layout['_counter_'])
+        self.assertEqual(screen_layout['name'][2], {'_count': 0})
+        initialize_text_patch.assert_called_once_with(5, 'name', screen_layout, screen_mock, start=2)
+
+    def test__extend_screen_offsets_Should_RaiseException_When_TableTooSmall(self, *patches):
+        screen_layout = {
+            '_screen': {},
+            'table': {'rows': 2, 'cols': 2}
+        }
+        with self.assertRaises(Exception):
+            extend_screen_offsets(Mock(), screen_layout, 3, 5)
+
+    @patch('mpcurses.screen.initialize_counter')
+    def test__extend_screen_offsets_Should_DoNothing_When_Slots(self, initialize_counter_patch, *patches):
+        screen_layout = {'_screen': {'slots': True}, '_counter_': {}}
+        extend_screen_offsets(Mock(), screen_layout, 3, 5)
+        initialize_counter_patch.assert_not_called()
+
     @patch('mpcurses.screen.update_screen_status')
     @patch('mpcurses.screen.validate_screen_layout_processes')
     @patch('mpcurses.screen.set_screen_defaults_processes')
@@ -356,6 +462,7 @@ class TestScreen(unittest.TestCase):
         initialize_screen_offsets(screen_mock, screen_layout_mock, 1, 1)
         initialize_text_patch.assert_called_once_with(1, 'category_with_text', screen_layout_mock, screen_mock)
 
+    @patch('mpcurses.screen.initialize_list')
     @patch('mpcurses.screen.update_screen_status')
     @patch('mpcurses.screen.validate_screen_layout_processes')
     @patch('mpcurses.screen.set_screen_defaults_processes')
@@ -371,6 +478,19 @@ class TestScreen(unittest.TestCase):
         initialize_screen_offsets(screen_mock, screen_layout_mock, 1, 1)
         self.assertTrue(screen_layout_mock['category_with_list']['keep_count'])
 
+    @patch('mpcurses.screen.update_screen_status')
+    @patch('mpcurses.screen.validate_screen_layout_processes')
+    @patch('mpcurses.screen.set_screen_defaults_processes')
+    def test__initialize_screen_offsets_Should_InitializePending_When_Coalesce(self, *patches):
+        screen_mock = Mock()
+        screen_layout_mock = {
+            '_screen': {
+                'coalesce': True
+            }
+        }
+        initialize_screen_offsets(screen_mock, screen_layout_mock, 1, 1)
+        self.assertEqual(screen_layout_mock['_screen']['_pending'], {})
+
     @patch('mpcurses.screen.update_screen_status')
     @patch('mpcurses.screen.validate_screen_layout_processes')
     @patch('mpcurses.screen.set_screen_defaults_processes')
@@ -506,6 +626,170 @@ class TestScreen(unittest.TestCase):
         ]
         self.assertEqual(result, expected_result)
 
+    def test__compile_screen_layout_Should_ReturnExpected_When_Called(self, *patches):
+        screen_layout = {
+            '_screen': {
+                'title': 'mpcurses'
+            },
+            'items': {
+                'position': (6, 35),
+                'list': True,
+                'keep_count': True,
+                'color': 1,
+                'effects': [{'regex': '.*error.*', 'color': 3}],
+                'regex': r'^processing item "(?P<value>.*)"$'
+            },
+            'header': {
+                'position': (1, 1),
+                'text': 'Items'
+            }
+        }
+        result = compile_screen_layout(screen_layout)
+        self.assertEqual(list(result.categories), ['items', 'header'])
+        self.assertEqual([category_plan.category for category_plan in result.matchers], ['items'])
+        items = result.categories['items']
+        self.assertTrue(items.list)
+        self.assertTrue(items.keep_count)
+        self.assertTrue(items.has_value_group)
+        self.assertEqual(items.length, 103)
+        self.assertEqual(items.zfill, 3)
+        self.assertEqual(items.effects[0][1], 3)
+        self.assertIsNone(result.categories['header'].regex)
+
+    @patch('mpcurses.screen.compile_screen_layout')
+    def test__get_screen_plan_Should_ReturnCompiledPlan_When_PlanInitialized(self, compile_screen_layout_patch, *patches):
+        plan_mock = Mock()
+        result = get_screen_plan({'_screen': {'_plan': plan_mock}})
+        self.assertEqual(result, plan_mock)
+        compile_screen_layout_patch.assert_not_called()
+
+    @patch('mpcurses.screen.compile_screen_layout')
+    def test__get_screen_plan_Should_CompileLayout_When_PlanNotInitialized(self, compile_screen_layout_patch, *patches):
+        screen_layout = {'_screen': {}}
+        result = get_screen_plan(screen_layout)
+        self.assertEqual(result, compile_screen_layout_patch.return_value)
+        result = get_screen_plan(screen_layout)
+        self.assertEqual(result, compile_screen_layout_patch.return_value)
+        compile_screen_layout_patch.assert_called_once_with(screen_layout)
+        self.assertEqual(screen_layout['_screen']['_plan'], compile_screen_layout_patch.return_value)
+
+    def test__compile_screen_layout_Should_ReturnReadOnlyMappings_When_Called(self, *patches):
+        result = compile_screen_layout({'items': {'regex': '^item '}})
+        with self.assertRaises(TypeError):
+            result.categories['other'] = None
+        with self.assertRaises(TypeError):
+            result.tokens['other'] = ()
+
+    def test__compile_screen_layout_Should_DefaultEffectColorToCategoryColor_When_EffectHasNoColor(self, *patches):
+        result = compile_screen_layout({'items': {'color': 4, 'effects': [{'regex': '.*error.*'}]}})
+        self.assertEqual(result.categories['items'].effects[0][1], 4)
+
+    def test__has_top_level_alternation_Should_ReturnExpected_When_Called(self, *patches):
+        self.assertTrue(has_top_level_alternation(r'^worker \d+|^item$'))
+        self.assertFalse(has_top_level_alternation(r'^worker (?P<value>done|error)$'))
+        self.assertFalse(has_top_level_alternation(r'^worker [|]$'))
+        self.assertFalse(has_top_level_alternation(r'^worker \|$'))
+
+    def test__get_literal_prefix_Should_ReturnExpected_When_Called(self, *patches):
+        self.assertEqual(get_literal_prefix(r'^processing item "(?P<value>.*)"$'), 'processing item "')
+        self.assertEqual(get_literal_prefix(r'worker \d+'), 'worker ')
+        self.assertEqual(get_literal_prefix(r'^\#\d+'), '#')
+        self.assertEqual(get_literal_prefix(r'^a\.b c'), 'a.b c')
+        self.assertEqual(get_literal_prefix(r'^workers? .*'), 'worker')
+        self.assertEqual(get_literal_prefix(r'^ab+c'), 'ab')
+        self.assertEqual(get_literal_prefix(r'^\d* is prime$'), '')
+        self.assertEqual(get_literal_prefix(r'^(?P<value>.*)$'), '')
+        self.assertEqual(get_literal_prefix(r'^abc|^xyz'), '')
+        self.assertEqual(get_literal_prefix(r'^'), '')
+
+    def test__get_category_matchers_Should_ReturnMatchersInLayoutOrder_When_Called(self, *patches):
+        screen_layout = {
+            'number': {
+                'regex': r'^checking number (?P<value>\d+)$'
+            },
+            'prime': {
+                'regex': r'^\d* is prime$'
+            },
+            'upper': {
+                'regex': r'^checking primes between \d+(?P<value>/\d+)$'
+            },
+            'worker': {
+                'regex': r'^worker (?P<value>\d+)$'
+            },
+            'check': {
+                'regex': r'^check'
+            }
+        }
+        plan = compile_screen_layout(screen_layout)
+        result = get_category_matchers(plan, 'checking number 12')
+        self.assertEqual([category_plan.category for category_plan in result], ['number', 'prime', 'upper', 'check'])
+        result = get_category_matchers(plan, 'worker 12')
+        self.assertEqual([category_plan.category for category_plan in result], ['prime', 'worker'])
+        result = get_category_matchers(plan, 'checked 12')
+        self.assertEqual([category_plan.category for category_plan in result], ['prime', 'check'])
+        result = get_category_matchers(plan, '12 is prime')
+        self.assertEqual([category_plan.category for category_plan in result], ['prime'])
+        result = get_category_matchers(plan, '')
+        self.assertEqual([category_plan.category for category_plan in result], ['prime'])
+
+    def test__compile_screen_layout_Should_PrecomputePositions_When_Offsets(self, *patches):
+        screen_layout = {
+            'table': {
+                'rows': 2,
+                'cols': 2,
+                'width': 20
+            },
+            'status': {
+                'position': (3, 1),
+                'text': 'Status: ',
+                'table': True,
+                'regex': '^status (?P<value>.*)$'
+            },
+            'items': {
+                'position': (10, 4),
+                'list': True,
+                'regex': '^item (?P<value>.*)$'
+            },
+            'total': {
+                'position': (12, 4),
+                'text': 'Total:',
+                'regex': '^total (?P<value>.*)$'
+            },
+            '_counter_': {
+                'position': (3, 30),
+                'categories': ['status']
+            }
+        }
+        result = compile_screen_layout(screen_layout, offsets=3)
+        self.assertEqual(result.categories['status'].positions, ((3, 9), (4, 9), (3, 29)))
+        self.assertIsNone(result.categories['status'].position)
+        self.assertEqual(result.categories['items'].position, (10, 4))
+        self.assertEqual(result.categories['total'].position, (12, 11))
+        self.assertIsNone(result.categories['_counter_'].position)
+        self.assertEqual(result.categories['_counter_'].positions, ())
+
+    def test__get_category_position_Should_ReturnExpected_When_Called(self, *patches):
+        screen_layout = {
+            'status': {
+                'position': (3, 1),
+                'table': True
+            },
+            'items': {
+                'position': (10, 4),
+                'list': True,
+                '_count': 2
+            },
+            'total': {
+                'position': (12, 4)
+            }
+        }
+        plan = compile_screen_layout(screen_layout, offsets=2)
+        self.assertEqual(get_category_position(plan.categories['status'], 1, screen_layout), (4, 1))
+        # offset beyond the precomputed positions falls back to computing the position
+        self.assertEqual(get_category_position(plan.categories['status'], 5, screen_layout), (8, 1))
+        self.assertEqual(get_category_position(plan.categories['items'], 0, screen_layout), (12, 4))
+        self.assertEqual(get_category_position(plan.categories['total'], 1, screen_layout), (12, 4))
+
     def test__sanitize_message_Should_ReturnExepcted_When_NoMatchForProcessNumber(self, *patches):
         message = 'INFO: this is an informational log message'
         offset, sanitized_message = sanitize_message(message)
@@ -813,6 +1097,18 @@ class TestScreen(unittest.TestCase):
         expected_result = '00022'
         self.assertEqual(result, expected_result)
 
+    def test__get_category_count_Should_UseCategoryPlan_When_CategoryPlan(self, *patches):
+        screen_layout = {
+            'translated': {
+                '_count': 21
+            }
+        }
+        category_plan = compile_category('translated', {'table': True, 'zfill': 2})
+        screen_layout['translated'][3] = {'_count': 4}
+        result = get_category_count('translated', 3, screen_layout, category_plan=category_plan)
+        self.assertEqual(result, '05')
+        self.assertEqual(screen_layout['translated']['_count'], 21)
+
     @patch('mpcurses.screen.get_position')
     def test__get_category_x_pos_Should_ReturnExpected_When_NoTableText(self, get_position_patch, *patches):
         get_position_patch.return_value = 6
@@ -1108,6 +1404,159 @@ class TestScreen(unittest.TestCase):
         color_pair_patch.assert_called_once_with(241)
         process_counter_patch.assert_called_once_with(3, 'translated', '033', screen_layout_mock, screen_mock)
 
+    @patch('mpcurses.screen.curses.color_pair')
+    @patch('mpcurses.screen.process_clear')
+    def test__write_screen_Should_WriteImmediately_When_NotCoalescing(self, process_clear_patch, color_pair_patch, *patches):
+        screen_mock = Mock()
+        screen_layout = {'_screen': {}}
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value', 2, clear=True)
+        process_clear_patch.assert_called_once_with('item', 3, 4, screen_layout, screen_mock)
+        screen_mock.addstr.assert_called_once_with(3, 4, 'value', color_pair_patch.return_value)
+        color_pair_patch.assert_called_once_with(2)
+
+    def test__write_screen_Should_KeepLatestWrite_When_Coalescing(self, *patches):
+        screen_mock = Mock()
+        screen_layout = {'_screen': {'_pending': {}}}
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value1', 2, clear=True)
+        write_screen(screen_mock, screen_layout, 'other', 4, 20, 'other', 1)
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value2', 5, clear=True)
+        screen_mock.addstr.assert_not_called()
+        expected_pending = {
+            3: [('item', 3, 4, 'value2', 5, True)],
+            4: [('other', 4, 20, 'other', 1, False)]
+        }
+        self.assertEqual(screen_layout['_screen']['_pending'], expected_pending)
+
+    def test__write_screen_Should_KeepBothWrites_When_CoalescingAfterOtherWriteToRow(self, *patches):
+        screen_mock = Mock()
+        screen_layout = {'_screen': {'_pending': {}}}
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value1', 2, clear=True)
+        write_screen(screen_mock, screen_layout, 'other', 3, 20, 'other', 1)
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value2', 5, clear=True)
+        self.assertEqual(screen_layout['_screen']['_pending'], {
+            3: [
+                ('item', 3, 4, 'value1', 2, True),
+                ('other', 3, 20, 'other', 1, False),
+                ('item', 3, 4, 'value2', 5, True)
+            ]
+        })
+
+    def test__write_screen_Should_MergePrevious_When_CoalescingShorterValueWithoutClear(self, *patches):
+        screen_mock = Mock()
+        screen_layout = {'_screen': {'_pending': {}}}
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'value1', 2)
+        write_screen(screen_mock, screen_layout, 'item', 3, 4, 'v2', 2)
+        screen_mock.addstr.assert_not_called()
+        expected_pending = {3: [('item', 3, 4, 'v2', 2, False), ('item', 3, 6, 'lue1', 2, False)]}
+        self.assertEqual(screen_layout['_screen']['_pending'], expected_pending)
+
+    @patch('mpcurses.screen.curses.color_pair', side_effect=lambda color: color)
+    def test__write_screen_Should_MatchDirectWrites_When_CoalescingShorterValueInOtherColor(self, *patches):
+
+        def get_cells(screen_layout, writes):
+            cells = {}
+
+            def addstr(y_pos, x_pos, value, color):
+                for index, char in enumerate(value):
+                    cells[x_pos + index] = (char, color)
+
+            screen_mock = Mock()
+            screen_mock.addstr.side_effect = addstr
+            for x_pos, value, color in writes:
+                write_screen(screen_mock, screen_layout, 'item', 3, x_pos, value, color)
+            flush_screen(screen_mock, screen_layout)
+            return cells
+
+        writes = [(0, 'item ababxb', 3), (0, 'item b', 6)]
+        self.assertEqual(get_cells({'item': {}}, writes), get_cells({'item': {}, '_screen': {'_pending': {}}}, writes))
+
+    @patch('mpcurses.screen.curses.color_pair', side_effect=lambda color: color)
+    def test__write_screen_Should_MatchDirectWrites_When_CoalescingOverlappingWritesWithClear(self, *patches):
+
+        def get_cells(screen_layout, writes):
+            cells = {}
+            cursor = []
+
+            def addstr(y_pos, x_pos, value, color):
+                for index, char in enumerate(value):
+                    cells[x_pos + index] = (char, color)
+
+            def clrtoeol():
+                for x_pos in [x_pos for x_pos in cells if x_pos >= cursor[-1]]:
+                    del cells[x_pos]
+
+            screen_mock = Mock()
+            screen_mock.addstr.side_effect = addstr
+            screen_mock.move.side_effect = lambda y_pos, x_pos: cursor.append(x_pos)
+            screen_mock.clrtoeol.side_effect = clrtoeol
+            for category, x_pos, value, color, clear in writes:
+                write_screen(screen_mock, screen_layout, category, 0, x_pos, value, color, clear=clear)
+            flush_screen(screen_mock, screen_layout)
+            return cells
+
+        writes = [('a', 0, 'aaaa', 1, True), ('b', 2, 'bb', 2, False), ('a', 0, 'c', 3, False)]
+        screen_layout = {'a': {'clear': True}, 'b': {}}
+        self.assertEqual(get_cells(screen_layout, writes), get_cells(dict(screen_layout, _screen={'_pending': {}}), writes))
+
+    @patch('mpcurses.screen.curses.color_pair')
+    @patch('mpcurses.screen.process_clear')
+    def test__write_screen_Should_KeepPreviousClear_When_Coalescing(self, process_clear_patch, *patches):
+        screen_layout = {'_screen': {'_pending': {}}}
+        write_screen(Mock(), screen_layout, 'item', 3, 4, 'value1', 2, clear=True)
+        write_screen(Mock(), screen_layout, 'item', 3, 4, 'v2', 5)
+        self.assertEqual(screen_layout['_screen']['_pending'], {
+            3: [('item', 3, 4, 'v2', 5, True), ('item', 3, 6, 'lue1', 2, False)]})
+
+    @patch('mpcurses.screen.curses.color_pair', return_value=0)
+    def test__write_screen_Should_PreserveOrder_When_CoalescingOverlappingShorterValue(self, *patches):
+        cells = {}
+
+        def addstr(y_pos, x_pos, value, *args):
+            for index, char in enumerate(value):
+                cells[x_pos + index] = char
+
+        screen_mock = Mock()
+        screen_mock.addstr.side_effect = addstr
+        screen_layout = {'_screen': {'_pending': {}}}
+        write_screen(screen_mock, screen_layout, 'b', 3, 12, 'Z', 0)
+        write_screen(screen_mock, screen_layout, 'a', 3, 10, 'hello', 0)
+        write_screen(screen_mock, screen_layout, 'a', 3, 10, 'hi', 0)
+        flush_screen(screen_mock, screen_layout)
+        self.assertEqual(''.join(cells[index] for index in sorted(cells)), 'hillo')
+        self.assertEqual(len(screen_mock.addstr.mock_calls), 3)
+
+    @patch('mpcurses.screen.curses.color_pair')
+    @patch('mpcurses.screen.process_clear')
+    def test__flush_screen_Should_WritePendingInOrder_When_Called(self, process_clear_patch, color_pair_patch, *patches):
+        screen_mock = Mock()
+        screen_layout = {
+            '_screen': {
+                '_pending': {
+                    3: [('other', 3, 20, 'other', 1, False), ('item', 3, 4, 'value2', 5, True)]
+                }
+            }
+        }
+        flush_screen(screen_mock, screen_layout)
+        self.assertEqual(screen_mock.addstr.mock_calls, [
+            call(3, 20, 'other', color_pair_patch.return_value),
+            call(3, 4, 'value2', color_pair_patch.return_value)])
+        process_clear_patch.assert_called_once_with('item', 3, 4, screen_layout, screen_mock)
+        self.assertEqual(screen_layout['_screen']['_pending'], {})
+
+    @patch('mpcurses.screen.curses.color_pair')
+    @patch('mpcurses.screen.logger')
+    def test__flush_screen_Should_LogError_When_Exception(self, logger_patch, *patches):
+        screen_mock = Mock()
+        screen_mock.addstr.side_effect = Exception('error')
+        screen_layout = {'_screen': {'_pending': {3: [('item', 3, 4, 'value', 5, False)]}}}
+        flush_screen(screen_mock, screen_layout)
+        logger_patch.error.assert_called()
+
+    def test__flush_screen_Should_DoNothing_When_NotCoalescing(self, *patches):
+        screen_mock = Mock()
+        flush_screen(screen_mock, {'_screen': {}})
+        screen_mock.addstr.assert_not_called()
+
     @patch('mpcurses.screen.update_screen')
     def test__echo_to_screen_Should_NotCallUpdateScreen_When_ScreenIsNone(self, update_screen_patch, *patches):
         echo_to_screen(None, {}, {})
@@ -1146,10 +1595,34 @@ class TestScreen(unittest.TestCase):
         echo_to_screen(screen_mock, data, screen_layout_mock, offset='1')
         self.assertTrue(call("#1-'key1' is 'True'", screen_mock, screen_layout_mock) in update_screen_patch.mock_calls)
 
-    def test__refresh_screen_Should_CallScreenRefresh_When_Screen(self, *patches):
+    @patch('mpcurses.screen.curses')
+    def test__refresh_screen_Should_NotCallDoupdate_When_NullRenderer(self, curses_patch, *patches):
+        refresh_screen(NullRenderer(2, 2))
+        curses_patch.doupdate.assert_not_called()
+
+    @patch('mpcurses.screen.curses')
+    def test__get_color_pair_Should_ReturnExpected_When_Called(self, curses_patch, *patches):
+        self.assertEqual(get_color_pair(Mock(), 3), curses_patch.color_pair.return_value)
+        self.assertEqual(get_color_pair(NullRenderer(2, 2), 3), 3)
+
+    @patch('mpcurses.screen.curses')
+    def test__initialize_screen_Should_NotUseCurses_When_NullRenderer(self, curses_patch, *patches):
+        screen = NullRenderer(10, 40)
+        screen_layout = {'_screen': {'title': 'title', 'color': 2}}
+        initialize_screen(screen, screen_layout)
+        finalize_screen(screen, screen_layout)
+        curses_patch.start_color.assert_not_called()
+        curses_patch.curs_set.assert_not_called()
+        curses_patch.color_pair.assert_not_called()
+        self.assertEqual(screen.get_lines()[0], ' [Press q to exit]                title')
+        self.assertEqual(screen.attrs[0][1], 2)
+
+    @patch('mpcurses.screen.curses')
+    def test__refresh_screen_Should_CallScreenRefresh_When_Screen(self, curses_patch, *patches):
         screen_mock = Mock()
         refresh_screen(screen_mock)
-        screen_mock.refresh.assert_called_once_with()
+        screen_mock.noutrefresh.assert_called_once_with()
+        curses_patch.doupdate.assert_called_once_with()
 
     def test__get_table_position_Should_ReturnExpected_When_Called(self, *patches):
         screen_layout = {
@@ -1258,7 +1731,8 @@ class TestScreen(unittest.TestCase):
             '_screen': {
                 'title': 'scripta',
                 'color': 11,
-                'blink': True
+                'blink': True,
+                'max_fps': 30
             }
         }
         self.assertEqual(screen_layout, expected_screen_layout)
@@ -1268,7 +1742,8 @@ class TestScreen(unittest.TestCase):
             '_screen': {
                 'title': 'scriptb',
                 'color': 12,
-                'blink': False
+                'blink': False,
+                'max_fps': 10
             }
         }
         set_screen_defaults(screen_layout)
@@ -1276,7 +1751,8 @@ class TestScreen(unittest.TestCase):
             '_screen': {
                 'title': 'scriptb',
                 'color': 12,
-                'blink': False
+                'blink': False,
+                'max_fps': 10
             }
         }
         self.assertEqual(screen_layout, expected_screen_layout)
@@ -1415,16 +1891,481 @@ class TestScreen(unittest.TestCase):
         }
         validate_screen_size(screen_mock, screen_layout_mock)
 
-    @patch('mpcurses.screen.sleep')
-    def test__blink_Should_CallExpected_When_Called(self, *patches):
-        queue_mock = Mock()
-        blink(queue_mock, terminate=True)
-        queue_mock.put.assert_called_with('blink-on')
-
-    @patch('mpcurses.screen.sleep')
-    @patch('mpcurses.screen.itertools')
-    def test__blink_Should_CallExpected_When_ForBranchCoverage(self, itertools_patch, *patches):
-        itertools_patch.cycle.return_value = iter(['blink-on', 'blink-off'])
-        queue_mock = Mock()
-        with self.assertRaises(StopIteration):
-            blink(queue_mock)
+    def test__validate_screen_layout_processes_Should_NotRaise_When_VirtualTable(self, *patches):
+        screen_layout = {
+            'table': {
+                'virtual': True
+            }
+        }
+        validate_screen_layout_processes(10000, screen_layout)
+
+    def test__get_category_y_pos_Should_ReturnExpected_When_VirtualTable(self, *patches):
+        screen_layout = {
+            'table': {
+                'virtual': True
+            },
+            'start': {
+                'position': (5, 12),
+                'table': True
+            }
+        }
+        self.assertEqual(get_category_y_pos('start', 9999, screen_layout), 10004)
+        self.assertEqual(get_category_x_pos('start', 9999, screen_layout), 12)
+
+    def get_virtual_screen_layout(self, rows=None, follow=True):
+        screen_layout = {
+            '_screen': {
+                'show_process_status': False
+            },
+            'table': {
+                'virtual': True,
+                'follow': follow
+            },
+            'header': {
+                'position': (1, 0),
+                'text': 'header'
+            },
+            'number': {
+                'position': (2, 2),
+                'table': True
+            },
+            '_counter_': {
+                'position': (2, 8),
+                'categories': ['number']
+            }
+        }
+        if rows:
+            screen_layout['table']['rows'] = rows
+        return screen_layout
+
+    def test__initialize_viewport_Should_SetViewport_When_VirtualTable(self, *patches):
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(NullRenderer(10, 20), screen_layout, 100)
+        expected_viewport = {
+            'categories': frozenset(['number', '_counter_']),
+            'top': 2,
+            'left': 2,
+            'rows': 7,
+            'bottom': 101,
+            'scroll': 0,
+            'follow': True,
+            'store': {}
+        }
+        self.assertEqual(screen_layout['_screen']['_viewport'], expected_viewport)
+
+    def test__initialize_viewport_Should_LimitRows_When_TableRowsAndProcessStatus(self, *patches):
+        screen_layout = self.get_virtual_screen_layout(rows=5)
+        initialize_viewport(NullRenderer(10, 20), screen_layout, 100)
+        self.assertEqual(screen_layout['_screen']['_viewport']['rows'], 5)
+        screen_layout = self.get_virtual_screen_layout()
+        screen_layout['_screen']['show_process_status'] = True
+        initialize_viewport(NullRenderer(10, 20), screen_layout, 100)
+        self.assertEqual(screen_layout['_screen']['_viewport']['rows'], 4)
+
+    def test__initialize_viewport_Should_NotSetViewport_When_NotVirtualTable(self, *patches):
+        screen_layout = {'_screen': {}, 'table': {'rows': 3, 'cols': 2}}
+        initialize_viewport(NullRenderer(10, 20), screen_layout, 100)
+        self.assertFalse('_viewport' in screen_layout['_screen'])
+
+    def test__write_screen_Should_WriteVisibleRowsAndNotScroll_When_VirtualTable(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(screen, screen_layout, 10)
+        write_screen(screen, screen_layout, 'number', 2, 2, 'row0', 3)
+        write_screen(screen, screen_layout, 'header', 1, 0, 'header', 0)
+        self.assertEqual(screen.get_lines()[1:3], ['header', '  row0'])
+        write_screen(screen, screen_layout, 'number', 8, 2, 'row6', 3)
+        viewport = screen_layout['_screen']['_viewport']
+        self.assertEqual(viewport['scroll'], 0)
+        self.assertEqual(screen.get_lines()[1:6], ['header', '  row0', '', '', ''])
+        self.assertEqual(viewport['store'][8], [(2, 'row6', 3)])
+
+    def test__follow_viewport_Should_ScrollToFirstRunningRow_When_RunningRowOutOfView(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(screen, screen_layout, 10)
+        write_screen(screen, screen_layout, 'number', 7, 2, 'row5', 3)
+        write_screen(screen, screen_layout, 'number', 8, 2, 'row6', 3)
+        follow_viewport(screen, screen_layout, [5, 6])
+        viewport = screen_layout['_screen']['_viewport']
+        self.assertEqual(viewport['scroll'], 5)
+        self.assertEqual(screen.get_lines()[2:4], ['  row5', '  row6'])
+
+    @patch('mpcurses.screen.scroll_viewport')
+    def test__follow_viewport_Should_NotScroll_When_RunningRowsInView(self, scroll_viewport_patch, *patches):
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(NullRenderer(6, 20), screen_layout, 10)
+        follow_viewport(Mock(), screen_layout, [0, 2])
+        follow_viewport(Mock(), screen_layout, [])
+        scroll_viewport_patch.assert_not_called()
+
+    @patch('mpcurses.screen.scroll_viewport')
+    def test__follow_viewport_Should_NotScroll_When_NoFollow(self, scroll_viewport_patch, *patches):
+        screen_layout = self.get_virtual_screen_layout(follow=False)
+        initialize_viewport(NullRenderer(6, 20), screen_layout, 10)
+        follow_viewport(Mock(), screen_layout, [8])
+        follow_viewport(Mock(), {'_screen': {}}, [8])
+        scroll_viewport_patch.assert_not_called()
+
+    def test__scroll_screen_Should_ScrollAndStopFollowing_When_Keys(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(screen, screen_layout, 10)
+        screen.getch = Mock(side_effect=[ord('j'), ord('x'), ord('j'), -1])
+        self.assertTrue(scroll_screen(screen, screen_layout))
+        viewport = screen_layout['_screen']['_viewport']
+        self.assertEqual(viewport['scroll'], 2)
+        self.assertFalse(viewport['follow'])
+
+    def test__scroll_screen_Should_ReturnFalse_When_NoKeys(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen.nodelay(True)
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(screen, screen_layout, 10)
+        self.assertFalse(scroll_screen(screen, screen_layout))
+        self.assertTrue(screen_layout['_screen']['_viewport']['follow'])
+        self.assertFalse(scroll_screen(screen, {'_screen': {}}))
+
+    def test__write_viewport_Should_OnlyStoreRow_When_BelowViewportAndNoFollow(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout(follow=False)
+        initialize_viewport(screen, screen_layout, 10)
+        viewport = screen_layout['_screen']['_viewport']
+        write_viewport(screen, viewport, 9, 2, 'row7', 0)
+        self.assertEqual(viewport['scroll'], 0)
+        self.assertEqual(viewport['store'][9], [(2, 'row7', 0)])
+        self.assertEqual(screen.dirty, set())
+
+    def test__scroll_viewport_Should_RepaintRowsInWriteOrder_When_Scrolled(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout(follow=False)
+        initialize_viewport(screen, screen_layout, 10)
+        viewport = screen_layout['_screen']['_viewport']
+        write_viewport(screen, viewport, 2, 2, 'row0', 0)
+        write_viewport(screen, viewport, 9, 2, 'hello', 0)
+        write_viewport(screen, viewport, 9, 4, 'XY', 1)
+        write_viewport(screen, viewport, 9, 2, 'hi', 0)
+        scroll_viewport(screen, viewport, 100)
+        self.assertEqual(viewport['scroll'], 7)
+        self.assertEqual(viewport['store'][9], [(2, 'hi', 0), (4, 'XY', 1), (6, 'o', 0)])
+        self.assertEqual(screen.get_lines()[2:5], ['  hiXYo', '', ''])
+        scroll_viewport(screen, viewport, -5)
+        self.assertEqual(viewport['scroll'], 0)
+        self.assertEqual(screen.get_lines()[2], '  row0')
+
+    def test__get_row_segments_Should_SplitAndMerge_When_Called(self, *patches):
+        row = [(0, 'abcdef', 1)]
+        self.assertEqual(get_row_segments(row, 2, 'XY', 2), [(0, 'ab', 1), (2, 'XY', 2), (4, 'ef', 1)])
+        self.assertEqual(get_row_segments(row, 6, 'g', 1), [(0, 'abcdefg', 1)])
+        self.assertEqual(get_row_segments(row, 0, 'abcdefgh', 3), [(0, 'abcdefgh', 3)])
+
+    def test__clear_viewport_Should_TruncateRow_When_Called(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout()
+        initialize_viewport(screen, screen_layout, 10)
+        viewport = screen_layout['_screen']['_viewport']
+        write_viewport(screen, viewport, 2, 2, 'abcdef', 0)
+        write_viewport(screen, viewport, 2, 10, 'xyz', 0)
+        clear_viewport(screen, viewport, 2, 5)
+        self.assertEqual(viewport['store'][2], [(2, 'abc', 0)])
+        self.assertEqual(screen.get_lines()[2], '  abc')
+
+    def test__process_clear_Should_ClearViewport_When_VirtualTableCategory(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_virtual_screen_layout()
+        screen_layout['number']['clear'] = True
+        initialize_viewport(screen, screen_layout, 10)
+        write_screen(screen, screen_layout, 'number', 2, 2, 'abcdef', 0)
+        write_screen(screen, screen_layout, 'number', 2, 2, 'ab', 0, clear=True)
+        self.assertEqual(screen_layout['_screen']['_viewport']['store'][2], [(2, 'ab', 0)])
+        self.assertEqual(screen.get_lines()[2], '  ab')
+
+    def test__get_scroll_delta_Should_ReturnExpected_When_Called(self, *patches):
+        self.assertEqual(get_scroll_delta(ord('j'), 10), 1)
+        self.assertEqual(get_scroll_delta(ord('k'), 10), -1)
+        self.assertEqual(get_scroll_delta(ord(' '), 10), 10)
+        self.assertEqual(get_scroll_delta(ord('b'), 10), -10)
+        self.assertEqual(get_scroll_delta(ord('x'), 10), 0)
+
+    @patch('mpcurses.screen.update_screen_status')
+    @patch('mpcurses.screen.scroll_viewport')
+    def test__finalize_screen_Should_ScrollViewport_When_Key(self, scroll_viewport_patch, *patches):
+        screen_mock = Mock(uses_curses=False)
+        screen_mock.getch.side_effect = [ord('j'), ord('q')]
+        viewport = {'scroll': 3, 'rows': 5}
+        screen_layout = {'_screen': {'_viewport': viewport}}
+        finalize_screen(screen_mock, screen_layout)
+        screen_mock.nodelay.assert_called_once_with(False)
+        scroll_viewport_patch.assert_called_once_with(screen_mock, viewport, 4)
+
+    def get_slots_screen_layout(self):
+        screen_layout = {
+            '_screen': {
+                'slots': True,
+                'color': 0,
+                'show_process_status': False
+            },
+            'number': {
+                'position': (1, 0),
+                'table': True,
+                'color': 0,
+                'regex': r'^number (?P<value>\d+)$'
+            },
+            'prime': {
+                'position': (1, 5),
+                'table': True,
+                'keep_count': True,
+                'zfill': 2,
+                'regex': r'^prime$'
+            },
+            'label': {
+                'position': (1, 9),
+                'table': True,
+                'text': '-',
+                'text_color': 0
+            },
+            '_counter_': {
+                'position': (1, 12),
+                'counter_text': '*',
+                'categories': ['number']
+            }
+        }
+        return screen_layout
+
+    def test__get_slot_cells_Should_ReturnExpected_When_Called(self, *patches):
+        screen_layout = self.get_slots_screen_layout()
+        result = get_slot_cells(NullRenderer(5, 20), screen_layout, ['number', 'prime', 'label'], 2)
+        expected_result = [
+            [(1, 0, 5), (1, 5, 4), (1, 9, 3), (1, 12, 7)],
+            [(2, 0, 5), (2, 5, 4), (2, 9, 3), (2, 12, 7)]
+        ]
+        self.assertEqual(result, expected_result)
+
+    def test__initialize_screen_offsets_Should_InitializeSlots_When_Slots(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_slots_screen_layout()
+        initialize_screen_offsets(screen, screen_layout, 100, 2)
+        slots = screen_layout['_screen']['_slots']
+        self.assertEqual(slots['free'], [0, 1])
+        self.assertEqual(len(slots['cells']), 2)
+        self.assertEqual(len(get_screen_plan(screen_layout).categories['number'].positions), 2)
+        self.assertEqual(sorted(key for key in screen_layout['prime'] if isinstance(key, int)), [0, 1])
+        self.assertEqual(slots['history']['counts'], {'prime': 0})
+
+    def test__update_screen_Should_ReuseSlots_When_Slots(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_slots_screen_layout()
+        initialize_screen_offsets(screen, screen_layout, 100, 2)
+        slots = screen_layout['_screen']['_slots']
+        slots['process_data'] = [{'key': 'a'}] * 100
+        update_screen('#7-number 123', screen, screen_layout)
+        update_screen('#7-prime', screen, screen_layout)
+        update_screen('#9-number 456', screen, screen_layout)
+        flush_screen(screen, screen_layout)
+        self.assertEqual(slots['offsets'], {7: 0, 9: 1})
+        self.assertEqual(screen.get_lines()[1:3], ['123  01  -  *', '456      -  *'])
+        release_slot(screen_layout, 7)
+        update_screen('#20-number 9', screen, screen_layout)
+        flush_screen(screen, screen_layout)
+        self.assertEqual(slots['offsets'], {9: 1, 20: 0})
+        self.assertEqual(screen.get_lines()[1], '9        -  *')
+        history = slots['history']
+        self.assertEqual(history['completed'], 1)
+        self.assertEqual(history['counts'], {'prime': 1})
+        self.assertEqual(list(history['recent']), [(7, {'number': '123', 'prime': '01'})])
+
+    def test__release_slot_Should_CountError_When_ErrorThenDone(self, *patches):
+        screen_layout = self.get_slots_screen_layout()
+        initialize_slots(NullRenderer(6, 20), screen_layout, 2)
+        slots = screen_layout['_screen']['_slots']
+        screen_layout['prime'][0] = {'_count': 3}
+        slots['offsets'][5] = 0
+        slots['free'] = [1]
+        release_slot(screen_layout, 5, error=True)
+        self.assertEqual(slots['offsets'], {5: 0})
+        release_slot(screen_layout, 5)
+        release_slot(screen_layout, 5)
+        self.assertEqual(slots['free'], [0, 1])
+        self.assertEqual(slots['history']['completed'], 1)
+        self.assertEqual(slots['history']['errors'], 1)
+        self.assertEqual(slots['history']['counts'], {'prime': 3})
+
+    def test__get_slot_Should_ReclaimOldestSlot_When_NoFreeSlot(self, *patches):
+        screen = NullRenderer(6, 20)
+        screen_layout = self.get_slots_screen_layout()
+        initialize_screen_offsets(screen, screen_layout, 100, 2)
+        self.assertEqual(get_slot(screen, screen_layout, 1), 0)
+        self.assertEqual(get_slot(screen, screen_layout, 2), 1)
+        self.assertEqual(get_slot(screen, screen_layout, 3), 0)
+        self.assertEqual(screen_layout['_screen']['_slots']['offsets'], {2: 1, 3: 0})
+
+    def get_list_screen_layout(self, **kwargs):
+        screen_layout = {
+            '_screen': {},
+            'items': {
+                'position': (1, 2),
+                'list': True,
+                'keep_count': True,
+                'color': 3,
+                'regex': r'^item (?P<value>.*)$'
+            }
+        }
+        screen_layout['items'].update(kwargs)
+        return screen_layout
+
+    def test__initialize_list_Should_DefaultCapacityToScreenHeight_When_NoCapacity(self, *patches):
+        screen_layout = self.get_list_screen_layout()
+        initialize_list(NullRenderer(6, 20), 'items', screen_layout)
+        self.assertEqual(screen_layout['items']['capacity'], 4)
+        self.assertEqual(screen_layout['items']['_entries'].maxlen, 4)
+        self.assertFalse('_spill' in screen_layout['items'])
+
+    def test__initialize_list_Should_EndCapacityAboveProcessStatus_When_ShowProcessStatus(self, *patches):
+        screen_layout = self.get_list_screen_layout()
+        screen_layout['_screen']['show_process_status'] = True
+        initialize_list(NullRenderer(10, 20), 'items', screen_layout)
+        # entries are drawn on rows 2 to 5 and the process status on rows 6 to 8
+        self.assertEqual(screen_layout['items']['capacity'], 4)
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test__initialize_list_Should_OpenSpillFile_When_Spill(self, open_patch, *patches):
+        screen_layout = self.get_list_screen_layout(capacity=2, spill='items.txt')
+        initialize_list(NullRenderer(6, 20), 'items', screen_layout)
+        open_patch.assert_called_once_with('items.txt', 'a')
+        self.assertEqual(screen_layout['items']['_spill'], open_patch.return_value)
+        self.assertEqual(screen_layout['items']['capacity'], 2)
+        close_lists(screen_layout)
+        open_patch.return_value.close.assert_called_once_with()
+        self.assertFalse('_spill' in screen_layout['items'])
+
+    def test__update_screen_Should_ScrollListInPlace_When_ListFull(self, *patches):
+        screen = NullRenderer(8, 20)
+        screen_layout = self.get_list_screen_layout(capacity=3)
+        screen_layout['items']['_count'] = 0
+        initialize_list(screen, 'items', screen_layout)
+        for value in ['a', 'bbbb', 'c']:
+            update_screen(f'item {value}', screen, screen_layout)
+        flush_screen(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[1:6], ['', '  a', '  bbbb', '  c', ''])
+        for value in ['dd', 'e']:
+            update_screen(f'item {value}', screen, screen_layout)
+        flush_screen(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[1:6], ['', '  c', '  dd', '  e', ''])
+        self.assertEqual(list(screen_layout['items']['_entries']), [('c', 3), ('dd', 3), ('e', 3)])
+
+    def test__write_list_Should_WriteSpill_When_Spill(self, *patches):
+        screen = NullRenderer(8, 20)
+        screen_layout = self.get_list_screen_layout(capacity=3)
+        initialize_list(screen, 'items', screen_layout)
+        spill_mock = Mock()
+        screen_layout['items']['_spill'] = spill_mock
+        write_list(screen_layout, 'items', 'value', 3)
+        spill_mock.write.assert_called_once_with('value\n')
+        self.assertEqual(screen.get_lines()[2], '')
+        flush_screen(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[2], '  value')
+
+    @patch('mpcurses.screen.write_screen')
+    def test__draw_lists_Should_WriteEveryRowOncePerFrame_When_ListFull(self, write_screen_patch, *patches):
+        screen = NullRenderer(8, 20)
+        screen_layout = self.get_list_screen_layout(capacity=3)
+        initialize_list(screen, 'items', screen_layout)
+        for value in ['a', 'b', 'c']:
+            write_list(screen_layout, 'items', value, 3)
+        draw_lists(screen, screen_layout)
+        write_screen_patch.reset_mock()
+        for index in range(100):
+            write_list(screen_layout, 'items', str(index), 3)
+        write_screen_patch.assert_not_called()
+        draw_lists(screen, screen_layout)
+        self.assertEqual(write_screen_patch.mock_calls, [
+            call(screen, screen_layout, 'items', 2, 2, '97', 3),
+            call(screen, screen_layout, 'items', 3, 2, '98', 3),
+            call(screen, screen_layout, 'items', 4, 2, '99', 3)])
+        write_screen_patch.reset_mock()
+        draw_lists(screen, screen_layout)
+        write_screen_patch.assert_not_called()
+
+    def get_counter_screen_layout(self, **kwargs):
+        screen_layout = {
+            '_screen': {
+                '_bars': {'dirty': set(), 'drawn': {}, 'colors': {}}
+            },
+            'number': {
+                'position': (1, 0),
+                'color': 4,
+                'regex': r'^number (?P<value>\d+)$'
+            },
+            'other': {
+                'position': (1, 5),
+                'color': 5,
+                'regex': r'^other$'
+            },
+            '_counter_': {
+                'position': (1, 2),
+                'counter_text': '|',
+                'color': 7,
+                'categories': ['number', 'other'],
+                0: {'_count': 0, '_modulus_count': 0},
+                1: {'_count': 0, '_modulus_count': 0}
+            }
+        }
+        screen_layout['_counter_'].update(kwargs)
+        return screen_layout
+
+    def test__process_counter_Should_OnlyCount_When_Bars(self, *patches):
+        screen_mock = Mock()
+        screen_layout = self.get_counter_screen_layout(modulus=2)
+        process_counter(1, 'number', '1', screen_layout, screen_mock)
+        self.assertEqual(screen_layout['_screen']['_bars']['dirty'], set())
+        process_counter(1, 'number', '2', screen_layout, screen_mock)
+        screen_mock.addstr.assert_not_called()
+        self.assertEqual(screen_layout['_counter_'][1], {'_count': 2, '_modulus_count': 1})
+        self.assertEqual(screen_layout['_screen']['_bars']['dirty'], {1})
+
+    def test__draw_counters_Should_WriteAddedCharacters_When_Modulus(self, *patches):
+        screen = NullRenderer(4, 20)
+        screen_layout = self.get_counter_screen_layout(modulus=2)
+        bars = screen_layout['_screen']['_bars']
+        for _ in range(4):
+            count_counter(1, 'number', screen_layout, bars)
+        draw_counters(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[2], '  ||')
+        for _ in range(2):
+            count_counter(1, 'number', screen_layout, bars)
+        screen.dirty.clear()
+        draw_counters(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[2], '  |||')
+        self.assertEqual(bars['drawn'], {1: 3})
+        self.assertEqual(bars['dirty'], set())
+        self.assertEqual(screen.attrs[2][2:5], [7, 7, 7])
+
+    def test__draw_counters_Should_SkipBoundary_When_ModulusRegex(self, *patches):
+        screen = NullRenderer(4, 20)
+        screen_layout = self.get_counter_screen_layout(modulus=1, regex=r'^total (\d+)$')
+        count_counter(0, 'number', screen_layout, screen_layout['_screen']['_bars'])
+        draw_counters(screen, screen_layout)
+        self.assertEqual(screen.get_lines()[1], '   |')
+
+    @patch('mpcurses.screen.write_screen')
+    def test__draw_counters_Should_WriteColorRuns_When_NoModulus(self, write_screen_patch, *patches):
+        screen_mock = Mock()
+        screen_layout = self.get_counter_screen_layout()
+        bars = screen_layout['_screen']['_bars']
+        for category in ['number', 'number', 'other', 'number']:
+            count_counter(0, category, screen_layout, bars)
+        draw_counters(screen_mock, screen_layout)
+        self.assertEqual(write_screen_patch.mock_calls, [
+            call(screen_mock, screen_layout, '_counter_', 1, 2, '||', 4),
+            call(screen_mock, screen_layout, '_counter_', 1, 4, '|', 5),
+            call(screen_mock, screen_layout, '_counter_', 1, 5, '|', 4)])
+        self.assertEqual(bars['colors'], {})
+
+    @patch('mpcurses.screen.update_screen_status')
+    def test__initialize_screen_offsets_Should_InitializeBars_When_CounterWithoutWidth(self, *patches):
+        screen_layout = {'_screen': {}, '_counter_': {'position': (1, 1), 'categories': []}}
+        initialize_screen_offsets(Mock(), screen_layout, 1, 1)
+        self.assertEqual(screen_layout['_screen']['_bars'], {'dirty': set(), 'drawn': {}, 'colors': {}})
+        screen_layout = {'_screen': {}, '_counter_': {'position': (1, 1), 'categories': [], 'width': 10}}
+        initialize_screen_offsets(Mock(), screen_layout, 1, 1)
+        self.assertFalse('_bars' in screen_layout['_screen'])
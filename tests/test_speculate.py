@@ -0,0 +1,50 @@
+
+# Copyright (c) 2021 Intel Corporation
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#      http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from mpcurses.speculate import get_percentile
+from mpcurses.speculate import get_straggler_threshold
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class TestSpeculate(unittest.TestCase):
+
+    def setUp(self):
+        """
+        """
+        pass
+
+    def tearDown(self):
+        """
+        """
+        pass
+
+    def test__get_percentile_Should_ReturnNearestRank_When_Called(self, *patches):
+        values = [float(value) for value in range(20, 0, -1)]
+        self.assertEqual(get_percentile(values, 95), 19.0)
+        self.assertEqual(get_percentile(values, 50), 10.0)
+        self.assertEqual(get_percentile(values, 0), 1.0)
+        self.assertEqual(get_percentile([3.0], 95), 3.0)
+
+    def test__get_straggler_threshold_Should_ReturnNone_When_TooFewCompleted(self, *patches):
+        self.assertIsNone(get_straggler_threshold([1.0, 2.0], min_completed=3))
+        self.assertIsNone(get_straggler_threshold([], min_completed=0))
+
+    def test__get_straggler_threshold_Should_ReturnFactorOfPercentile_When_Called(self, *patches):
+        durations = [1.0, 1.0, 1.0, 2.0]
+        self.assertEqual(get_straggler_threshold(durations, percentile=95, factor=2, min_completed=4), 4.0)